@@ -0,0 +1,58 @@
+"""Benchmark of `genesisonline.parsers.parse_cube` on a synthetic cube.
+
+Run with:
+```bash
+python benchmarks/cube.py --regions 2000 --years 50
+```
+"""
+import argparse
+import time
+from genesisonline.parsers import parse_cube
+
+HEADER = """K;DQ;FACH-SCHL;GHH-ART;GHM-WERTE-JN;GENESIS-VBD;REGIOSTAT;NAME-ERSETZT
+D;12411BJ002;;N;N;N;N
+K;DQA;NAME;RHF-BSR;RHF-ACHSE
+D;KREISE;1;1
+D;GES;2;2
+D;ALTX20;3;3
+K;DQZ;NAME;ZI-RHF-BSR;ZI-RHF-ACHSE
+D;STAG;4;4
+K;DQI;NAME;ME-NAME;DST;TYP;NKM-STELLEN;GHH-ART;GHM-WERTE-JN
+D;BEVSTD;ANZAHL;FEST;PROZENT;0;;N
+K;QEI;FACH-SCHL;ZI-WERT;WERT;QUALITAET;GESPERRT;WERT-VERFAELSCHT"""
+
+
+def synthetic_cube(regions: int, years: int) -> str:
+    """Create a cube with regions x 2 sexes x 20 age groups x years cells."""
+    lines = [HEADER]
+    for region in range(regions):
+        for sex in ("GESM", "GESW"):
+            for age in range(20):
+                for year in range(1970, 1970 + years):
+                    lines.append(
+                        f"D;{region:05d};{sex};ALT{age:03d};31.12.{year};"
+                        f"{region * 31 + age * 7 + year};e;;0.0"
+                    )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--regions", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=50)
+    args = parser.parse_args()
+
+    content = synthetic_cube(args.regions, args.years)
+    cells = args.regions * 2 * 20 * args.years
+    print(f"{cells:,} cells, {len(content) / 2**20:.1f} MiB")
+    start = time.perf_counter()
+    cube = parse_cube(content)
+    elapsed = time.perf_counter() - start
+    print(f"parse_cube: {elapsed:8.3f} s, {cells / elapsed:12,.0f} cells/s")
+    start = time.perf_counter()
+    cube.to_dense()
+    print(f"  to_dense: {time.perf_counter() - start:8.3f} s, shape {cube.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark of `genesisonline.parsers.parse_ffcsv` on a synthetic table.
+
+Run with:
+```bash
+python benchmarks/ffcsv.py --rows 1000000
+```
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from genesisonline.parsers import parse_ffcsv
+
+HEADER = (
+    "statistics_code;statistics_label;time_code;time_label;time;"
+    "1_variable_code;1_variable_label;1_variable_attribute_code;"
+    "1_variable_attribute_label;2_variable_code;2_variable_label;"
+    "2_variable_attribute_code;2_variable_attribute_label;"
+    "value;value_unit;value_variable_code;value_variable_label;value_q"
+)
+
+
+def synthetic_ffcsv(rows: int, seed: int = 0) -> str:
+    """Create an ffcsv table with `rows` rows resembling GENESIS exports."""
+    rng = random.Random(seed)
+    regions = [(f"{i:05d}", f"Region {i}") for i in range(400)]
+    lines = [HEADER]
+    for i in range(rows):
+        year = 1990 + i % 34
+        region, label = regions[i // 34 % len(regions)]
+        sex, sex_label = ("GESM", "male") if i % 2 else ("GESW", "female")
+        value = f"{rng.uniform(0, 1e6):.1f}".replace(".", ",")
+        if i % 97 == 0:
+            value = "."
+        lines.append(
+            f"12411;Population;JAHR;Year;{year};KREISE;Districts;{region};{label};"
+            f"GES;Sex;{sex};{sex_label};{value};number;BEVSTD;Population;"
+            f"{'e' if i % 13 == 0 else ''}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def parse_rowwise(content: str) -> dict:
+    """Baseline: the same conversion with the `csv` module, row by row."""
+    reader = csv.reader(io.StringIO(content), delimiter=";")
+    header = next(reader)
+    value_index = header.index("value")
+    categories = [dict() for _ in header]
+    columns = [list() for _ in header]
+    for row in reader:
+        for i, field in enumerate(row):
+            if i == value_index:
+                try:
+                    columns[i].append(float(field.replace(",", ".")))
+                except ValueError:
+                    columns[i].append(float("nan"))
+            else:
+                codes = categories[i]
+                columns[i].append(codes.setdefault(field, len(codes)))
+    return dict(zip(header, columns))
+
+
+def measure(name: str, func, content: str, rows: int) -> None:
+    start = time.perf_counter()
+    func(content)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>10}: {elapsed:8.3f} s, {rows / elapsed:12,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    content = synthetic_ffcsv(args.rows)
+    print(f"{args.rows:,} rows, {len(content) / 2**20:.1f} MiB")
+    measure("ffcsv", parse_ffcsv, content, args.rows)
+    measure("csv", parse_rowwise, content, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ Federal Statistical Office of Germany by wrapping its official RESTful/JSON API.
 """
 
 from .client import GenesisOnline
+from .cache import DiskCache, ResponseCache
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
 from .utils import configure_logger
 import logging
 
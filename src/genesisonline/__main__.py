@@ -0,0 +1,4 @@
+import sys
+from genesisonline.cli import main
+
+sys.exit(main())
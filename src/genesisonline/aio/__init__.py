@@ -0,0 +1,25 @@
+"""Asyncio interface to the GENESIS-Online API.
+
+Requires the optional dependency `aiohttp`, which is installed with:
+```bash
+pip install genesisonline[async]
+```
+"""
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError(
+        "The asyncio interface requires 'aiohttp'. "
+        "Install it with 'pip install genesisonline[async]'."
+    ) from e
+
+from .client import AsyncGenesisOnline
+from .session import AsyncSession
+from .services import (
+    AsyncBaseService,
+    AsyncTestService,
+    AsyncFindService,
+    AsyncCatalogueService,
+    AsyncDataService,
+    AsyncMetadataService,
+)
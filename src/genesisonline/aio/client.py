@@ -0,0 +1,169 @@
+from typing import Any, Dict, Union
+from genesisonline.aio.session import AsyncSession
+from genesisonline.aio.services import (
+    AsyncTestService,
+    AsyncFindService,
+    AsyncCatalogueService,
+    AsyncDataService,
+    AsyncMetadataService,
+)
+from genesisonline.cache import ResponseCache, create_response_cache
+from genesisonline.constants import API_VERSION, JsonKeys
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+
+class AsyncGenesisOnline:
+    """Object which represents the GENESIS-Online API for use with asyncio.
+
+    Mirrors `GenesisOnline`, but all service methods are coroutines. The
+    number of concurrent connections is bounded by `max_connections`, so
+    many requests can be awaited at once, e.g. with `asyncio.gather`.
+
+    Attributes:
+        test (AsyncTestService): Service containing methods for testing the API.
+        find (AsyncFindService): Service containing methods for finding information.
+        catalogue (AsyncCatalogueService): Service containing methods for listing objects.
+        data (AsyncDataService): Service containing methods for retrieving data.
+        metadata (AsyncMetadataService): Service containing methods for retrieving metadata.
+        services (list): Overview of all available services.
+
+    Examples:
+        >>> import asyncio
+        >>> from genesisonline.aio import AsyncGenesisOnline
+        >>>
+        >>> async def main(names):
+        ...     async with AsyncGenesisOnline("username", "password") as go:
+        ...         return await asyncio.gather(
+        ...             *(go.metadata.variable(name=name) for name in names)
+        ...         )
+        >>>
+        >>> responses = asyncio.run(main(["KREISE", "DINSG"]))
+    """
+
+    version = API_VERSION
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        language: Literal["de", "en"] = "en",
+        max_connections: int = 10,
+        timeout: float = None,
+        cache_ttl: Union[float, Dict[str, float]] = None,
+        cache_maxsize: int = 1024,
+    ) -> None:
+        """Constructor for the `AsyncGenesisOnline` class.
+
+        Args:
+            username: username of the user's GENESIS-Online account.
+            password: password of the user's GENESIS-Online account.
+            language: language the user wants the response to be in.
+            max_connections: maximum number of concurrent connections.
+            timeout: total number of seconds a request may take.
+            cache_ttl: enables the in-memory response cache, see `GenesisOnline`.
+            cache_maxsize: maximum number of responses cached per service.
+        """
+        self.session = AsyncSession(max_connections=max_connections, timeout=timeout)
+        self.username = username
+        self.password = password
+        self.language = language
+        self._cache_ttl = cache_ttl
+        self._cache_maxsize = cache_maxsize
+        self.test = AsyncTestService(self.session, **self._service_options("test"))
+        self.find = AsyncFindService(self.session, **self._service_options("find"))
+        self.catalogue = AsyncCatalogueService(
+            self.session, **self._service_options("catalogue")
+        )
+        self.data = AsyncDataService(self.session, **self._service_options("data"))
+        self.metadata = AsyncMetadataService(
+            self.session, **self._service_options("metadata")
+        )
+        self.services = [
+            self.test._service,
+            self.find._service,
+            self.catalogue._service,
+            self.data._service,
+            self.metadata._service,
+        ]
+
+    async def __aenter__(self) -> "AsyncGenesisOnline":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @property
+    def username(self):
+        """Username of the user's GENESIS-Online account."""
+        return self._username
+
+    @username.setter
+    def username(self, value: str):
+        self._username = value
+        self.session.params["username"] = value
+
+    @property
+    def password(self):
+        """Password of the user's GENESIS-Online account."""
+        return self._password
+
+    @password.setter
+    def password(self, value: str):
+        self._password = value
+        self.session.params["password"] = value
+
+    @property
+    def language(self):
+        """Language the user wants the response to be in."""
+        return self._language
+
+    @language.setter
+    def language(self, value: Literal["de", "en"]):
+        self._language = value
+        self.session.params["language"] = value
+
+    def _service_options(self, service: str) -> dict:
+        """Keyword arguments passed to the constructor of `service`."""
+        return {"response_cache": self._make_cache(service)}
+
+    def _make_cache(self, service: str) -> ResponseCache:
+        """Create the response cache of `service` if caching is enabled."""
+        return create_response_cache(service, self._cache_ttl, self._cache_maxsize)
+
+    def cache_info(self) -> dict:
+        """Hit, miss and eviction counters of the response cache per service."""
+        services = {
+            "test": self.test,
+            "find": self.find,
+            "catalogue": self.catalogue,
+            "data": self.data,
+            "metadata": self.metadata,
+        }
+        return {
+            name: service.response_cache.stats
+            for name, service in services.items()
+            if service.response_cache is not None
+        }
+
+    async def close(self) -> None:
+        """Close all connections."""
+        await self.session.close()
+
+    async def check_api(self) -> dict:
+        """Check if the GENESIS-Online API is online."""
+        return (await self.test.whoami()).get(JsonKeys.CONTENT)
+
+    async def check_login(self) -> dict:
+        """Check if the GENESIS-Online API credentials are valid."""
+        return (await self.test.logincheck()).get(JsonKeys.CONTENT)
+
+    async def request(self, endpoint: str, **kwargs: str) -> Any:
+        """Returns a raw response from the specified `endpoint`.
+
+        See `GenesisOnline.request` for details.
+        """
+        return await self.test.request(endpoint, **kwargs)
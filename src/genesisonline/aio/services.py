@@ -0,0 +1,240 @@
+"""Asyncio counterparts of the GENESIS-Online service classes.
+
+Each service inherits the endpoints and the standardization of its
+synchronous counterpart, only the transport is replaced by an awaitable one.
+Hence all public methods return coroutines yielding the same standardized
+response dicts as the synchronous services.
+"""
+import json
+import asyncio
+import aiohttp
+import logging
+from typing import Any, AsyncIterator, Callable, Tuple, Union
+from urllib.parse import urljoin
+from genesisonline.aio.session import AsyncResponse, AsyncSession
+from genesisonline.constants import Endpoints, JsonKeys, ResponseStatus
+from genesisonline.pagination import MAX_PAGELENGTH, aiter_objects
+from genesisonline.exceptions import (
+    ConnectionError,
+    HTTPError,
+    RequestError,
+    StandardizationError,
+    TimeoutError,
+)
+from genesisonline.services import (
+    BaseService,
+    CatalogueService,
+    DataService,
+    FindService,
+    MetadataService,
+    TestService,
+)
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseService(BaseService):
+    """Parent class for all asyncio GENESIS-Online service classes.
+
+    Responses are served from the in-memory `response_cache` if one is set.
+    The `disk_cache` is not supported by the asyncio services.
+    """
+
+    _session: AsyncSession
+
+    async def request(self, endpoint: str, **api_params) -> Any:
+        """Send a request to the specified GENESIS-Online endpoint.
+
+        See `BaseService.request` for details.
+        """
+        cache_key = self._cache_key(endpoint, api_params)
+        if self.response_cache is not None:
+            content = self.response_cache.get(cache_key)
+            if content is not None:
+                return content
+
+        content, _ = await self._send(endpoint, api_params)
+
+        if self.response_cache is not None and self._is_cacheable(endpoint, content):
+            self.response_cache.set(cache_key, content)
+        return content
+
+    async def _send(
+        self, endpoint: str, api_params: dict, headers: dict = None
+    ) -> Tuple[Any, AsyncResponse]:
+        """Send a request to the GENESIS-Online API, bypassing any cache."""
+        url = urljoin(self._BASE_URL, endpoint)
+        try:
+            response = await self._session.get(url, params=api_params, headers=headers)
+            return self._parse_response(response, api_params), response
+        except aiohttp.ClientResponseError as e:
+            raise HTTPError(f"HTTP error occurred: {e}") from e
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f"Timeout error occurred: {e}") from e
+        except aiohttp.ClientConnectionError as e:
+            raise ConnectionError(f"Connection error occurred: {e}") from e
+        except (aiohttp.ClientError, json.JSONDecodeError) as e:
+            raise RequestError(f"Request error occurred: {e}") from e
+
+    async def _request(self, endpoint: str, *args, **api_params) -> dict:
+        response = await self.request(endpoint, **api_params)
+        try:
+            return self._standardize_response(response, *args)
+        except Exception as e:
+            raise StandardizationError(f"Standardization error occured: {e}") from e
+
+
+class AsyncTestService(AsyncBaseService, TestService):
+    """Asyncio counterpart of `TestService`."""
+
+
+class AsyncFindService(AsyncBaseService, FindService):
+    """Asyncio counterpart of `FindService`."""
+
+    async def find(
+        self, term: str, category: str = None, offline: bool = False, **api_params
+    ) -> dict:
+        """Returns lists of objects for a search `term`.
+
+        See `FindService.find` for details. A search with `offline=True` is
+        answered by the local `mirror` without awaiting a request.
+        """
+        response = super().find(term, category=category, offline=offline, **api_params)
+        return response if offline else await response
+
+
+class AsyncCatalogueService(AsyncBaseService, CatalogueService):
+    """Asyncio counterpart of `CatalogueService`.
+
+    The `iter_*` methods return async iterators, e.g.
+    `async for table in go.catalogue.iter_tables(selection="124*")`.
+    """
+
+    def _iter(
+        self,
+        method: Callable[..., Any],
+        selection: str = None,
+        pagelength: int = MAX_PAGELENGTH,
+        prefetch: bool = True,
+        max_workers: int = 1,
+        **api_params,
+    ) -> AsyncIterator[dict]:
+        """Iterate asynchronously over the complete listing of `method`.
+
+        See `CatalogueService._iter` for details. Pages are awaited one after
+        the other, or up to `max_workers` at once. `prefetch` is accepted for
+        compatibility and has no effect.
+        """
+
+        async def fetch(page_selection: str) -> list:
+            response = await method(
+                selection=page_selection, pagelength=pagelength, **api_params
+            )
+            return response[JsonKeys.CONTENT] or []
+
+        return aiter_objects(fetch, selection, int(pagelength), max_workers=max_workers)
+
+
+class AsyncMetadataService(AsyncBaseService, MetadataService):
+    """Asyncio counterpart of `MetadataService`."""
+
+
+class AsyncDataService(AsyncBaseService, DataService):
+    """Asyncio counterpart of `DataService`.
+
+    Batch jobs (i.e. very large tables) are awaited with `asyncio.sleep`
+    instead of blocking the event loop.
+    """
+
+    def __init__(self, session: AsyncSession, **kwargs) -> None:
+        super().__init__(session, **kwargs)
+        self._jobs = set()
+
+    async def table(
+        self,
+        wait_for_result: bool = True,
+        name: str = None,
+        area: str = None,
+        **api_params,
+    ) -> Union[dict, asyncio.Future]:
+        """Returns table `name` from `area`according to the parameters set.
+
+        If `wait_for_result` = False, a future of the response is returned
+        instead, e.g. for `asyncio.as_completed`. The result of a batch job is
+        probed for in a background task.
+        """
+        response = await self._request(
+            Endpoints.DATA_TABLE, name=name, area=area, job="true", **api_params
+        )
+
+        if response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.BACKGROUND_RUN:
+            return await self._get_batch_job_result(response, wait_for_result)
+        if not wait_for_result:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(response)
+            return future
+        return response
+
+    async def _request(self, endpoint: str, **api_params) -> dict:
+        response = await self.request(endpoint, **api_params)
+        if not isinstance(response, dict):
+            await self._load_container(endpoint, api_params)
+        return self._process_response(endpoint, response, api_params)
+
+    async def _load_container(self, endpoint: str, api_params: dict) -> None:
+        """Request and cache the json envelope of a non-json response.
+
+        See `DataService._get_json_container` for details.
+        """
+        key = self._container_key(endpoint, api_params)
+        if key not in self._containers:
+            container = await self.request(endpoint, name="", language=key[1])
+            self._containers[key] = self._envelope(container)
+
+    async def _get_batch_job_result(
+        self, response: dict, wait_for_result: bool
+    ) -> Union[dict, asyncio.Task]:
+        """Await the result of a batch job or probe for it in a background task.
+
+        See `DataService._get_batch_job_result` for details.
+        """
+        result_id = response[JsonKeys.STATUS][JsonKeys.CONTENT].split(" ")[-1]
+        language = response[JsonKeys.PARAMETER]["language"]
+
+        if wait_for_result:
+            self.save(response, result_id)
+            return await self._probe_for_result(result_id, language)
+
+        response[JsonKeys.CONTENT] = result_id
+        self.save(response, result_id)
+        task = asyncio.ensure_future(self._probe_for_result(result_id, language))
+        # keep a reference, otherwise the task may be garbage collected
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+        return task
+
+    async def _probe_for_result(
+        self, result_id: str, language: Literal["de", "en"]
+    ) -> dict:
+        """Probe for the result of a batch job without blocking the event loop.
+
+        The delay between two checks is determined by the `PollingPolicy` of
+        the `poller`.
+        """
+        policy = self.poller.policy
+        loop_time = asyncio.get_running_loop().time
+        started = loop_time()
+        while True:
+            logger.info(f"Checking for result '{result_id}'.")
+            result = await self.result(name=result_id, language=language)
+            elapsed = loop_time() - started
+            if result[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.MATCH:
+                policy.record(elapsed)
+                self._save_result(result_id, result, language)
+                return self.load(result_id)
+            await asyncio.sleep(policy.delay(elapsed))
@@ -0,0 +1,92 @@
+"""HTTP session used by the asyncio services."""
+import json
+import asyncio
+import aiohttp
+from typing import Any
+from requests.utils import get_encoding_from_headers
+
+
+class AsyncResponse:
+    """Fully read response, mirroring the parts of `requests.Response` used.
+
+    Attributes:
+        status_code: HTTP status code of the response.
+        headers: HTTP headers of the response.
+        content: body of the response in bytes.
+        encoding: encoding of the body, used to decode `text`.
+    """
+
+    def __init__(self, status_code: int, headers, content: bytes, encoding: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncSession:
+    """Counterpart of `requests.Session` for the asyncio services.
+
+    The underlying `aiohttp.ClientSession` is created on first use, i.e.
+    within the running event loop. The number of concurrent connections is
+    bounded by `max_connections`.
+
+    Attributes:
+        params: query parameters sent with every request, i.e. the account
+            data and the language.
+        max_connections: maximum number of concurrent connections.
+        timeout: total number of seconds a request may take.
+    """
+
+    def __init__(
+        self, params: dict = None, max_connections: int = 10, timeout: float = None
+    ) -> None:
+        self.params = dict(params or {})
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client = None
+        self._semaphore = None
+
+    async def get(self, url: str, params: dict = None, headers: dict = None):
+        """Send a GET request and read its body.
+
+        Raises:
+            aiohttp.ClientResponseError: when the request returns an
+                unsuccessful status code.
+            aiohttp.ClientError: for any other type of request exception.
+            asyncio.TimeoutError: when the request times out.
+        """
+        query = {**self.params, **(params or {})}
+        query = {k: str(v) for k, v in query.items() if v is not None}
+
+        client = self._get_client()
+        async with self._semaphore:
+            async with client.get(url, params=query, headers=headers) as response:
+                response.raise_for_status()
+                content = await response.read()
+                # decode just like `requests` for consistent results
+                encoding = get_encoding_from_headers(response.headers) or "utf-8"
+                return AsyncResponse(
+                    response.status, response.headers, content, encoding
+                )
+
+    async def close(self) -> None:
+        """Close all connections of the session."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _get_client(self) -> aiohttp.ClientSession:
+        if self._client is None or self._client.closed:
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        return self._client
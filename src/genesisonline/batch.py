@@ -0,0 +1,146 @@
+"""Concurrent execution of many service calls.
+
+A `Batch` queues calls to any service of a `GenesisOnline` client and
+executes them on a bounded thread pool once the batch is executed. Results
+are returned in submission order and errors are reported per call instead of
+aborting the whole batch.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class BatchResult:
+    """Outcome of a single call queued in a `Batch`.
+
+    Attributes:
+        service: name of the service the call was queued on, e.g. "data".
+        method: name of the called method, e.g. "table".
+        args: positional arguments of the call.
+        kwargs: keyword arguments of the call.
+        value: the return value of the call, if it succeeded.
+        error: the exception raised by the call, if it failed.
+        done: whether the call has been executed.
+    """
+
+    def __init__(self, service: str, method: str, args: tuple, kwargs: dict):
+        self.service = service
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.value = None
+        self.error = None
+        self.done = False
+
+    def __repr__(self) -> str:
+        state = "pending" if not self.done else ("ok" if self.ok else "error")
+        return f"<BatchResult {self.service}.{self.method} {state}>"
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call has been executed successfully."""
+        return self.done and self.error is None
+
+    def result(self) -> Any:
+        """Return the value of the call or raise its error."""
+        if not self.done:
+            raise RuntimeError(f"{self!r} has not been executed yet")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class _ServiceProxy:
+    """Stand-in for a service which queues calls instead of executing them."""
+
+    def __init__(self, batch: "Batch", name: str, service: Any) -> None:
+        self._batch = batch
+        self._name = name
+        self._service = service
+
+    def __getattr__(self, method: str) -> Callable[..., BatchResult]:
+        func = getattr(self._service, method)
+        if not callable(func) or method.startswith("_"):
+            raise AttributeError(f"Cannot queue '{self._name}.{method}' in a batch")
+
+        def queue(*args, **kwargs) -> BatchResult:
+            return self._batch._submit(self._name, method, func, args, kwargs)
+
+        return queue
+
+
+class Batch:
+    """Unit of work executing many service calls concurrently.
+
+    Calls are queued on the service attributes of the batch, which mirror the
+    ones of `GenesisOnline`, and executed on leaving the `with` block (or by
+    calling `execute`).
+
+    Attributes:
+        max_workers: maximum number of calls executed concurrently.
+        results: one `BatchResult` per queued call, in submission order.
+
+    Examples:
+        >>> go = GenesisOnline(username, password)
+        >>> with go.batch(max_workers=8) as b:
+        ...     table = b.data.table(name="12411-0001")
+        ...     metadata = b.metadata.table(name="12411-0001")
+        >>> table.result()
+        >>> [r.error for r in b.results if not r.ok]
+    """
+
+    def __init__(self, client, max_workers: int = 8) -> None:
+        """
+        Args:
+            client: the `GenesisOnline` client whose services are called.
+            max_workers: maximum number of calls executed concurrently.
+        """
+        self.max_workers = max_workers
+        self.results = list()
+        self._calls = list()
+        self.test = _ServiceProxy(self, "test", client.test)
+        self.find = _ServiceProxy(self, "find", client.find)
+        self.catalogue = _ServiceProxy(self, "catalogue", client.catalogue)
+        self.data = _ServiceProxy(self, "data", client.data)
+        self.metadata = _ServiceProxy(self, "metadata", client.metadata)
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def execute(self) -> List[BatchResult]:
+        """Execute all pending calls and return all results in submission order."""
+        calls, self._calls = self._calls, list()
+        if calls:
+            logger.info(
+                f"Executing {len(calls)} call(s) with {self.max_workers} workers"
+            )
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(self._execute, calls))
+        return self.results
+
+    def _submit(
+        self, service: str, method: str, func: Callable, args: tuple, kwargs: dict
+    ) -> BatchResult:
+        result = BatchResult(service, method, args, kwargs)
+        self.results.append(result)
+        self._calls.append((result, func))
+        return result
+
+    @staticmethod
+    def _execute(call: tuple) -> None:
+        result, func = call
+        try:
+            result.value = func(*result.args, **result.kwargs)
+        except Exception as e:
+            logger.warning(f"Call {result.service}.{result.method} failed: {e}")
+            result.error = e
+        result.done = True
@@ -0,0 +1,389 @@
+"""Caching of GENESIS-Online responses.
+
+Two opt-in caches are consulted by `BaseService.request` before sending a
+request to the GENESIS-Online API:
+
+- `ResponseCache`: a thread-safe in-memory LRU cache with a time-to-live.
+- `DiskCache`: a persistent cache in the `FileManager` directory which is
+  shared by all processes on a host and revalidates entries with the server.
+
+Metadata and catalogue information changes rarely, hence repeated calls with
+the same arguments can be answered without a (full) round trip.
+"""
+import os
+import re
+import copy
+import shutil
+import time
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple, Union
+from genesisonline.exceptions import ValueError
+from genesisonline.filemanager import FileManager
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Attributes:
+        maxsize: maximum number of entries before the least recently used
+            entry is evicted.
+        ttl: number of seconds an entry stays valid. If `None`, entries never
+            expire and are only evicted due to `maxsize`.
+        hits: number of lookups answered from the cache.
+        misses: number of lookups which were not found or expired.
+        evictions: number of entries removed due to `maxsize` or expiry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None) -> None:
+        """
+        Args:
+            maxsize: maximum number of entries held in memory.
+            ttl: number of seconds an entry stays valid. If `None`, entries
+                never expire.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive but is {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries and not self._expired(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a copy of the value stored for `key` or `default`."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING or self._expired(key):
+                if value is not _MISSING:
+                    del self._entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # responses are standardized in-place by the services, hence copy
+        return copy.deepcopy(value[1])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a copy of `value` under `key`."""
+        value = (time.monotonic(), copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, code: str) -> int:
+        """Remove all entries related to the object `code`.
+
+        Returns:
+            The number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if affects(code, dict(key[1]))]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries without resetting the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Counters describing the effectiveness of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+    def _expired(self, key: Hashable) -> bool:
+        if self.ttl is None:
+            return False
+        return time.monotonic() - self._entries[key][0] > self.ttl
+
+
+class DiskCache:
+    """Persistent response cache with conditional revalidation.
+
+    Entries are pickled into a `httpcache` subdirectory of the `FileManager`
+    directory and outlive the process. Files are written atomically, so the
+    cache can be shared by several scripts running on the same host.
+
+    The freshness of an entry is taken from the `Cache-Control: max-age`
+    header if the server sends one, otherwise `ttl` applies. Expired entries
+    are revalidated with `If-None-Match`/`If-Modified-Since` when the server
+    provided an `ETag`/`Last-Modified` validator. Within the
+    `stale_while_revalidate` window an expired entry is still served while it
+    is refreshed in the background.
+
+    Attributes:
+        directory: directory containing the cache entries.
+        ttl: default number of seconds an entry stays fresh.
+        stale_while_revalidate: number of seconds after expiry during which a
+            stale entry is served while being refreshed in the background.
+        hits: number of lookups answered with a fresh entry.
+        stale_hits: number of lookups answered with a stale entry.
+        misses: number of lookups without a usable entry.
+        revalidations: number of entries confirmed by the server (HTTP 304).
+    """
+
+    def __init__(
+        self,
+        directory: Union[Path, str] = None,
+        ttl: float = 3600,
+        stale_while_revalidate: float = 0,
+    ) -> None:
+        """
+        Args:
+            directory: directory of the `FileManager` the cache is placed in.
+                If `None`, the default directory in the user's home is used.
+            ttl: default number of seconds an entry stays fresh. Used if the
+                server does not specify `Cache-Control: max-age`.
+            stale_while_revalidate: number of seconds after expiry during
+                which a stale entry may be served while it is refreshed.
+        """
+        self.directory = FileManager(directory).directory / "httpcache"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[dict]:
+        """Return the entry stored for `key` or `None`.
+
+        An entry is a dict containing the `content`, the time it was
+        `stored` at, its freshness lifetime `max_age` and the validators
+        `etag` and `last_modified`.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # e.g. truncated by a crashed writer
+            logger.warning(f"Ignoring unreadable cache entry '{path}': {e}")
+            return None
+        return entry if entry.get("key") == key else None
+
+    def set(
+        self, key: Hashable, content: Any, headers: Mapping[str, str] = None
+    ) -> None:
+        """Store `content` together with the validators found in `headers`."""
+        headers = headers or {}
+        cache_control = self._cache_control(headers)
+        if "no-store" in cache_control:
+            return
+
+        entry = {
+            "key": key,
+            "content": content,
+            "stored": time.time(),
+            "max_age": self._max_age(headers, cache_control),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def refresh(
+        self, key: Hashable, entry: dict, headers: Mapping[str, str] = None
+    ) -> None:
+        """Mark `entry` as fresh again after the server confirmed it (HTTP 304)."""
+        headers = dict(headers or {})
+        headers.setdefault("ETag", entry["etag"])
+        headers.setdefault("Last-Modified", entry["last_modified"])
+        self.revalidations += 1
+        self.set(key, entry["content"], {k: v for k, v in headers.items() if v})
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[dict], str]:
+        """Return the entry stored for `key` together with its state.
+
+        The state is one of:<br>
+        - "fresh": the entry may be served without contacting the server.<br>
+        - "stale": the entry may be served while it is refreshed.<br>
+        - "expired": the entry has to be revalidated before it is served.<br>
+        - "missing": there is no entry for `key`.
+        """
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, "missing"
+
+        age = time.time() - entry["stored"]
+        if age <= entry["max_age"]:
+            self.hits += 1
+            return entry, "fresh"
+        if age <= entry["max_age"] + self.stale_while_revalidate:
+            self.stale_hits += 1
+            return entry, "stale"
+        self.misses += 1
+        return entry, "expired"
+
+    def validators(self, entry: Optional[dict]) -> dict:
+        """Conditional request headers for revalidating `entry`."""
+        headers = dict()
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        """Claim the background refresh of `key`, unless it is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        """Release a claim obtained with `begin_refresh`."""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, code: str) -> int:
+        """Remove all entries related to the object `code` from disk.
+
+        Entries are grouped by object name, hence only entries requested
+        without a name (e.g. catalogue listings by selection) are read.
+
+        Returns:
+            The number of removed entries.
+        """
+        removed = 0
+        for name_dir in self.directory.glob(f"*/*/{_safe_name(code)}*"):
+            removed += len(list(name_dir.glob("*.pkl")))
+            shutil.rmtree(name_dir, ignore_errors=True)
+        for path in self.directory.glob("*/*/_/*.pkl"):
+            try:
+                with open(path, "rb") as f:
+                    _, params = pickle.load(f)["key"]
+            except Exception:
+                continue
+            if affects(code, dict(params)):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries from disk."""
+        for path in self.directory.rglob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        """Counters describing the effectiveness of the cache."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "ttl": self.ttl,
+            "stale_while_revalidate": self.stale_while_revalidate,
+        }
+
+    def _path(self, key: Hashable) -> Path:
+        """File of `key`, grouped by endpoint and object name."""
+        endpoint, params = key
+        name = dict(params).get("name") or "_"
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return self.directory / endpoint / _safe_name(name) / f"{digest}.pkl"
+
+    @staticmethod
+    def _cache_control(headers: Mapping[str, str]) -> dict:
+        directives = dict()
+        for directive in headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+        return directives
+
+    def _max_age(self, headers: Mapping[str, str], cache_control: dict) -> float:
+        if "no-cache" in cache_control:
+            return 0
+        if cache_control.get("max-age", "").isdigit():
+            return int(cache_control["max-age"])
+        return self.ttl
+
+
+def _safe_name(name: str) -> str:
+    """Object name usable as directory name."""
+    return re.sub(r"[^\w\-]", "_", str(name))
+
+
+def create_response_cache(
+    service: str, ttl: Union[float, Dict[str, float]], maxsize: int
+) -> Optional[ResponseCache]:
+    """Create the response cache of `service` if caching is enabled.
+
+    Args:
+        service: name of the service, e.g. "catalogue" or "metadata".
+        ttl: either the time-to-live of all services or a dict mapping
+            service names to their time-to-live. If `None` or if `service` is
+            not listed, no cache is created.
+        maxsize: maximum number of cached responses.
+    """
+    if ttl is None:
+        return None
+    if isinstance(ttl, dict):
+        if service not in ttl:
+            return None
+        ttl = ttl[service]
+    return ResponseCache(maxsize=maxsize, ttl=ttl)
+
+
+def affects(code: str, params: dict) -> bool:
+    """Check whether a change of object `code` affects a request with `params`.
+
+    This is the case if the requested object is the changed object or one of
+    its descendants (e.g. the tables of a statistic share its code as a
+    prefix), or if a listing `selection` matches the changed object.
+    """
+    name = params.get("name")
+    if name and (str(name).startswith(code) or code.startswith(str(name))):
+        return True
+    selection = params.get("selection")
+    return bool(selection) and fnmatchcase(code, str(selection))
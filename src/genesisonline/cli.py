@@ -0,0 +1,166 @@
+"""Command-line interface of the genesisonline package.
+
+Download tables in bulk, e.g. all tables of statistic 12411 with 8 workers:
+```bash
+export GENESIS_ONLINE_USERNAME=... GENESIS_ONLINE_PASSWORD=...
+genesisonline download "12411-*" 61111-0001 --output tables --workers 8 \\
+    --param startyear=2020
+```
+
+Download only the tables which changed since the last run, e.g. nightly:
+```bash
+genesisonline sync --from-file tables.txt --output tables
+```
+
+Codes are read from the command line and/or a file (`--from-file`, one code
+or pattern per line). An interrupted download is resumed by running the same
+command again, see `Downloader`.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+from genesisonline import GenesisOnline
+from genesisonline.download import MANIFEST, Downloader
+from genesisonline.sync import STATE, TableSync
+
+
+def _param(text: str) -> tuple:
+    key, sep, value = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE but got '{text}'")
+    return key, value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="genesisonline",
+        description="Access the GENESIS-Online API of the Federal Statistical "
+        "Office of Germany.",
+    )
+    parser.add_argument(
+        "--username",
+        default=os.environ.get("GENESIS_ONLINE_USERNAME"),
+        help="defaults to $GENESIS_ONLINE_USERNAME",
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get("GENESIS_ONLINE_PASSWORD"),
+        help="defaults to $GENESIS_ONLINE_PASSWORD",
+    )
+    parser.add_argument("--language", choices=["de", "en"], default="en")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="maximum number of requests per second",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    download = commands.add_parser(
+        "download",
+        help="download tables concurrently",
+        description="Download tables concurrently, writing one file per table "
+        f"and a manifest ({MANIFEST}) to the output directory. Tables already "
+        "recorded as done in the manifest are skipped.",
+    )
+    _add_table_arguments(download)
+    download.add_argument(
+        "--no-resume",
+        dest="resume",
+        action="store_false",
+        help="download all tables, even the ones recorded as done",
+    )
+
+    sync = commands.add_parser(
+        "sync",
+        help="download only new and changed tables",
+        description="Download the tables which are new or changed since their "
+        f"last download according to catalogue/modifieddata. The dates of the "
+        f"downloads are kept in {STATE} in the output directory.",
+    )
+    _add_table_arguments(sync)
+    return parser
+
+
+def _add_table_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments selecting the tables and parameters of a command."""
+    parser.add_argument(
+        "codes",
+        nargs="*",
+        metavar="CODE",
+        help='table code or pattern, e.g. "12411-0001" or "12411-*"',
+    )
+    parser.add_argument(
+        "-f",
+        "--from-file",
+        help="file with one table code or pattern per line",
+    )
+    parser.add_argument("-o", "--output", default=".", help="output directory")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=8, help="number of concurrent requests"
+    )
+    parser.add_argument("--area", default=None, help='e.g. "all"')
+    parser.add_argument("--format", default=None, help='e.g. "ffcsv"')
+    parser.add_argument(
+        "-p",
+        "--param",
+        type=_param,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="further parameter of every request, e.g. startyear=2020",
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line `argv`, returning the exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.username or not args.password:
+        parser.error("the credentials are required, see --username/--password")
+
+    patterns = list(args.codes)
+    if args.from_file:
+        with open(args.from_file, "r", encoding="utf-8") as f:
+            patterns.extend(
+                line.strip() for line in f if line.strip() and not line.startswith("#")
+            )
+    if not patterns:
+        parser.error("no table codes given")
+
+    client = GenesisOnline(
+        args.username,
+        args.password,
+        language=args.language,
+        rate_limit=args.rate_limit,
+        pool_size=args.workers,
+        pool_block=True,
+    )
+    api_params = {
+        key: value
+        for key, value in [("area", args.area), ("format", args.format), *args.param]
+        if value is not None
+    }
+    if args.command == "sync":
+        sync = TableSync(client, args.output, max_workers=args.workers, **api_params)
+        downloader = sync.downloader
+        codes = downloader.expand(patterns)
+        results = sync.run(codes)
+        print(f"{len(results)} of {len(codes)} table(s) were new or changed")
+    else:
+        downloader = Downloader(
+            client, args.output, max_workers=args.workers, **api_params
+        )
+        results = downloader.run(downloader.expand(patterns), resume=args.resume)
+
+    failed = sorted(
+        code for code, entry in results.items() if entry["status"] != "done"
+    )
+    for code in failed:
+        print(f"failed: {code}: {results[code]['error']}", file=sys.stderr)
+    print(
+        f"{len(results) - len(failed)} of {len(results)} table(s) in "
+        f"'{downloader.directory}', manifest: {downloader.manifest}"
+    )
+    return 1 if failed else 0
@@ -1,6 +1,15 @@
 import requests
-from typing import Any
+import threading
+from datetime import date
+from typing import Any, Dict, Union
+from .batch import Batch
+from .cache import DiskCache, ResponseCache, create_response_cache
+from .connection import DEFAULT_POOL_SIZE, create_session, prewarm
 from .constants import API_VERSION, JsonKeys
+from .invalidation import CacheInvalidator
+from .mirror import CatalogueMirror
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
 from .services import (
     TestService,
     FindService,
@@ -33,16 +42,86 @@ class GenesisOnline:
     version = API_VERSION
 
     def __init__(
-        self, username: str, password: str, language: Literal["de", "en"] = "en"
+        self,
+        username: str,
+        password: str,
+        language: Literal["de", "en"] = "en",
+        cache_ttl: Union[float, Dict[str, float]] = None,
+        cache_maxsize: int = 1024,
+        disk_cache: DiskCache = None,
+        rate_limit: float = None,
+        burst: int = None,
+        retry_policy: RetryPolicy = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        job_budget: float = None,
+        max_bytes: int = None,
+        eviction: Literal["lru", "lfu"] = "lru",
     ) -> None:
         """Constructor for the `GenesisOnline` class.
 
+        A client may be shared by many threads, e.g. of a
+        `concurrent.futures.ThreadPoolExecutor`. For this thread-safe use, set
+        `pool_size` to at least the number of threads and `pool_block=True`,
+        so that every request is sent over one of `pool_size` persistent
+        connections, and open them ahead of time with `prewarm`:
+
+        ```python
+        go = GenesisOnline(username, password, pool_size=32, pool_block=True)
+        go.prewarm()
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            tables = list(executor.map(lambda n: go.data.table(name=n), names))
+        ```
+
+        Changing `username`, `password` or `language` replaces the parameters
+        of the session at once, hence concurrent requests send either the old
+        or the new parameters, never a mix.
+
         Args:
             username: username of the user's GENESIS-Online account.
             password: password of the user's GENESIS-Online account.
             language: language the user wants the response to be in.
+            cache_ttl: enables the in-memory response cache. Either the number
+                of seconds a response stays valid for all services, or a dict
+                mapping service names (e.g. "catalogue", "metadata") to their
+                time-to-live, in which case only the listed services are
+                cached. A time-to-live of `None` never expires. If `cache_ttl`
+                is `None`, responses are not cached.
+            cache_maxsize: maximum number of responses cached per service.
+            disk_cache: persistent response cache shared by all services and
+                processes using the same directory, e.g.
+                `DiskCache(ttl=86400, stale_while_revalidate=3600)`.
+            rate_limit: maximum number of requests per second sent by all
+                services together. The rate is lowered automatically while
+                the server signals overload. If `None`, requests are not
+                rate limited.
+            burst: maximum number of requests sent back-to-back, see
+                `RateLimiter`.
+            retry_policy: policy for retrying requests which failed due to
+                transient errors, e.g. `RetryPolicy(total=5)`. Its counters
+                are shared by all services. If `None`, requests are not
+                retried.
+            pool_size: maximum number of persistent connections, i.e. of
+                requests sent concurrently without opening a new connection.
+            pool_block: if True, requests wait for a free connection when all
+                `pool_size` connections are in use, instead of opening an extra
+                connection which is closed afterwards.
+            keep_alive: if False, connections are closed after every request.
+            job_budget: maximum number of requests per second sent to check
+                the batch jobs of the data service, see `JobPoller`. If
+                `None`, the checks are only limited by the polling policy.
+            max_bytes: maximum total size of the results saved by the data
+                service. If exceeded, results are evicted, except the ones of
+                pending batch jobs. If `None`, results are never evicted.
+            eviction: order in which saved results are evicted, "lru" or
+                "lfu".
         """
-        self.session = requests.Session()
+        self.session = create_session(
+            pool_size=pool_size, pool_block=pool_block, keep_alive=keep_alive
+        )
+        self.pool_size = pool_size
+        self._params_lock = threading.Lock()
         self.session.params = {
             "username": username,
             "password": password,
@@ -51,11 +130,25 @@ class GenesisOnline:
         self.username = username
         self.password = password
         self.language = language
-        self.test = TestService(self.session)
-        self.find = FindService(self.session)
-        self.catalogue = CatalogueService(self.session)
-        self.data = DataService(self.session)
-        self.metadata = MetadataService(self.session)
+        self._cache_ttl = cache_ttl
+        self._cache_maxsize = cache_maxsize
+        self.disk_cache = disk_cache
+        self.rate_limiter = (
+            RateLimiter(rate_limit, burst=burst) if rate_limit is not None else None
+        )
+        self.retry_policy = retry_policy
+        self.job_budget = job_budget
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.test = TestService(self.session, **self._service_options("test"))
+        self.find = FindService(self.session, **self._service_options("find"))
+        self.catalogue = CatalogueService(
+            self.session, **self._service_options("catalogue")
+        )
+        self.data = DataService(self.session, **self._service_options("data"))
+        self.metadata = MetadataService(
+            self.session, **self._service_options("metadata")
+        )
         self.services = [
             self.test._service,
             self.find._service,
@@ -72,7 +165,7 @@ class GenesisOnline:
     @username.setter
     def username(self, value: str):
         self._username = value
-        self.session.params["username"] = value
+        self._set_param("username", value)
 
     @property
     def password(self):
@@ -82,7 +175,7 @@ class GenesisOnline:
     @password.setter
     def password(self, value: str):
         self._password = value
-        self.session.params["password"] = value
+        self._set_param("password", value)
 
     @property
     def language(self):
@@ -92,7 +185,158 @@ class GenesisOnline:
     @language.setter
     def language(self, value: Literal["de", "en"]):
         self._language = value
-        self.session.params["language"] = value
+        self._set_param("language", value)
+
+    def _set_param(self, key: str, value: str) -> None:
+        """Replace the parameters of the session, which requests read at once."""
+        with self._params_lock:
+            self.session.params = {**self.session.params, key: value}
+
+    def prewarm(self, connections: int = None) -> int:
+        """Open persistent connections to the API ahead of concurrent use.
+
+        Args:
+            connections: number of connections to open. If `None`,
+                `pool_size`.
+
+        Returns:
+            The number of connections opened successfully.
+        """
+        if connections is None:
+            connections = self.pool_size
+        return prewarm(self.session, min(connections, self.pool_size))
+
+    def _service_options(self, service: str) -> dict:
+        """Keyword arguments passed to the constructor of `service`."""
+        options = {
+            "response_cache": self._make_cache(service),
+            "disk_cache": self.disk_cache,
+            "rate_limiter": self.rate_limiter,
+            "retry_policy": self.retry_policy,
+        }
+        if service == "data":
+            options["job_budget"] = self.job_budget
+            options["max_bytes"] = self.max_bytes
+            options["eviction"] = self.eviction
+        return options
+
+    def _make_cache(self, service: str) -> ResponseCache:
+        """Create the response cache of `service` if caching is enabled."""
+        return create_response_cache(service, self._cache_ttl, self._cache_maxsize)
+
+    def cache_info(self) -> dict:
+        """Hit, miss and eviction counters of the response cache per service.
+
+        Services without a response cache are not listed. The counters of the
+        disk cache are listed under "disk".
+        """
+        services = {
+            "test": self.test,
+            "find": self.find,
+            "catalogue": self.catalogue,
+            "data": self.data,
+            "metadata": self.metadata,
+        }
+        info = {
+            name: service.response_cache.stats
+            for name, service in services.items()
+            if service.response_cache is not None
+        }
+        if self.disk_cache is not None:
+            info["disk"] = self.disk_cache.stats
+        return info
+
+    def batch(self, max_workers: int = 8) -> Batch:
+        """Create a `Batch` executing queued service calls concurrently.
+
+        Args:
+            max_workers: maximum number of calls executed concurrently. Calls
+                beyond the `pool_size` of the client open extra connections.
+
+        Examples:
+            >>> with go.batch(max_workers=8) as b:
+            ...     b.data.table(name="12411-0001")
+            ...     b.metadata.table(name="12411-0001")
+            >>> tables = [r.value for r in b.results if r.ok]
+        """
+        return Batch(self, max_workers=max_workers)
+
+    def cache_invalidator(
+        self, interval: float = 3600, since: date = None
+    ) -> CacheInvalidator:
+        """Create a `CacheInvalidator` for all caches of this client.
+
+        The invalidator evicts the cached responses and saved batch job
+        results of objects reported by `catalogue.modifieddata`. Call its
+        `start` method (or use it as a context manager) to poll every
+        `interval` seconds in the background.
+
+        Examples:
+            >>> go = GenesisOnline(username, password, cache_ttl={"metadata": None})
+            >>> with go.cache_invalidator(interval=600):
+            ...     response = go.metadata.table(name="12411-0001")
+        """
+        caches = [
+            service.response_cache
+            for service in (
+                self.test,
+                self.find,
+                self.catalogue,
+                self.data,
+                self.metadata,
+            )
+            if service.response_cache is not None
+        ]
+        if self.disk_cache is not None:
+            caches.append(self.disk_cache)
+        caches.append(self.data)
+        return CacheInvalidator(self.catalogue, caches, interval=interval, since=since)
+
+    def catalogue_mirror(
+        self, path: str = None, languages=("de", "en"), max_workers: int = 8
+    ) -> CatalogueMirror:
+        """Create a `CatalogueMirror` answering `find` requests offline.
+
+        The mirror is attached to the find service, i.e. after its first
+        `sync`, `find.find(term, offline=True)` searches the local copy of the
+        catalogue instead of requesting the API.
+
+        Args:
+            path: path of the SQLite database. If `None`, "catalogue.sqlite" in
+                the default `FileManager` directory.
+            languages: languages the catalogue is copied in.
+            max_workers: number of concurrent requests while listing.
+
+        Examples:
+            >>> mirror = go.catalogue_mirror()
+            >>> mirror.sync()
+            >>> response = go.find.find("population", offline=True)
+        """
+        mirror = CatalogueMirror(
+            self.catalogue, path=path, languages=languages, max_workers=max_workers
+        )
+        self.find.mirror = mirror
+        return mirror
+
+    def metadata_crawler(self, max_workers: int = 8, area: str = "all"):
+        """Create a `MetadataCrawler` building the graph of related objects.
+
+        Requires the optional dependency `numpy`.
+
+        Args:
+            max_workers: maximum number of requests sent concurrently.
+            area: area the objects are listed from.
+
+        Examples:
+            >>> crawler = go.metadata_crawler(max_workers=8)
+            >>> graph = crawler.crawl(selection="124*")
+            >>> graph.tables_with("GES", "KREISE")
+        """
+        from .graph import MetadataCrawler
+
+        return MetadataCrawler(
+            self.catalogue, self.metadata, max_workers=max_workers, area=area
+        )
 
     def check_api(self) -> dict:
         """Check if the GENESIS-Online API is online."""
@@ -102,7 +346,12 @@ class GenesisOnline:
         """Check if the GENESIS-Online API credentials are valid."""
         return self.test.logincheck().get(JsonKeys.CONTENT)
 
-    def request(self, endpoint: str, **kwargs: str) -> Any:
+    def request(
+        self,
+        endpoint: str,
+        stream: Union[bool, Literal["lines", "bytes"]] = False,
+        **kwargs: str,
+    ) -> Any:
         """Returns a raw response from the specified `endpoint`.
 
         This function can be used to retrieve a completely unformatted response
@@ -111,11 +360,15 @@ class GenesisOnline:
 
         Args:
             endpoint: The endpoint URL segment to which the request will be sent.
+            stream: If `True` or "lines", a text/csv body is returned as a lazy
+                iterator over its lines. If "bytes", text/csv and image/png
+                bodies are returned as a lazy iterator over byte chunks.
             **kwargs: Additional keyword arguments to be sent as query parameters
                 in the request.
 
         Returns:
-            Any: The returned content may be a JSON, binary or text.
+            Any: The returned content may be a JSON, binary or text, or an
+                iterator of lines or byte chunks if `stream` is set.
 
         Raises:
             HTTPError: When the HTTP request returns an unsuccessful status code.
@@ -133,5 +386,9 @@ class GenesisOnline:
             >>> go = GenesisOnline(username="your_username", password="your_password")
             >>> response = go.request(endpoint="data/chart2table", name="12411-0001")
             >>> print(response)
+            >>>
+            >>> # stream a large csv export line by line
+            >>> lines = go.request(endpoint="data/tablefile", name="12411-0001", stream=True)
+            >>> header = next(lines)
         """
-        return self.test.request(endpoint, **kwargs)
+        return self.test.request(endpoint, stream=stream, **kwargs)
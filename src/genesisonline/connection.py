@@ -0,0 +1,88 @@
+"""Pooled HTTP connections to the GENESIS-Online API.
+
+All services of a `GenesisOnline` client send their requests with one
+`requests.Session`, whose connections are kept alive and reused. By default,
+`requests` keeps at most 10 connections per host. When more threads send
+requests at once, surplus connections are opened and discarded after every
+request ("Connection pool is full"), i.e. each of those requests pays for a
+new TCP and TLS handshake.
+
+`create_session` sizes the pool for the expected number of concurrent
+requests. With `pool_block=True`, threads exceeding the pool wait for a free
+connection instead of opening a throwaway one. `prewarm` opens connections
+ahead of time, so that the first concurrent requests do not all handshake at
+once.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from genesisonline import exceptions
+from genesisonline.constants import BASE_URL, Endpoints
+
+logger = logging.getLogger(__name__)
+
+# number of connections kept alive by default, as in `requests`
+DEFAULT_POOL_SIZE = 10
+
+
+def create_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """Create a session with a connection pool of `pool_size` connections.
+
+    Args:
+        pool_size: maximum number of connections kept alive, i.e. the number
+            of requests which can be sent concurrently over persistent
+            connections.
+        pool_block: if True, a request waits for a free connection when all
+            `pool_size` connections are in use. If False, it opens an extra
+            connection, which is closed afterwards.
+        keep_alive: if False, every connection is closed after its request.
+    """
+    if pool_size < 1:
+        raise exceptions.ValueError(f"pool_size must be positive but is {pool_size}")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def prewarm(session: requests.Session, connections: int, url: str = None) -> int:
+    """Open `connections` connections of `session` concurrently.
+
+    Each connection sends a request to the unauthenticated `helloworld/whoami`
+    endpoint and is then returned to the pool of the session.
+
+    Args:
+        session: the session whose pool is filled.
+        connections: number of connections to open, at most the pool size.
+        url: URL requested by every connection. If `None`, the `whoami`
+            endpoint of the GENESIS-Online API.
+
+    Returns:
+        The number of connections opened successfully.
+    """
+    url = url or urljoin(BASE_URL, Endpoints.TEST_WHOAMI)
+
+    def warm(_) -> bool:
+        try:
+            # without the session's params, i.e. without credentials
+            session.get(url, params={key: None for key in session.params or {}})
+            return True
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Opening a connection to '{url}' failed: {e}")
+            return False
+
+    if connections < 1:
+        return 0
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        opened = sum(executor.map(warm, range(connections)))
+    logger.info(f"Opened {opened} connection(s) to '{url}'")
+    return opened
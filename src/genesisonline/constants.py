@@ -5,6 +5,10 @@ from enum import IntEnum
 BASE_URL = "https://www-genesis.destatis.de/genesisWS/rest/2020/"
 API_VERSION = "4.3"
 PACKAGE_NAME = "genesisonline"
+COPYRIGHT = {
+    "de": "© Statistisches Bundesamt (Destatis), {year}",
+    "en": "© Federal Statistical Office, Wiesbaden {year}",
+}
 
 
 class JsonKeys:
@@ -34,6 +38,9 @@ class JsonKeys:
     VARIABLES = "Variables"  # find service (optional)
     CUBES = "Cubes"  # find service (optional)
 
+    # state of a batch job listed by the catalogue service
+    STATE = "State"
+
     # copyright information of the publisher
     COPYRIGHT = "Copyright"
 
@@ -46,6 +53,14 @@ class JsonStrings:
     """Contains the most commonly encountered JSON strings"""
 
     NA = "NA"
+    SUCCESS = {"de": "erfolgreich", "en": "successfull"}
+    INFORMATION = {"de": "Information", "en": "information"}
+    NO_MATCH = {
+        "de": "Es gibt keine Objekte zum angegebenen Selektionskriterium",
+        "en": "There are no objects matching your selection",
+    }
+    FINISHED = "finished"  # state of a finished batch job (language "en")
+    RUNNING = "running"  # state of a running batch job (language "en")
 
 
 class ResponseStatus(IntEnum):
@@ -0,0 +1,236 @@
+"""Bulk download of tables with a resumable manifest.
+
+A `Downloader` requests many tables concurrently with `DataService.table`.
+Tables too large to be returned directly are processed as batch jobs, whose
+results are awaited by the `JobPoller` of the data service without blocking
+a worker thread. Every finished table is written to its own file, and its
+outcome is appended to the manifest, one JSON object per line:
+
+```
+{"code": "12411-0001", "status": "done", "file": "12411-0001.csv", "bytes": 3172, "seconds": 0.4, "job": false, "error": null}
+```
+
+Running a download again with the same output directory skips every table
+recorded as done, i.e. an interrupted run is resumed without fetching the
+finished tables again. A table the API does not return, e.g. as it was not
+found, is recorded as failed with the status text of the response as error.
+"""
+import fnmatch
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+from genesisonline import exceptions
+from genesisonline.constants import JsonKeys, ResponseStatus
+from genesisonline.pagination import SELECTION_LENGTH, WILDCARD
+
+logger = logging.getLogger(__name__)
+
+# name of the manifest in the output directory
+MANIFEST = "manifest.jsonl"
+
+# file extension of the tables of each `format`
+EXTENSIONS = {"ffcsv": ".csv", "csv": ".csv", "xlsx": ".xlsx", "html": ".html"}
+
+# status codes of responses containing the table
+MATCHED = (ResponseStatus.MATCH, ResponseStatus.PARTLY_MATCH)
+
+
+class Downloader:
+    """Downloads tables concurrently into a directory.
+
+    Attributes:
+        client: the `GenesisOnline` client the tables are requested with.
+        directory: directory the tables and the manifest are written to.
+        max_workers: maximum number of tables requested concurrently.
+        api_params: further parameters of every request, e.g.
+            `{"startyear": "2020"}`.
+    """
+
+    def __init__(
+        self,
+        client,
+        directory: Union[Path, str],
+        max_workers: int = 8,
+        **api_params,
+    ) -> None:
+        """
+        Args:
+            client: the `GenesisOnline` client the tables are requested with.
+            directory: directory the tables and the manifest are written to,
+                created if necessary.
+            max_workers: maximum number of tables requested concurrently.
+            **api_params: further parameters of every request.
+        """
+        self.client = client
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.api_params = api_params
+
+    @property
+    def manifest(self) -> Path:
+        return self.directory / MANIFEST
+
+    def entries(self) -> Dict[str, dict]:
+        """Latest manifest entry of every table, by code."""
+        entries = dict()
+        if not self.manifest.exists():
+            return entries
+        with open(self.manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line of an interrupted run
+                    continue
+                entries[entry["code"]] = entry
+        return entries
+
+    def expand(self, patterns: Iterable[str]) -> List[str]:
+        """Table codes matching `patterns`, e.g. "12411-0001" or "12411-*".
+
+        Codes without wildcards are kept as they are. Patterns with wildcards
+        ("*", "?" or "[...]") are matched against the codes listed by
+        `catalogue.iter_tables`.
+        """
+        codes = list()
+        for pattern in patterns:
+            if not re.search(r"[*?[]", pattern):
+                codes.append(pattern)
+                continue
+            prefix = re.split(r"[*?[]", pattern, maxsplit=1)[0]
+            listed = self.client.catalogue.iter_tables(
+                selection=f"{prefix[: SELECTION_LENGTH - 1]}{WILDCARD}",
+                area=self.api_params.get("area"),
+            )
+            matches = sorted(
+                obj[JsonKeys.CODE]
+                for obj in listed
+                if fnmatch.fnmatchcase(obj[JsonKeys.CODE], pattern)
+            )
+            if not matches:
+                logger.warning(f"No tables match '{pattern}'")
+            codes.extend(matches)
+        return list(dict.fromkeys(codes))
+
+    def run(self, codes: Iterable[str], resume: bool = True) -> Dict[str, dict]:
+        """Download the tables `codes`.
+
+        Args:
+            codes: codes of the tables.
+            resume: if True, tables recorded as done in the manifest, whose
+                file still exists, are skipped.
+
+        Returns:
+            The manifest entry of every downloaded or skipped table, by code.
+        """
+        codes = list(dict.fromkeys(codes))
+        entries = self.entries() if resume else dict()
+        done = {
+            code: entry
+            for code, entry in entries.items()
+            if code in codes
+            and entry["status"] == "done"
+            and (self.directory / entry["file"]).exists()
+        }
+        todo = [code for code in codes if code not in done]
+        if done:
+            logger.info(f"Skipping {len(done)} table(s) downloaded before")
+
+        results = dict(done)
+        started: Dict[str, float] = dict()
+        jobs = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Future, str] = dict()
+            for code in todo:
+                pending[executor.submit(self._request, code, started)] = code
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    code = pending.pop(future)
+                    try:
+                        response = future.result()
+                        if isinstance(response, Future):
+                            # the table itself, done unless it is a batch job
+                            if not response.done():
+                                jobs.add(code)
+                            pending[response] = code
+                            continue
+                        entry = self._write(code, response)
+                    except Exception as e:
+                        logger.warning(f"Downloading '{code}' failed: {e}")
+                        entry = {"code": code, "status": "failed", "error": str(e)}
+                    entry["seconds"] = round(time.perf_counter() - started[code], 3)
+                    entry["job"] = code in jobs
+                    self._record(entry)
+                    results[code] = entry
+
+        failed = sum(entry["status"] != "done" for entry in results.values())
+        logger.info(
+            f"Downloaded {len(todo) - failed} of {len(todo)} table(s) "
+            f"to '{self.directory}'"
+        )
+        return results
+
+    def _request(self, code: str, started: Dict[str, float]) -> Future:
+        """Request table `code`, returning the future of its response.
+
+        The time the request is started at is recorded in `started`, as the
+        request may wait for a free worker after its submission.
+        """
+        started[code] = time.perf_counter()
+        return self.client.data.table(
+            wait_for_result=False, name=code, **self.api_params
+        )
+
+    def _write(self, code: str, response: dict) -> dict:
+        """Write the content of `response` atomically, returning its entry.
+
+        Raises:
+            RequestError: if `response` does not contain the table.
+        """
+        status = response[JsonKeys.STATUS]
+        if status[JsonKeys.CODE] not in MATCHED:
+            raise exceptions.RequestError(
+                status.get(JsonKeys.CONTENT) or f"status {status[JsonKeys.CODE]}"
+            )
+        content = response[JsonKeys.CONTENT]
+        if isinstance(content, bytes):
+            data = content
+            suffix = EXTENSIONS.get(self.api_params.get("format"), ".bin")
+        elif isinstance(content, str):
+            data = content.encode("utf-8")
+            suffix = EXTENSIONS.get(self.api_params.get("format"), ".csv")
+        else:
+            data = json.dumps(content, ensure_ascii=False).encode("utf-8")
+            suffix = ".json"
+
+        file_name = f"{code}{suffix}"
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix=f".{file_name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp, self.directory / file_name)
+        except BaseException:
+            os.remove(temp)
+            raise
+        return {
+            "code": code,
+            "status": "done",
+            "file": file_name,
+            "bytes": len(data),
+            "error": None,
+        }
+
+    def _record(self, entry: dict) -> None:
+        """Append `entry` to the manifest."""
+        with open(self.manifest, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
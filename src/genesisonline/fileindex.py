@@ -0,0 +1,170 @@
+"""Index of the files saved by a `FileManager`.
+
+The index is a SQLite database in the directory of the `FileManager`. It
+records the size, the last access, the number of accesses and the origin
+(endpoint and parameters) of every saved file. Hence, the total size of the
+directory is known and the files to evict are found without scanning the
+directory. SQLite serializes concurrent writers, so the index can be shared by
+all processes using the same directory.
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+from genesisonline import exceptions
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+# order in which files are evicted by each eviction policy
+EVICTION_ORDER = {
+    "lru": "accessed, hits",
+    "lfu": "hits, accessed",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    endpoint TEXT,
+    params TEXT
+);
+CREATE INDEX IF NOT EXISTS files_accessed ON files (accessed);
+"""
+
+
+class FileIndex:
+    """SQLite index of the size, last access and origin of saved files.
+
+    Attributes:
+        path: path of the SQLite database.
+        eviction: "lru" evicts the least recently used files first, "lfu" the
+            least frequently used ones.
+        created: whether the database did not exist before, i.e. the files
+            already in the directory are not indexed yet.
+    """
+
+    def __init__(self, path: Path, eviction: Literal["lru", "lfu"] = "lru") -> None:
+        """
+        Args:
+            path: path of the SQLite database, created if it does not exist.
+            eviction: order in which files are evicted, "lru" or "lfu".
+        """
+        if eviction not in EVICTION_ORDER:
+            raise exceptions.ValueError(
+                f"Unsupported eviction '{eviction}'. "
+                f"Currently support: {list(EVICTION_ORDER)}"
+            )
+        self.path = Path(path)
+        self.eviction = eviction
+        self.created = not self.path.exists()
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def add(self, name: str, size: int, origin: dict = None) -> None:
+        """Record the file `name` of `size` bytes, which was just written."""
+        origin = origin or dict()
+        params = origin.get("params")
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO files "
+                "(name, size, accessed, hits, endpoint, params) "
+                "VALUES (?, ?, ?, 0, ?, ?)",
+                (
+                    name,
+                    size,
+                    time.time(),
+                    origin.get("endpoint"),
+                    json.dumps(params, sort_keys=True) if params is not None else None,
+                ),
+            )
+
+    def touch(self, name: str) -> None:
+        """Record an access of the file `name`."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE files SET accessed = ?, hits = hits + 1 WHERE name = ?",
+                (time.time(), name),
+            )
+
+    def remove(self, name: str) -> None:
+        """Forget the file `name`."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM files WHERE name = ?", (name,))
+
+    def get(self, name: str) -> Optional[dict]:
+        """Size, last access, number of accesses and origin of the file `name`."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT size, accessed, hits, endpoint, params FROM files "
+                "WHERE name = ?",
+                (name,),
+            ).fetchone()
+        if row is None:
+            return None
+        size, accessed, hits, endpoint, params = row
+        return {
+            "size": size,
+            "accessed": accessed,
+            "hits": hits,
+            "endpoint": endpoint,
+            "params": json.loads(params) if params is not None else None,
+        }
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Names of all indexed files starting with `prefix`."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT name FROM files WHERE substr(name, 1, ?) = ? ORDER BY name",
+                (len(prefix), prefix),
+            ).fetchall()
+        return [name for name, in rows]
+
+    def totals(self) -> Tuple[int, int]:
+        """Number of files and their total size in bytes."""
+        with self._connect() as connection:
+            count, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files"
+            ).fetchone()
+        return count, size
+
+    def candidates(self, excess: int, keep: Iterable[str] = ()) -> List[str]:
+        """Names of the files to evict to free at least `excess` bytes.
+
+        Args:
+            excess: number of bytes to free.
+            keep: names of files which are never evicted, e.g. the one just
+                saved and the ones of pending batch jobs.
+        """
+        keep = {keep} if isinstance(keep, str) else set(keep or ())
+        names = list()
+        freed = 0
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT name, size FROM files "
+                f"ORDER BY {EVICTION_ORDER[self.eviction]}"
+            )
+            for name, size in rows:
+                if freed >= excess:
+                    break
+                if name in keep:
+                    continue
+                names.append(name)
+                freed += size
+        return names
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, committing and closing it afterwards."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -1,15 +1,49 @@
 import os
+import bz2
+import gzip
+import lzma
 from pathlib import Path
-from typing import Union, Any
+from typing import Union, Any, Callable, IO, Iterable
 import pickle
 import logging
 import json
+import shutil
+import tempfile
 from genesisonline.constants import PACKAGE_NAME
 from genesisonline.exceptions import ValueError
+from genesisonline.fileindex import FileIndex
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
 
 logger = logging.getLogger(__name__)
 
 
+def _open_zstd(path: Path, mode: str) -> IO:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Zstandard compression requires 'zstandard'. "
+            "Install it with 'pip install genesisonline[zstd]'."
+        ) from e
+    return zstandard.open(path, mode)
+
+
+# name of the SQLite index of the saved files
+INDEX_NAME = ".index.sqlite"
+
+# functions opening a file compressed according to its last suffix
+COMPRESSIONS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".zst": _open_zstd,
+}
+
+
 class FileManager:
     """
     A utility class for managing file operations in a specified directory.
@@ -17,15 +51,45 @@ class FileManager:
     This class provides methods for handling file operations, such as saving
     and retrieving files in a designated directory.
 
+    Files are compressed according to an additional suffix, e.g.
+    "result.json.gz" (see `supported_compressions`). Files are written to a
+    temporary file first and then renamed, hence a crash during a write never
+    leaves a partially written file behind.
+
+    Parsed tables and cubes (see `genesisonline.parsers`) are saved in a
+    columnar format to a directory with the suffix ".columns". Loading maps
+    their arrays into memory instead of reading them, which is instant and
+    shares the memory between processes.
+
+    All saved files are recorded in a SQLite index in the directory (see
+    `FileIndex`), which tracks their size, last access and origin. If
+    `max_bytes` is set, the least recently (or frequently) used files are
+    evicted whenever a save exceeds it.
+
     Attributes
     ----------
     directory : pathlib.Path
         The path to the directory where files will be stored.
     supported_file_types : list
         Contains names of currently supported file types.
+    supported_compressions : list
+        Contains suffixes of currently supported compressions. "zst" requires
+        the optional dependency `zstandard`.
+    max_bytes : int
+        Maximum total size of all saved files. If `None`, files are never
+        evicted.
+    eviction : str
+        Order in which files are evicted, "lru" or "lfu".
+    evictions : int
+        Number of files evicted so far.
     """
 
-    def __init__(self, directory: Union[Path, str] = None):
+    def __init__(
+        self,
+        directory: Union[Path, str] = None,
+        max_bytes: int = None,
+        eviction: Literal["lru", "lfu"] = "lru",
+    ):
         """Initialize a FileManager instance.
 
         Parameters:
@@ -34,9 +98,18 @@ class FileManager:
             The path to the directory where files will be stored.
             If not provided, a default directory called 'genesisonline' is
             created in the user's home directory.
+        max_bytes : int
+            Maximum total size of all saved files, enforced on every save.
+        eviction : str
+            "lru" evicts the least recently used files first, "lfu" the least
+            frequently used ones.
         """
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.evictions = 0
         self.directory = directory
-        self.supported_file_types = ["pkl", "json"]
+        self.supported_file_types = ["pkl", "json", "columns"]
+        self.supported_compressions = [suffix[1:] for suffix in COMPRESSIONS]
 
     @property
     def directory(self) -> Path:
@@ -50,12 +123,34 @@ class FileManager:
             self._directory = Path(os.path.expanduser("~")) / PACKAGE_NAME
 
         self._directory.mkdir(parents=True, exist_ok=True)
+        self._index = None
         logger.info(f"Initialized directory '{self._directory}'")
 
-    def save(self, content: Any, file_name: str) -> None:
+    @property
+    def index(self) -> FileIndex:
+        """Index of the saved files, created on first use."""
+        if self._index is None:
+            index = FileIndex(self._directory / INDEX_NAME, eviction=self.eviction)
+            if index.created:
+                # files saved before the index existed are indexed once
+                for path in self._directory.iterdir():
+                    file_type, _ = self._file_type(path)
+                    if file_type in (".pkl", ".json", ".columns"):
+                        index.add(path.name, _size(path))
+            self._index = index
+        return self._index
+
+    def save(
+        self,
+        content: Any,
+        file_name: str,
+        origin: dict = None,
+        keep: Iterable[str] = (),
+    ) -> None:
         """Save `content` to a file called `file_name`.
 
-        The file type depends on the provided suffix in `file_name`.
+        The file type depends on the provided suffix in `file_name`, which
+        may be followed by the suffix of a compression, e.g. ".json.gz".
 
         Parameters
         ----------
@@ -63,53 +158,167 @@ class FileManager:
             The content to be saved to the file.
         file_name : str
             The name of the file the content is saved to.
+        origin : dict
+            Where the content comes from, recorded in the index, i.e. the
+            "endpoint" and its "params".
+        keep : Iterable[str]
+            Names of further files which must not be evicted by this save,
+            e.g. the ones of pending batch jobs. The saved file itself is
+            never evicted.
         """
         destination = self.directory / file_name
-        file_type = destination.suffix
+        file_type, opener = self._file_type(destination)
         logger.info(f"Saving file '{destination}'")
 
         if file_type == ".pkl":
-            self._save_pickle(content, destination)
+            self._write(destination, opener, "wb", lambda f: pickle.dump(content, f))
         elif file_type == ".json":
-            self._save_json(content, destination)
+            self._write(destination, opener, "wt", lambda f: json.dump(content, f))
+        elif file_type == ".columns" and opener is open:
+            from genesisonline.parsers.columnar import save_columns
+
+            self._write_directory(destination, lambda d: save_columns(content, d))
         else:
             raise ValueError(
                 f"Unsupported file type '{file_type}'. Currently support: {self.supported_file_types}"
             )
+        self.index.add(file_name, _size(destination), origin)
+        if self.max_bytes is not None:
+            self.prune(keep={file_name, *keep})
 
     def load(self, file_name: str) -> Any:
         """Load content from `file_name`.
 
+        Compressed files are decompressed while they are read.
+
         Parameters
         ----------
         file_name : str
             The name of the file the content is retrieved from.
         """
         destination = self.directory / file_name
-        file_type = destination.suffix
+        file_type, opener = self._file_type(destination)
         logger.info(f"Loading file '{destination}'")
 
         if file_type == ".pkl":
-            return self._load_pickle(destination)
+            with opener(destination, "rb") as f:
+                content = pickle.load(f)
         elif file_type == ".json":
-            return self._load_json(destination)
+            with opener(destination, "rt") as f:
+                content = json.load(f)
+        elif file_type == ".columns" and opener is open:
+            from genesisonline.parsers.columnar import load_columns
+
+            content = load_columns(destination)
         else:
             raise ValueError(
                 f"Unsupported file type '{file_type}'. Currently support {self.supported_file_types}"
             )
+        self.index.touch(file_name)
+        return content
+
+    def delete(self, file_name: str) -> None:
+        """Delete the file (or columnar directory) `file_name`, if it exists.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file to be deleted.
+        """
+        destination = self.directory / file_name
+        if destination.is_dir():
+            shutil.rmtree(destination, ignore_errors=True)
+        else:
+            destination.unlink(missing_ok=True)
+        self.index.remove(file_name)
+
+    def stats(self) -> dict:
+        """Number and total size of the saved files, read from the index."""
+        files, size = self.index.totals()
+        return {
+            "files": files,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+    def prune(self, max_bytes: int = None, keep: Iterable[str] = ()) -> int:
+        """Evict files until their total size is at most `max_bytes`.
+
+        The files to evict are determined from the index, without scanning
+        the directory.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Maximum total size of all files. If `None`, `self.max_bytes`.
+        keep : Iterable[str]
+            Names of files which are never evicted.
+
+        Returns
+        -------
+        int
+            The number of evicted files.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return 0
+        _, size = self.index.totals()
+        if size <= max_bytes:
+            return 0
+        names = self.index.candidates(size - max_bytes, keep=keep)
+        for name in names:
+            logger.info(f"Evicting file '{self.directory / name}'")
+            self.delete(name)
+        self.evictions += len(names)
+        return len(names)
+
+    def _file_type(self, destination: Path) -> tuple:
+        """Split the suffix of `destination` into file type and compression.
+
+        Returns:
+            The file type, e.g. ".json", and the function opening the file.
+        """
+        suffixes = destination.suffixes
+        if suffixes and suffixes[-1] in COMPRESSIONS:
+            file_type = suffixes[-2] if len(suffixes) > 1 else ""
+            return file_type, COMPRESSIONS[suffixes[-1]]
+        return destination.suffix, open
 
-    def _save_json(self, content, destination) -> None:
-        with open(destination, "w") as f:
-            json.dump(content, f)
+    def _write(
+        self, destination: Path, opener: Callable, mode: str, dump: Callable
+    ) -> None:
+        """Write `destination` atomically by renaming a temporary file."""
+        fd, tmp = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            with opener(tmp, mode) as f:
+                dump(f)
+            os.replace(tmp, destination)
+        except BaseException:
+            os.unlink(tmp)
+            raise
 
-    def _load_json(self, destination) -> Any:
-        with open(destination, "r") as f:
-            return json.load(f)
+    def _write_directory(self, destination: Path, dump: Callable) -> None:
+        """Write the directory `destination` atomically by renaming."""
+        tmp = Path(tempfile.mkdtemp(dir=destination.parent, suffix=".tmp"))
+        try:
+            dump(tmp)
+            if destination.exists():
+                # directories cannot be replaced, move the old one aside first
+                old = Path(tempfile.mkdtemp(dir=destination.parent, suffix=".tmp"))
+                os.replace(destination, old / destination.name)
+                os.replace(tmp, destination)
+                shutil.rmtree(old)
+            else:
+                os.replace(tmp, destination)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
 
-    def _save_pickle(self, content, destination) -> None:
-        with open(destination, "wb") as f:
-            pickle.dump(content, f)
 
-    def _load_pickle(self, destination) -> Any:
-        with open(destination, "rb") as f:
-            return pickle.load(f)
+def _size(path: Path) -> int:
+    """Size of the file or columnar directory `path` in bytes."""
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
@@ -0,0 +1,482 @@
+"""Graph of the relations between statistics, tables, variables and values.
+
+Questions like "which tables carry variable X at district level" require
+chaining `catalogue.tables2statistic`, `catalogue.variables2statistic`,
+`catalogue.tables2variable`, `catalogue.values2variable` and
+`metadata.variable`. The `MetadataCrawler` issues these requests concurrently
+and builds a `MetadataGraph`, which answers such questions locally.
+
+Every relation is stored as adjacency arrays in compressed sparse row format:
+the neighbours of the `i`-th source node are
+`targets[offsets[i]:offsets[i + 1]]`, i.e. indices into the sorted codes of the
+target nodes. Like tables stored with `save_columns`, a saved graph is a
+directory of `.npy` files and a `manifest.json`, which are loaded
+memory-mapped:
+
+```
+graph/
+    manifest.json
+    variables.json
+    statistic.npy
+    tables.offsets.npy
+    tables.targets.npy
+    ...
+```
+
+Requires the optional dependency `numpy`, which is installed with:
+```bash
+pip install genesisonline[numpy]
+```
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from genesisonline import exceptions
+from genesisonline.constants import JsonKeys
+from genesisonline.services import CatalogueService, MetadataService
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "The metadata graph requires 'numpy'. "
+        "Install it with 'pip install genesisonline[numpy]'."
+    ) from e
+
+logger = logging.getLogger(__name__)
+
+# name of the file describing the stored arrays
+MANIFEST = "manifest.json"
+
+# name of the file holding the metadata of the variables
+VARIABLES = "variables.json"
+
+# kinds of nodes of the graph
+NODES = ("statistic", "table", "variable", "value")
+
+# relations of the graph: name -> (kind of source, kind of target)
+RELATIONS = {
+    "tables": ("statistic", "table"),
+    "variables": ("statistic", "variable"),
+    "values": ("variable", "value"),
+    # the tables actually carrying a variable, a subset of the tables of the
+    # statistics carrying it
+    "tables2variable": ("variable", "table"),
+}
+
+# adjacency lists of every relation: name -> {source code -> target codes}
+Edges = Dict[str, Dict[str, List[str]]]
+
+
+class MetadataGraph:
+    """Immutable graph of statistics, tables, variables and values.
+
+    Attributes:
+        codes: sorted codes of the nodes of every kind, e.g. `codes["table"]`.
+        adjacency: `(offsets, targets)` of every relation, e.g.
+            `adjacency["tables"]` relates statistics to tables.
+        metadata: metadata of the variables as returned by `metadata.variable`.
+        crawled: date of the last crawl, `None` if unknown.
+        selection: selection of the crawled statistics, `None` for all.
+    """
+
+    def __init__(
+        self,
+        codes: Dict[str, np.ndarray],
+        adjacency: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        metadata: Dict[str, dict] = None,
+        crawled: date = None,
+        selection: str = None,
+    ) -> None:
+        self.codes = codes
+        self.adjacency = adjacency
+        self.metadata = metadata or dict()
+        self.crawled = crawled
+        self.selection = selection
+        self._reversed = dict()
+
+    def __repr__(self) -> str:
+        nodes = ", ".join(f"{len(self.codes[kind])} {kind}s" for kind in NODES)
+        return f"MetadataGraph({nodes})"
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: Edges,
+        metadata: Dict[str, dict] = None,
+        crawled: date = None,
+        selection: str = None,
+    ) -> "MetadataGraph":
+        """Build a graph from the adjacency lists of every relation.
+
+        Sources without neighbours are kept as nodes, e.g. a statistic
+        without tables.
+        """
+        nodes: Dict[str, Set[str]] = {kind: set() for kind in NODES}
+        for relation, (source, target) in RELATIONS.items():
+            for code, neighbours in edges.get(relation, {}).items():
+                nodes[source].add(code)
+                nodes[target].update(neighbours)
+        codes = {kind: np.array(sorted(nodes[kind]), dtype=str) for kind in NODES}
+
+        adjacency = dict()
+        for relation, (source, target) in RELATIONS.items():
+            lists = edges.get(relation, {})
+            targets = [
+                np.sort(np.searchsorted(codes[target], lists.get(code, [])))
+                for code in codes[source]
+            ]
+            offsets = np.zeros(len(targets) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(t) for t in targets])
+            adjacency[relation] = (
+                offsets,
+                np.concatenate(targets).astype(np.int32)
+                if targets
+                else np.zeros(0, dtype=np.int32),
+            )
+        return cls(
+            codes, adjacency, metadata=metadata, crawled=crawled, selection=selection
+        )
+
+    def edges(self) -> Edges:
+        """Adjacency lists of every relation, the inverse of `from_edges`."""
+        edges = dict()
+        for relation, (source, target) in RELATIONS.items():
+            offsets, targets = self.adjacency[relation]
+            edges[relation] = {
+                str(code): self.codes[target][
+                    targets[offsets[i] : offsets[i + 1]]
+                ].tolist()
+                for i, code in enumerate(self.codes[source])
+            }
+        return edges
+
+    def neighbours(self, relation: str, code: str, reverse: bool = False) -> List[str]:
+        """Codes of the nodes related to the node `code` by `relation`.
+
+        Args:
+            relation: one of "tables", "variables", "values" or
+                "tables2variable".
+            code: code of a source node, or of a target node if `reverse`.
+            reverse: whether the relation is followed backwards, e.g. from a
+                variable to its statistics.
+        """
+        if relation not in RELATIONS:
+            raise exceptions.ValueError(
+                f"Unsupported relation '{relation}'. "
+                f"Currently support: {list(RELATIONS)}"
+            )
+        source, target = RELATIONS[relation]
+        if reverse:
+            source, target = target, source
+        i = self._position(source, code)
+        if i is None:
+            return []
+        offsets, targets = (
+            self._reverse(relation) if reverse else self.adjacency[relation]
+        )
+        return self.codes[target][targets[offsets[i] : offsets[i + 1]]].tolist()
+
+    def tables(self, statistic: str) -> List[str]:
+        """Codes of the tables of `statistic`."""
+        return self.neighbours("tables", statistic)
+
+    def variables(self, statistic: str) -> List[str]:
+        """Codes of the variables of `statistic`."""
+        return self.neighbours("variables", statistic)
+
+    def values(self, variable: str) -> List[str]:
+        """Codes of the values of `variable`."""
+        return self.neighbours("values", variable)
+
+    def statistics(self, variable: str) -> List[str]:
+        """Codes of the statistics carrying `variable`."""
+        return self.neighbours("variables", variable, reverse=True)
+
+    def table_variables(self, table: str) -> List[str]:
+        """Codes of the variables carried by `table`."""
+        return self.neighbours("tables2variable", table, reverse=True)
+
+    def tables_with(self, *variables: str) -> List[str]:
+        """Codes of the tables carrying all `variables`.
+
+        Examples:
+            >>> graph.tables_with("GES", "KREISE")  # sex at district level
+        """
+        tables = None
+        for variable in variables:
+            related = set(self.neighbours("tables2variable", variable))
+            tables = related if tables is None else tables & related
+        return sorted(tables or ())
+
+    def save(self, directory: Union[Path, str]) -> None:
+        """Store the graph in `directory`, which is created if necessary."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for kind in NODES:
+            np.save(directory / f"{kind}.npy", self.codes[kind])
+        for relation, (offsets, targets) in self.adjacency.items():
+            np.save(directory / f"{relation}.offsets.npy", offsets)
+            np.save(directory / f"{relation}.targets.npy", targets)
+        with open(directory / VARIABLES, "w") as f:
+            json.dump(self.metadata, f)
+        manifest = {
+            "nodes": list(NODES),
+            "relations": list(self.adjacency),
+            "crawled": self.crawled.isoformat() if self.crawled else None,
+            "selection": self.selection,
+        }
+        with open(directory / MANIFEST, "w") as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, directory: Union[Path, str], mmap: bool = True) -> "MetadataGraph":
+        """Load a graph stored with `save`.
+
+        Args:
+            directory: the directory the graph was stored in.
+            mmap: whether the arrays are memory-mapped read-only. If `False`,
+                they are read into memory.
+        """
+        directory = Path(directory)
+        mode = "r" if mmap else None
+        with open(directory / MANIFEST, "r") as f:
+            manifest = json.load(f)
+        with open(directory / VARIABLES, "r") as f:
+            metadata = json.load(f)
+        codes = {
+            kind: np.load(directory / f"{kind}.npy", mmap_mode=mode)
+            for kind in manifest["nodes"]
+        }
+        adjacency = {
+            relation: (
+                np.load(directory / f"{relation}.offsets.npy", mmap_mode=mode),
+                np.load(directory / f"{relation}.targets.npy", mmap_mode=mode),
+            )
+            for relation in manifest["relations"]
+        }
+        crawled = manifest["crawled"]
+        return cls(
+            codes,
+            adjacency,
+            metadata=metadata,
+            crawled=date.fromisoformat(crawled) if crawled else None,
+            selection=manifest.get("selection"),
+        )
+
+    def _position(self, kind: str, code: str) -> Optional[int]:
+        """Position of `code` in the sorted codes of `kind`, `None` if missing."""
+        codes = self.codes[kind]
+        i = int(np.searchsorted(codes, code))
+        return i if i < len(codes) and codes[i] == code else None
+
+    def _reverse(self, relation: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Adjacency arrays of `relation` from the targets to the sources."""
+        if relation not in self._reversed:
+            source, target = RELATIONS[relation]
+            offsets, targets = self.adjacency[relation]
+            sources = np.repeat(
+                np.arange(len(self.codes[source]), dtype=np.int32), np.diff(offsets)
+            )
+            order = np.argsort(targets, kind="stable")
+            counts = np.bincount(targets, minlength=len(self.codes[target]))
+            reversed_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            reversed_offsets[1:] = np.cumsum(counts)
+            self._reversed[relation] = (reversed_offsets, sources[order])
+        return self._reversed[relation]
+
+
+class MetadataCrawler:
+    """Builds a `MetadataGraph` with concurrent requests.
+
+    Attributes:
+        catalogue: service listing the related objects.
+        metadata: service requesting the metadata of the variables. If `None`,
+            the graph holds no metadata.
+        max_workers: maximum number of requests sent concurrently.
+        area: area the objects are listed from.
+        pagelength: maximum number of modified objects requested per recrawl.
+    """
+
+    def __init__(
+        self,
+        catalogue: CatalogueService,
+        metadata: MetadataService = None,
+        max_workers: int = 8,
+        area: str = "all",
+        pagelength: int = 2500,
+    ) -> None:
+        """
+        Args:
+            catalogue: service listing the related objects.
+            metadata: service requesting the metadata of the variables.
+            max_workers: maximum number of requests sent concurrently.
+            area: area the objects are listed from.
+            pagelength: maximum number of modified objects requested per
+                recrawl. If reached, the complete graph is crawled again.
+        """
+        self.catalogue = catalogue
+        self.metadata = metadata
+        self.max_workers = max_workers
+        self.area = area
+        self.pagelength = pagelength
+
+    def crawl(self, selection: str = None) -> MetadataGraph:
+        """Crawl the statistics matching `selection` and all related objects.
+
+        Args:
+            selection: selection of the statistics, e.g. "124*". If `None`, all
+                statistics are crawled.
+        """
+        started = date.today()
+        statistics = self._statistics(selection)
+        edges = {relation: dict() for relation in RELATIONS}
+        metadata = dict()
+        self._crawl(statistics, edges, metadata)
+        return MetadataGraph.from_edges(
+            edges, metadata=metadata, crawled=started, selection=selection
+        )
+
+    def recrawl(self, graph: MetadataGraph, since: date = None) -> MetadataGraph:
+        """Update `graph` with the objects reported by `catalogue/modifieddata`.
+
+        The statistics matching the selection of `graph` are listed again.
+        Statistics which are no longer listed are removed, new ones are
+        crawled. Of the others, only those related to a modified object are
+        crawled again, i.e. the statistics whose code is a prefix of the
+        modified code, e.g. "12411" of the table "12411-0001", the cube
+        "12411BJ001" or the timeseries "12411-01-01-4".
+
+        Args:
+            graph: the graph to update, which is not changed.
+            since: date from which on modifications are considered. If `None`,
+                the date `graph` was crawled.
+        """
+        since = since or graph.crawled
+        if since is None:
+            raise exceptions.ValueError(
+                "The crawl date of the graph is unknown, pass `since`"
+            )
+        started = date.today()
+        response = self.catalogue.modifieddata(
+            type="all",
+            date=since.strftime("%d.%m.%Y"),
+            pagelength=str(self.pagelength),
+        )
+        items = response[JsonKeys.CONTENT] or []
+        if len(items) >= self.pagelength:
+            logger.warning(
+                f"Received {len(items)} modified objects, the listing may be "
+                "incomplete. Crawling the complete graph."
+            )
+            return self.crawl(graph.selection)
+
+        listed = set(self._statistics(graph.selection))
+        known = set(graph.codes["statistic"].tolist())
+        statistics = listed - known
+        for code in {item[JsonKeys.CODE] for item in items}:
+            statistics.update(
+                code[:length]
+                for length in range(1, len(code) + 1)
+                if code[:length] in listed
+            )
+
+        edges = graph.edges()
+        for removed in known - listed:
+            edges["tables"].pop(removed, None)
+            edges["variables"].pop(removed, None)
+        metadata = dict(graph.metadata)
+        self._crawl(sorted(statistics), edges, metadata)
+        logger.info(
+            f"Crawled {len(statistics)} new or modified and removed "
+            f"{len(known - listed)} statistic(s)"
+        )
+        return MetadataGraph.from_edges(
+            edges, metadata=metadata, crawled=started, selection=graph.selection
+        )
+
+    def _statistics(self, selection: Optional[str]) -> List[str]:
+        """Codes of all statistics matching `selection`."""
+        return [
+            obj[JsonKeys.CODE]
+            for obj in self.catalogue.iter_statistics(
+                selection=selection, max_workers=self.max_workers
+            )
+        ]
+
+    def _crawl(self, statistics: Iterable[str], edges: Edges, metadata: dict) -> None:
+        """Crawl `statistics` and their variables into `edges` and `metadata`.
+
+        The tables of every variable of `statistics` are listed again, as the
+        tables of the statistics may have changed. Values and metadata are
+        only requested for variables which are not in `edges` yet. Variables
+        no longer carried by any statistic are removed.
+        """
+        statistics = list(statistics)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tables = executor.map(
+                lambda code: self._list("iter_tables2statistics", code), statistics
+            )
+            variables = executor.map(
+                lambda code: self._list("iter_variables2statistic", code), statistics
+            )
+            for statistic, t, v in zip(statistics, tables, variables):
+                edges["tables"][statistic] = t
+                edges["variables"][statistic] = v
+
+            carried = {
+                code
+                for statistic in statistics
+                for code in edges["variables"][statistic]
+            }
+            new = sorted(carried - set(edges["values"]))
+            refreshed = sorted(carried)
+            table_lists = executor.map(
+                lambda code: self._list("iter_tables2variable", code), refreshed
+            )
+            values = executor.map(
+                lambda code: self._list("iter_values2variable", code), new
+            )
+            if self.metadata is not None:
+                infos = executor.map(self._variable, new)
+            else:
+                infos = [None] * len(new)
+            for variable, t in zip(refreshed, table_lists):
+                edges["tables2variable"][variable] = t
+            for variable, v, info in zip(new, values, infos):
+                edges["values"][variable] = v
+                if info is not None:
+                    metadata[variable] = info
+
+        self._prune(edges, metadata)
+        logger.debug(
+            f"Crawled {len(statistics)} statistic(s) and {len(new)} new variable(s)"
+        )
+
+    @staticmethod
+    def _prune(edges: Edges, metadata: dict) -> None:
+        """Remove variables and tables which are not related to any statistic."""
+        variables = {code for codes in edges["variables"].values() for code in codes}
+        tables = {code for codes in edges["tables"].values() for code in codes}
+        for relation in ("values", "tables2variable"):
+            for variable in set(edges[relation]) - variables:
+                del edges[relation][variable]
+        for variable in set(metadata) - variables:
+            del metadata[variable]
+        # tables of statistics outside the selection of the graph
+        edges["tables2variable"] = {
+            variable: [code for code in codes if code in tables]
+            for variable, codes in edges["tables2variable"].items()
+        }
+
+    def _list(self, method: str, name: str) -> List[str]:
+        """Codes of the objects related to `name` listed by `method`."""
+        iterate = getattr(self.catalogue, method)
+        return [obj[JsonKeys.CODE] for obj in iterate(name=name, area=self.area)]
+
+    def _variable(self, name: str) -> Optional[dict]:
+        response = self.metadata.variable(name=name, area=self.area)
+        return response[JsonKeys.CONTENT]
@@ -0,0 +1,141 @@
+"""Invalidation of cached responses based on `catalogue/modifieddata`.
+
+Instead of expiring all cache entries after a fixed time-to-live, the
+`CacheInvalidator` periodically asks the GENESIS-Online API which tables,
+statistics and timeseries changed and evicts only the entries related to
+these objects. All other entries can stay valid indefinitely.
+"""
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Iterable, List
+from genesisonline.constants import JsonKeys
+from genesisonline.services import CatalogueService
+
+try:
+    from typing import Protocol
+except ImportError:
+    from typing_extensions import Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class Invalidatable(Protocol):
+    """Any cache offering an `invalidate` method, e.g. `ResponseCache`."""
+
+    def invalidate(self, code: str) -> int:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class CacheInvalidator:
+    """Evicts cache entries of objects reported by `catalogue/modifieddata`.
+
+    Attributes:
+        catalogue: service used to query the modified objects.
+        caches: caches whose entries are evicted, e.g. `ResponseCache`,
+            `DiskCache` or `DataService` (saved batch job results).
+        interval: number of seconds between two polls when running in the
+            background.
+        since: only objects modified on or after this date are considered.
+        pagelength: maximum number of modified objects requested per poll.
+    """
+
+    def __init__(
+        self,
+        catalogue: CatalogueService,
+        caches: Iterable[Invalidatable],
+        interval: float = 3600,
+        since: date = None,
+        pagelength: int = 2500,
+    ) -> None:
+        """
+        Args:
+            catalogue: service used to query the modified objects.
+            caches: caches whose entries are evicted.
+            interval: number of seconds between two polls.
+            since: date from which on modifications are considered. If `None`,
+                modifications since yesterday are considered.
+            pagelength: maximum number of modified objects per poll (1-2500).
+        """
+        self.catalogue = catalogue
+        self.caches = list(caches)
+        self.interval = interval
+        self.since = since or date.today() - timedelta(days=1)
+        self.pagelength = pagelength
+        self._seen = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> "CacheInvalidator":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def poll(self) -> List[str]:
+        """Evict all entries of objects modified since the last poll.
+
+        If the number of modified objects reaches `pagelength`, the listing
+        may be incomplete and all caches are cleared instead.
+
+        Returns:
+            The codes of the modified objects which were evicted.
+        """
+        today = date.today()
+        response = self.catalogue.modifieddata(
+            type="all",
+            date=self.since.strftime("%d.%m.%Y"),
+            pagelength=str(self.pagelength),
+        )
+        items = response[JsonKeys.CONTENT] or []
+
+        if len(items) >= self.pagelength:
+            logger.warning(
+                f"Received {len(items)} modified objects, the listing may be "
+                "incomplete. Clearing all caches."
+            )
+            for cache in self.caches:
+                cache.clear()
+            self._seen = set()
+            self.since = today
+            return [item["Code"] for item in items]
+
+        # the same modification is listed again until its date has passed
+        modifications = {(item["Code"], item.get("Date")) for item in items}
+        codes = sorted({code for code, _ in modifications - self._seen})
+        self._seen = modifications
+
+        for code in codes:
+            removed = sum(cache.invalidate(code) for cache in self.caches)
+            logger.debug(f"Invalidated {removed} cache entries of '{code}'")
+        logger.info(f"Invalidated cache entries of {len(codes)} modified objects")
+
+        self.since = today
+        return codes
+
+    def start(self) -> None:
+        """Poll every `interval` seconds in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling in the background."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning(f"Polling for modified data failed: {e}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,314 @@
+"""Polling for the results of GENESIS-Online batch jobs.
+
+Very large tables are processed by GENESIS-Online in the background. A
+`JobPoller` owns all pending jobs of a `DataService` and checks them from a
+single background thread, instead of one thread per job. All jobs due for a
+check are checked together with a single listing of the user's jobs, and only
+the results of finished jobs are fetched, in a prioritised round-robin order.
+The number of requests per second is bounded by a budget.
+
+The time between two checks of a job is determined by a `PollingPolicy`,
+which checks new jobs quickly and backs off exponentially for long-running
+ones.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+from genesisonline import exceptions
+from genesisonline.constants import JsonStrings
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+logger = logging.getLogger(__name__)
+
+
+class PollingPolicy:
+    """Adaptive delay between two checks of a batch job.
+
+    The delay grows exponentially with the time a job has been running, from
+    `initial` up to `maximum` seconds. Jobs finishing within seconds are thus
+    noticed quickly, while long-running jobs are checked rarely. If `learn`
+    is set, the policy keeps a moving average of the durations of finished
+    jobs and does not check a job before it is expected to finish.
+
+    Attributes:
+        initial: delay in seconds before the first checks of a job.
+        factor: growth of the delay, i.e. a job running for `t` seconds is
+            checked again after `t * (factor - 1)` seconds.
+        maximum: upper bound of the delay in seconds.
+        learn: whether the expected duration is learned from finished jobs.
+        expected: moving average of the durations of finished jobs.
+    """
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        factor: float = 2.0,
+        maximum: float = 60.0,
+        learn: bool = True,
+    ) -> None:
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.learn = learn
+        self.expected = None
+        self._lock = threading.Lock()
+
+    def delay(self, elapsed: float) -> float:
+        """Number of seconds until a job running for `elapsed` seconds is checked."""
+        expected = self.expected if self.learn else None
+        if expected is not None and elapsed < expected:
+            delay = expected - elapsed
+        else:
+            delay = (elapsed - (expected or 0)) * (self.factor - 1)
+        return min(max(delay, self.initial), self.maximum)
+
+    def record(self, duration: float) -> None:
+        """Learn from a job which finished after `duration` seconds."""
+        with self._lock:
+            if self.expected is None:
+                self.expected = duration
+            else:
+                self.expected = 0.7 * self.expected + 0.3 * duration
+
+
+class Job(Future):
+    """Future of the result of a pending batch job.
+
+    The result of the future is the finished response of the job, as also
+    saved by the `DataService`. Hence, jobs can be waited for with
+    `result(timeout)`, combined with `concurrent.futures.as_completed` or
+    `wait`, and cancelled with `cancel` as long as they are pending.
+
+    Attributes:
+        result_id: unique identifier of the result of the job.
+        language: language the result is requested in.
+        priority: jobs with a higher priority are checked first.
+        checks: number of times the job has been checked.
+        errors: number of consecutive checks which failed with an exception.
+        submitted: monotonic time the job was submitted at.
+    """
+
+    def __init__(
+        self, result_id: str, language: Literal["de", "en"], priority: int = 0
+    ) -> None:
+        super().__init__()
+        self.result_id = result_id
+        self.language = language
+        self.priority = priority
+        self.checks = 0
+        self.errors = 0
+        self.submitted = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<Job {self.result_id} {self._state.lower()}>"
+
+
+class JobPoller:
+    """Single background thread polling the results of all pending jobs.
+
+    The thread is started when the first job is submitted and ends as soon as
+    no job is pending anymore.
+
+    Attributes:
+        policy: determines the delay between two checks of the same job.
+        budget: maximum number of requests per second, i.e. listings of jobs
+            and fetches of results. If `None`, the checks are only limited by
+            the `policy`.
+        max_errors: number of consecutive failed checks after which a job
+            fails with the last error. Failed checks before are retried
+            after the delay of the `policy`.
+    """
+
+    def __init__(
+        self,
+        service,
+        policy: PollingPolicy = None,
+        budget: float = None,
+        max_errors: int = 5,
+    ) -> None:
+        """
+        Args:
+            service: the `DataService` whose batch jobs are polled.
+            policy: determines the delay between two checks of the same job.
+                If `None`, a `PollingPolicy` with default settings.
+            budget: maximum number of requests per second.
+            max_errors: number of consecutive failed checks after which a
+                job fails.
+        """
+        self.policy = policy if policy is not None else PollingPolicy()
+        self.budget = budget
+        self.max_errors = max_errors
+        self._service = service
+        self._jobs: Dict[str, Job] = dict()
+        self._queue = list()
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def pending(self) -> List[str]:
+        """Result ids of all pending jobs."""
+        with self._condition:
+            return list(self._jobs)
+
+    def submit(
+        self,
+        result_id: str,
+        language: Literal["de", "en"],
+        priority: int = 0,
+    ) -> Job:
+        """Poll for the result of the batch job `result_id`.
+
+        Args:
+            result_id: unique identifier of the result of the job.
+            language: language the result is requested in.
+            priority: jobs with a higher priority are checked first.
+
+        Returns:
+            The future of the job. Callbacks added with `add_done_callback`
+            are called as soon as the job has finished.
+        """
+        with self._condition:
+            job = self._jobs.get(result_id)
+            if job is None:
+                job = Job(result_id, language, priority)
+                self._jobs[result_id] = job
+                self._schedule(job, time.monotonic())
+            else:
+                job.priority = max(job.priority, priority)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="genesisonline-jobs", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return job
+
+    def _schedule(self, job: Job, due: float) -> None:
+        # equal due times are ordered by priority, then round-robin
+        heapq.heappush(self._queue, (due, -job.priority, next(self._counter), job))
+
+    def _next_jobs(self) -> List[Job]:
+        """Block until jobs are due, empty if no job is pending.
+
+        Returns:
+            All jobs due within the `initial` delay of the policy, the ones
+            with the highest priority first.
+        """
+        with self._condition:
+            while self._queue:
+                delay = self._queue[0][0] - time.monotonic()
+                if delay <= 0:
+                    # jobs due shortly are checked early, within the same listing
+                    horizon = time.monotonic() + self.policy.initial
+                    due = [entry for entry in self._queue if entry[0] <= horizon]
+                    self._queue = [e for e in self._queue if e[0] > horizon]
+                    heapq.heapify(self._queue)
+                    # highest priority first, then round-robin
+                    due.sort(key=lambda e: (e[1], e[2]))
+                    return [entry[3] for entry in due]
+                self._condition.wait(delay)
+            self._thread = None
+            return []
+
+    def _run(self) -> None:
+        while True:
+            jobs = self._next_jobs()
+            if not jobs:
+                return
+            pending = list()
+            for job in jobs:
+                if job.cancelled():
+                    with self._condition:
+                        del self._jobs[job.result_id]
+                else:
+                    pending.append(job)
+            if pending:
+                self._tick(pending)
+
+    def _tick(self, jobs: List[Job]) -> None:
+        """Check all due `jobs` with one listing and fetch the finished ones."""
+        for job in jobs:
+            job.checks += 1
+        logger.info(f"Checking {len(jobs)} job(s).")
+        started = time.monotonic()
+        try:
+            states = self._service._job_states([job.result_id for job in jobs])
+        except Exception as e:
+            logger.warning(f"Listing the states of {len(jobs)} job(s) failed: {e}")
+            states = dict()
+        self._pace(started)
+
+        for job in jobs:
+            state = states.get(job.result_id)
+            if state is None or state == JsonStrings.FINISHED:
+                # jobs missing from the listing are fetched anyway
+                started = time.monotonic()
+                self._check(job)
+                self._pace(started)
+            elif state == JsonStrings.RUNNING:
+                self._reschedule(job)
+            else:
+                # e.g. failed or aborted, the job never finishes
+                logger.warning(f"Job '{job.result_id}' ended in state '{state}'")
+                self._fail(
+                    job,
+                    exceptions.RequestError(
+                        f"Batch job '{job.result_id}' ended in state '{state}'"
+                    ),
+                )
+
+    def _check(self, job: Job) -> None:
+        """Fetch the result of `job` once, complete it or schedule its next check."""
+        try:
+            response = self._service._check_result(job.result_id, job.language)
+        except Exception as e:
+            job.errors += 1
+            logger.warning(
+                f"Checking for result '{job.result_id}' failed "
+                f"({job.errors}/{self.max_errors}): {e}"
+            )
+            if job.errors >= self.max_errors:
+                self._fail(job, e)
+            else:
+                self._reschedule(job)
+            return
+
+        job.errors = 0
+        if response is None:
+            self._reschedule(job)
+            return
+
+        self.policy.record(time.monotonic() - job.submitted)
+        with self._condition:
+            del self._jobs[job.result_id]
+        # a job cancelled while it was checked is not completed
+        if job.set_running_or_notify_cancel():
+            job.set_result(response)
+
+    def _reschedule(self, job: Job) -> None:
+        now = time.monotonic()
+        delay = self.policy.delay(now - job.submitted)
+        with self._condition:
+            self._schedule(job, now + delay)
+
+    def _fail(self, job: Job, error: Exception) -> None:
+        with self._condition:
+            del self._jobs[job.result_id]
+        if job.set_running_or_notify_cancel():
+            job.set_exception(error)
+
+    def _pace(self, started: float) -> None:
+        """Keep to the `budget` after a request sent at `started`."""
+        if self.budget:
+            time.sleep(max(1 / self.budget - (time.monotonic() - started), 0))
@@ -0,0 +1,327 @@
+"""Local mirror of the GENESIS-Online catalogue with full-text search.
+
+A `CatalogueMirror` copies the listings of statistics, tables, timeseries,
+cubes and variables in both languages into a SQLite database with an FTS5
+index on their codes and titles. `CatalogueMirror.find` then answers search
+terms locally within milliseconds, in the same standardized response format
+as `FindService.find`, e.g. for an autocomplete firing on every keystroke.
+
+The first `sync` lists the complete catalogue (see `iter_objects`). Later
+calls refresh only the objects reported by `catalogue/modifieddata` since the
+previous sync.
+"""
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Union
+from genesisonline.constants import (
+    COPYRIGHT,
+    JsonKeys,
+    JsonStrings,
+    ResponseStatus,
+)
+from genesisonline.filemanager import FileManager
+from genesisonline.services import CatalogueService
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+logger = logging.getLogger(__name__)
+
+# name of the database in the `FileManager` directory
+MIRROR_NAME = "catalogue.sqlite"
+
+# categories of the find service and the catalogue listings they are copied from
+CATEGORIES = {
+    JsonKeys.CUBES: "iter_cubes",
+    JsonKeys.STATISTICS: "iter_statistics",
+    JsonKeys.TABLES: "iter_tables",
+    JsonKeys.TIMESERIES: "iter_timeseries",
+    JsonKeys.VARIABLES: "iter_variables",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    language TEXT NOT NULL,
+    code TEXT NOT NULL,
+    content TEXT,
+    object TEXT NOT NULL,
+    synced REAL NOT NULL,
+    UNIQUE (category, language, code)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS objects_fts USING fts5(
+    code, content, content='objects', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS objects_insert AFTER INSERT ON objects BEGIN
+    INSERT INTO objects_fts (rowid, code, content)
+    VALUES (new.id, new.code, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS objects_delete AFTER DELETE ON objects BEGIN
+    INSERT INTO objects_fts (objects_fts, rowid, code, content)
+    VALUES ('delete', old.id, old.code, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS objects_update AFTER UPDATE ON objects BEGIN
+    INSERT INTO objects_fts (objects_fts, rowid, code, content)
+    VALUES ('delete', old.id, old.code, old.content);
+    INSERT INTO objects_fts (rowid, code, content)
+    VALUES (new.id, new.code, new.content);
+END;
+CREATE TABLE IF NOT EXISTS syncs (
+    language TEXT PRIMARY KEY,
+    synced TEXT NOT NULL
+);
+"""
+
+
+class CatalogueMirror:
+    """SQLite copy of the catalogue answering `find` requests offline.
+
+    Attributes:
+        catalogue: service the catalogue is copied from.
+        path: path of the SQLite database.
+        languages: languages the catalogue is copied in.
+        max_workers: number of concurrent requests while listing, see
+            `iter_objects_concurrently`.
+        pagelength: maximum number of modified objects requested per sync.
+    """
+
+    def __init__(
+        self,
+        catalogue: CatalogueService,
+        path: Union[Path, str] = None,
+        languages: Iterable[Literal["de", "en"]] = ("de", "en"),
+        max_workers: int = 8,
+        pagelength: int = 2500,
+    ) -> None:
+        """
+        Args:
+            catalogue: service the catalogue is copied from.
+            path: path of the SQLite database. If `None`, "catalogue.sqlite" in
+                the default `FileManager` directory.
+            languages: languages the catalogue is copied in.
+            max_workers: number of concurrent requests while listing.
+            pagelength: maximum number of modified objects requested per
+                sync. If reached, the complete catalogue is listed again.
+        """
+        self.catalogue = catalogue
+        self.path = Path(path) if path else FileManager().directory / MIRROR_NAME
+        self.languages = list(languages)
+        self.max_workers = max_workers
+        self.pagelength = pagelength
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    def sync(self, full: bool = False) -> int:
+        """Copy the catalogue, or the objects modified since the last sync.
+
+        Args:
+            full: if True, the complete catalogue is listed even if it was
+                synced before. Objects no longer listed are removed.
+
+        Returns:
+            The number of objects copied.
+        """
+        copied = 0
+        for language in self.languages:
+            last = self._last_sync(language)
+            started = date.today()
+            if full or last is None:
+                copied += self._sync_full(language)
+            else:
+                codes = self._modified(language, last)
+                if codes is None:
+                    copied += self._sync_full(language)
+                else:
+                    copied += sum(self._sync_code(language, code) for code in codes)
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO syncs (language, synced) VALUES (?, ?)",
+                    (language, started.isoformat()),
+                )
+        logger.info(f"Copied {copied} catalogue object(s) to '{self.path}'")
+        return copied
+
+    def find(
+        self,
+        term: str,
+        category: str = None,
+        language: Literal["de", "en"] = "en",
+        pagelength: int = 100,
+    ) -> dict:
+        """Returns lists of objects for a search `term` from the mirror.
+
+        Every word of `term` matches the beginning of a word of the code or
+        title of an object, e.g. "popul" matches "Population". The response
+        has the same format as the one of `FindService.find`, i.e. categories
+        which were not searched or have no matching objects are `None`.
+
+        Args:
+            term: the words searched for.
+            category: one of "cubes", "statistics", "tables", "timeseries" or
+                "variables". If `None` or "all", all categories are searched.
+            language: language of the listed objects.
+            pagelength: maximum number of objects listed per category.
+        """
+        categories = [
+            name
+            for name in CATEGORIES
+            if category in (None, "all") or name.lower() == category.lower()
+        ]
+        query = " ".join(f'"{word}"*' for word in term.replace('"', " ").split())
+        content = dict.fromkeys(CATEGORIES)
+        with self._connect() as connection:
+            for name in categories if query else []:
+                rows = connection.execute(
+                    "SELECT objects.object FROM objects_fts "
+                    "JOIN objects ON objects.id = objects_fts.rowid "
+                    "WHERE objects_fts MATCH ? AND category = ? AND language = ? "
+                    "ORDER BY rank LIMIT ?",
+                    (query, name, language, pagelength),
+                ).fetchall()
+                # like the API, categories without objects are `None`
+                content[name] = [json.loads(row[0]) for row in rows] or None
+
+        found = any(content[name] for name in categories)
+        status = ResponseStatus.MATCH if found else ResponseStatus.NO_MATCH
+        return {
+            JsonKeys.IDENT: {JsonKeys.SERVICE: "find", JsonKeys.METHOD: "find"},
+            JsonKeys.STATUS: {
+                JsonKeys.CODE: status.value,
+                JsonKeys.CONTENT: (
+                    JsonStrings.SUCCESS if found else JsonStrings.NO_MATCH
+                )[language],
+                JsonKeys.TYPE: JsonStrings.INFORMATION[language],
+            },
+            JsonKeys.PARAMETER: {
+                "term": term,
+                "category": category or "all",
+                "pagelength": str(pagelength),
+                "language": language,
+            },
+            JsonKeys.CONTENT: content,
+            JsonKeys.COPYRIGHT: COPYRIGHT[language].format(year=date.today().year),
+        }
+
+    def _sync_full(self, language: str) -> int:
+        """Copy all objects in `language` and remove the ones not listed."""
+        started = time.time()
+        copied = 0
+        for category in CATEGORIES:
+            copied += self._store(language, category, self._list(language, category))
+            with self._connect() as connection:
+                connection.execute(
+                    "DELETE FROM objects "
+                    "WHERE category = ? AND language = ? AND synced < ?",
+                    (category, language, started),
+                )
+        return copied
+
+    def _sync_code(self, language: str, code: str) -> int:
+        """Copy all objects in `language` whose code starts with `code`.
+
+        Objects with such a code which are not listed anymore are removed.
+        """
+        started = time.time()
+        copied = 0
+        for category in CATEGORIES:
+            copied += self._store(
+                language, category, self._list(language, category, code)
+            )
+            with self._connect() as connection:
+                connection.execute(
+                    "DELETE FROM objects "
+                    "WHERE category = ? AND language = ? "
+                    "AND substr(code, 1, ?) = ? AND synced < ?",
+                    (category, language, len(code), code, started),
+                )
+        return copied
+
+    def _list(self, language: str, category: str, code: str = None) -> Iterator[dict]:
+        iterate = getattr(self.catalogue, CATEGORIES[category])
+        return iterate(
+            selection=f"{code}*" if code else None,
+            area="all",
+            language=language,
+            max_workers=self.max_workers,
+        )
+
+    def _store(self, language: str, category: str, objects: Iterator[dict]) -> int:
+        """Insert or update `objects`, committing in batches."""
+        stored = 0
+        batch = list()
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= 1000:
+                stored += self._upsert(language, category, batch)
+                batch = list()
+        return stored + self._upsert(language, category, batch)
+
+    def _upsert(self, language: str, category: str, objects: List[dict]) -> int:
+        synced = time.time()
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO objects "
+                "(category, language, code, content, object, synced) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (category, language, code) DO UPDATE SET "
+                "content = excluded.content, object = excluded.object, "
+                "synced = excluded.synced",
+                [
+                    (
+                        category,
+                        language,
+                        obj[JsonKeys.CODE],
+                        obj.get(JsonKeys.CONTENT),
+                        json.dumps(obj),
+                        synced,
+                    )
+                    for obj in objects
+                ],
+            )
+        return len(objects)
+
+    def _modified(self, language: str, since: date) -> List[str]:
+        """Codes of the objects modified since `since`, `None` if too many."""
+        response = self.catalogue.modifieddata(
+            type="all",
+            date=since.strftime("%d.%m.%Y"),
+            pagelength=str(self.pagelength),
+            language=language,
+        )
+        items = response[JsonKeys.CONTENT] or []
+        if len(items) >= self.pagelength:
+            logger.warning(
+                f"Received {len(items)} modified objects, the listing may be "
+                "incomplete. Copying the complete catalogue."
+            )
+            return None
+        return sorted({item[JsonKeys.CODE] for item in items})
+
+    def _last_sync(self, language: str) -> date:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT synced FROM syncs WHERE language = ?", (language,)
+            ).fetchone()
+        return datetime.strptime(row[0], "%Y-%m-%d").date() if row else None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, committing and closing it afterwards."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
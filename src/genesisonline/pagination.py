@@ -0,0 +1,238 @@
+"""Iteration over complete catalogue listings.
+
+The catalogue service lists at most `pagelength` objects per request and has
+no parameter for requesting further pages. Instead, a listing is narrowed by
+its `selection`, a code with a trailing wildcard, e.g. "124*". Hence, a page
+is the listing of one selection, and a full page, i.e. one that may have been
+cut off, is split into one page per character appended to its selection:
+"124*" into "1240*", "1241*", ..., "124Z*". Characters outside the usual
+alphabet of codes which follow the prefix in the codes of the full page,
+e.g. "124.1", get a narrower page of their own, so these codes are not lost.
+Objects listed by a full page are yielded right away and skipped when listed
+again by a narrower page.
+
+While the objects of a page are consumed, the next page is requested in the
+background, so a long walk takes about one request latency per page. To walk
+a large listing faster, `iter_objects_concurrently` requests the narrower
+pages, i.e. the shards of the listing, concurrently. `aiter_objects` is the
+asyncio counterpart of both.
+"""
+import asyncio
+import logging
+import string
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from genesisonline.constants import JsonKeys
+
+logger = logging.getLogger(__name__)
+
+# maximum number of objects listed by one request of the catalogue service
+MAX_PAGELENGTH = 2500
+
+# maximum length of a selection, including the wildcard
+SELECTION_LENGTH = 15
+
+# characters the codes of GENESIS-Online objects consist of
+CODE_ALPHABET = string.digits + string.ascii_uppercase + "-_"
+
+WILDCARD = "*"
+
+
+def split_selection(
+    selection: Optional[str], alphabet: str = CODE_ALPHABET
+) -> Optional[List[str]]:
+    """Split `selection` into narrower selections covering the same codes.
+
+    Returns:
+        One selection per character of `alphabet` appended to the prefix of
+        `selection`, or `None` if `selection` cannot be split, i.e. if it has
+        no single trailing wildcard or has reached the maximum length.
+    """
+    prefix = selection or WILDCARD
+    if not prefix.endswith(WILDCARD) or WILDCARD in prefix[:-1]:
+        return None
+    prefix = prefix[:-1]
+    if len(prefix) + 2 > SELECTION_LENGTH:
+        return None
+    return [f"{prefix}{char}{WILDCARD}" for char in alphabet]
+
+
+def _narrow(
+    selection: Optional[str], pagelength: int, objects: List[dict] = ()
+) -> List[str]:
+    """Narrower selections replacing the full page `objects` of `selection`.
+
+    Besides `CODE_ALPHABET`, the page is split by every other character
+    following the prefix of `selection` in the codes of the page.
+    """
+    prefix = (selection or WILDCARD)[:-1]
+    found = {
+        code[len(prefix)]
+        for code in (obj.get(JsonKeys.CODE) or "" for obj in objects)
+        if len(code) > len(prefix) and code.startswith(prefix)
+    }
+    extra = "".join(sorted(found - set(CODE_ALPHABET) - {WILDCARD}))
+    selections = split_selection(selection, CODE_ALPHABET + extra)
+    if selections is None:
+        logger.warning(
+            f"Listing of '{selection}' may be incomplete, it cannot be "
+            f"narrowed beyond {pagelength} objects"
+        )
+        return []
+    if extra:
+        logger.info(f"Splitting '{selection}' by the further characters '{extra}'")
+    return selections
+
+
+def iter_objects(
+    fetch: Callable[[Optional[str]], List[dict]],
+    selection: Optional[str],
+    pagelength: int = MAX_PAGELENGTH,
+    prefetch: bool = True,
+) -> Iterator[dict]:
+    """Iterate lazily over all objects listed for `selection`.
+
+    Args:
+        fetch: requests one page, i.e. returns the objects listed for the
+            selection it is called with.
+        selection: selection of the complete listing, e.g. "124*". If `None`,
+            all objects are listed.
+        pagelength: number of objects listed per page. A page with as many
+            objects is split.
+        prefetch: whether the next page is requested in the background while
+            the current one is consumed.
+    """
+    queue = deque([selection])
+    seen = set()
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending: Optional[Tuple[str, Future]] = None
+    try:
+        while queue or pending is not None:
+            if pending is not None:
+                current, future = pending
+                objects = future.result()
+                pending = None
+            else:
+                current = queue.popleft()
+                objects = fetch(current)
+
+            full = len(objects) >= pagelength
+            if full:
+                queue.extendleft(reversed(_narrow(current, pagelength, objects)))
+            if executor is not None and queue:
+                following = queue.popleft()
+                pending = (following, executor.submit(fetch, following))
+
+            for obj in objects:
+                code = obj.get(JsonKeys.CODE)
+                if code in seen:
+                    continue
+                if full:
+                    # listed again by the narrower pages
+                    seen.add(code)
+                yield obj
+    finally:
+        if pending is not None:
+            pending[1].cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def iter_objects_concurrently(
+    fetch: Callable[[Optional[str]], List[dict]],
+    selection: Optional[str],
+    pagelength: int = MAX_PAGELENGTH,
+    max_workers: int = 8,
+) -> Iterator[dict]:
+    """Iterate over all objects listed for `selection`, fetching shards concurrently.
+
+    Every full page is split into narrower selections as in `iter_objects`,
+    which are requested by up to `max_workers` threads at once. Objects are
+    yielded in the order their pages arrive, each code only once.
+
+    Args:
+        fetch: requests one page, i.e. returns the objects listed for the
+            selection it is called with. Called from several threads.
+        selection: selection of the complete listing, e.g. "124*". If `None`,
+            all objects are listed.
+        pagelength: number of objects listed per page. A page with as many
+            objects is split.
+        max_workers: maximum number of pages requested concurrently.
+    """
+    seen = set()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {executor.submit(fetch, selection): selection}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                current = pending.pop(future)
+                objects = future.result()
+                if len(objects) >= pagelength:
+                    for narrower in _narrow(current, pagelength, objects):
+                        pending[executor.submit(fetch, narrower)] = narrower
+                for obj in objects:
+                    code = obj.get(JsonKeys.CODE)
+                    if code in seen:
+                        continue
+                    seen.add(code)
+                    yield obj
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_objects(
+    fetch: Callable[[Optional[str]], Awaitable[List[dict]]],
+    selection: Optional[str],
+    pagelength: int = MAX_PAGELENGTH,
+    max_workers: int = 1,
+) -> AsyncIterator[dict]:
+    """Iterate asynchronously over all objects listed for `selection`.
+
+    Pages are split as in `iter_objects`. Up to `max_workers` pages are
+    requested concurrently as tasks, objects are yielded in the order their
+    pages arrive, each code only once.
+
+    Args:
+        fetch: coroutine function requesting one page, i.e. returning the
+            objects listed for the selection it is called with.
+        selection: selection of the complete listing, e.g. "124*". If `None`,
+            all objects are listed.
+        pagelength: number of objects listed per page. A page with as many
+            objects is split.
+        max_workers: maximum number of pages requested concurrently.
+    """
+    seen = set()
+    queue = deque([selection])
+    pending = dict()
+    try:
+        while queue or pending:
+            while queue and len(pending) < max(max_workers, 1):
+                current = queue.popleft()
+                pending[asyncio.ensure_future(fetch(current))] = current
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                current = pending.pop(task)
+                objects = task.result()
+                if len(objects) >= pagelength:
+                    queue.extend(_narrow(current, pagelength, objects))
+                for obj in objects:
+                    code = obj.get(JsonKeys.CODE)
+                    if code in seen:
+                        continue
+                    seen.add(code)
+                    yield obj
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,19 @@
+"""Parsers turning GENESIS-Online data exports into NumPy arrays.
+
+Requires the optional dependency `numpy`, which is installed with:
+```bash
+pip install genesisonline[numpy]
+```
+"""
+try:
+    import numpy
+except ImportError as e:
+    raise ImportError(
+        "The parsers require 'numpy'. "
+        "Install it with 'pip install genesisonline[numpy]'."
+    ) from e
+
+from ._blocks import Categorical
+from .cube import Cube, parse_cube
+from .ffcsv import FlatTable, parse_ffcsv
+from .columnar import load_columns, save_columns
@@ -0,0 +1,163 @@
+"""Block-wise conversion of delimited text into NumPy arrays.
+
+Shared by the parsers of this package: lines are converted in blocks of
+`BLOCK_SIZE` rows, each block is split into fields with NumPy byte
+operations and every column is converted at once.
+"""
+import csv
+import numpy as np
+from typing import Iterable, Iterator, List, Union
+from genesisonline import exceptions
+
+# symbols GENESIS uses in place of a value, e.g. "." for secret values
+SYMBOLS = [b"", b"-", b".", b"...", b"/", b"x"]
+
+# number of rows converted at once, bounding the memory of the parser
+BLOCK_SIZE = 100_000
+
+
+class Categorical:
+    """Integer-coded column of repeated strings.
+
+    Attributes:
+        codes: position of each row's string in `categories`.
+        categories: sorted distinct strings of the column.
+    """
+
+    def __init__(self, codes: np.ndarray, categories: np.ndarray) -> None:
+        self.codes = codes
+        self.categories = categories
+
+    def __repr__(self) -> str:
+        return f"<Categorical {len(self)} rows, {len(self.categories)} categories>"
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self) -> np.ndarray:
+        """Return the string of every row."""
+        return self.categories[self.codes]
+
+
+def iter_lines(content: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Iterate over the non-empty lines of `content`."""
+    if isinstance(content, str):
+        return iter([line for line in content.splitlines() if line])
+    return (line.rstrip("\r\n") for line in content if line.strip())
+
+
+def split_block(block: List[str], sep: str, ncols: int) -> List[np.ndarray]:
+    """Split the lines of a block into one array of UTF-8 fields per column."""
+    text = "\n".join(block) + "\n"
+    if '"' in text:
+        rows = list(csv.reader(block, delimiter=sep))
+        if any(len(row) != ncols for row in rows):
+            raise exceptions.ValueError(f"Expected {ncols} fields in every row")
+        return [
+            np.array([field.encode("utf-8") for field in column], dtype=bytes)
+            for column in zip(*rows)
+        ]
+
+    # without quoting, the fields are delimited by separators and line breaks
+    buffer = np.frombuffer(text.encode("utf-8"), np.uint8)
+    is_sep = buffer == ord(sep)
+    ends = np.flatnonzero(is_sep | (buffer == ord("\n")))
+    if len(ends) != len(block) * ncols:
+        raise exceptions.ValueError(f"Expected {ncols} fields in every row")
+    ends = ends.reshape(-1, ncols)
+    if ncols > 1 and not is_sep[ends[:, :-1]].all():
+        raise exceptions.ValueError(f"Expected {ncols} fields in every row")
+    starts = np.empty_like(ends)
+    starts.flat[0] = 0
+    starts.flat[1:] = ends.flat[:-1] + 1
+    return [gather(buffer, starts[:, i], ends[:, i]) for i in range(ncols)]
+
+
+def gather(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Copy the fields between `starts` and `ends` into a fixed-width array."""
+    lengths = ends - starts
+    width = max(int(lengths.max()), 1)
+    offsets = np.arange(width)
+    chars = buffer.take(starts[:, None] + offsets, mode="clip")
+    chars[offsets >= lengths[:, None]] = 0
+    return chars.view(f"S{width}").ravel()
+
+
+class CategoricalBuilder:
+    """Factorizes a column block by block and merges the categories."""
+
+    def __init__(self) -> None:
+        self._categories = list()
+        self._codes = list()
+
+    def add(self, fields: np.ndarray) -> None:
+        if fields.dtype.itemsize <= 8:
+            # short strings are sorted much faster as big-endian integers
+            keys = np.zeros(len(fields), "S8")
+            keys[:] = fields
+            categories, codes = np.unique(keys.view(">u8"), return_inverse=True)
+            categories = categories.view("S8")
+        else:
+            categories, codes = np.unique(fields, return_inverse=True)
+        self._categories.append(categories)
+        self._codes.append(codes.astype(np.int32))
+
+    def build(self) -> Categorical:
+        if not self._codes:
+            return Categorical(np.empty(0, np.int32), np.empty(0, str))
+        categories = np.unique(np.concatenate(self._categories))
+        codes = np.concatenate(
+            [
+                np.searchsorted(categories, block_categories).astype(np.int32)[codes]
+                for block_categories, codes in zip(self._categories, self._codes)
+            ]
+        )
+        # only the few distinct strings are decoded from UTF-8
+        categories = np.array([c.decode("utf-8") for c in categories], dtype=str)
+        return Categorical(codes, categories)
+
+
+class FloatBuilder:
+    """Converts a column block by block into floats."""
+
+    def __init__(self) -> None:
+        self._blocks = list()
+
+    def add(self, fields: np.ndarray) -> None:
+        self._blocks.append(to_float(fields))
+
+    def build(self) -> np.ndarray:
+        if not self._blocks:
+            return np.empty(0, np.float64)
+        return np.concatenate(self._blocks)
+
+
+def to_float(strings: np.ndarray) -> np.ndarray:
+    """Convert byte strings to floats, treating non-numeric symbols as NaN.
+
+    German exports use a decimal comma, which is replaced by a point. GENESIS
+    exports contain no thousands separators.
+    """
+    chars = strings.view(np.uint8).copy()
+    chars[chars == ord(",")] = ord(".")
+    strings = chars.view(strings.dtype)
+    try:
+        return strings.astype(np.float64)
+    except ValueError:
+        pass
+    strings = np.where(np.isin(strings, SYMBOLS), b"nan", strings)
+    try:
+        return strings.astype(np.float64)
+    except ValueError:
+        pass
+    # convert each distinct string once, e.g. symbols like "." or "-"
+    distinct, inverse = np.unique(strings, return_inverse=True)
+    converted = np.array([float_or_nan(s) for s in distinct], dtype=np.float64)
+    return converted[inverse]
+
+
+def float_or_nan(string: bytes) -> float:
+    try:
+        return float(string)
+    except ValueError:
+        return np.nan
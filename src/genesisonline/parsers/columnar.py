@@ -0,0 +1,131 @@
+"""Columnar storage of parsed tables and cubes.
+
+A `FlatTable` or `Cube` is stored as a directory holding one `.npy` file per
+array, e.g. the codes and categories of every categorical column, together
+with a `manifest.json` describing them:
+
+```
+12411-0001.columns/
+    manifest.json
+    0.npy
+    1.npy
+    ...
+```
+
+The arrays are loaded memory-mapped (`mmap_mode="r"`), hence loading takes
+constant time regardless of the size of the table, only the pages actually
+accessed are read, and all processes loading the same directory share the
+operating system's page cache instead of holding a copy each.
+"""
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+from genesisonline import exceptions
+from ._blocks import Categorical
+from .cube import Cube
+from .ffcsv import FlatTable
+
+# name of the file describing the stored arrays
+MANIFEST = "manifest.json"
+
+
+def save_columns(content: Union[FlatTable, Cube], directory: Path) -> None:
+    """Store the arrays of `content` in the existing, empty `directory`.
+
+    Args:
+        content: the parsed table or cube.
+        directory: the directory the arrays and the manifest are written to.
+    """
+    if isinstance(content, FlatTable):
+        kind = "FlatTable"
+        meta = {"columns": content.columns}
+        groups = {
+            "dimensions": content.dimensions,
+            "values": content.values,
+            "quality": content.quality,
+        }
+    elif isinstance(content, Cube):
+        kind = "Cube"
+        meta = {
+            "name": content.name,
+            "axes": content.axes,
+            "metadata": content.metadata,
+        }
+        groups = {
+            "index": content.index,
+            "coords": {"": content.coords},
+            "values": content.values,
+            "quality": content.quality,
+        }
+    else:
+        raise exceptions.ValueError(
+            f"Cannot store {type(content).__name__}, expected FlatTable or Cube"
+        )
+
+    arrays = list()
+    for group, columns in groups.items():
+        for name, column in columns.items():
+            for part, array in _parts(column):
+                file_name = f"{len(arrays)}.npy"
+                np.save(directory / file_name, np.ascontiguousarray(array))
+                arrays.append([group, name, part, file_name])
+
+    manifest = {"kind": kind, "meta": meta, "arrays": arrays}
+    with open(directory / MANIFEST, "w") as f:
+        json.dump(manifest, f)
+
+
+def load_columns(directory: Path, mmap: bool = True) -> Union[FlatTable, Cube]:
+    """Load a table or cube stored with `save_columns`.
+
+    Args:
+        directory: the directory the arrays were written to.
+        mmap: whether the arrays are memory-mapped read-only. If `False`, they
+            are read into memory.
+    """
+    with open(directory / MANIFEST, "r") as f:
+        manifest = json.load(f)
+
+    groups: Dict[str, Dict[str, dict]] = dict()
+    for group, name, part, file_name in manifest["arrays"]:
+        array = np.load(directory / file_name, mmap_mode="r" if mmap else None)
+        groups.setdefault(group, dict()).setdefault(name, dict())[part] = array
+    columns = {group: _columns(parts) for group, parts in groups.items()}
+
+    meta = manifest["meta"]
+    if manifest["kind"] == "FlatTable":
+        return FlatTable(
+            meta["columns"],
+            dimensions=columns.get("dimensions", {}),
+            values=columns.get("values", {}),
+            quality=columns.get("quality", {}),
+        )
+    return Cube(
+        meta["name"],
+        axes=meta["axes"],
+        index=columns.get("index", {}),
+        coords=columns["coords"][""],
+        values=columns.get("values", {}),
+        quality=columns.get("quality", {}),
+        metadata=meta["metadata"],
+    )
+
+
+def _parts(column: Union[np.ndarray, Categorical]) -> List[Tuple[str, np.ndarray]]:
+    """Split `column` into the arrays it is stored as."""
+    if isinstance(column, Categorical):
+        return [("codes", column.codes), ("categories", column.categories)]
+    return [("array", column)]
+
+
+def _columns(parts: Dict[str, dict]) -> dict:
+    """Rebuild the columns of a group from their stored arrays."""
+    return {
+        name: (
+            Categorical(arrays["codes"], arrays["categories"])
+            if "codes" in arrays
+            else arrays["array"]
+        )
+        for name, arrays in parts.items()
+    }
@@ -0,0 +1,225 @@
+"""Streaming parser for the GENESIS-Online data cube ("Datenquader") format.
+
+A cube (`DataService.cube`) consists of blocks, each introduced by a "K"
+line naming the block and its fields, followed by "D" lines with its rows:
+
+```
+K;DQ;FACH-SCHL;...
+D;12411BJ001;...
+K;DQA;NAME;RHF-BSR;RHF-ACHSE
+D;DINSG;1;1
+D;GES;2;2
+K;DQZ;NAME;ZI-RHF-BSR;ZI-RHF-ACHSE
+D;STAG;3;3
+K;DQI;NAME;ME-NAME;DST;TYP;NKM-STELLEN;GHH-ART;GHM-WERTE-JN
+D;BEVSTD;ANZAHL;FEST;PROZENT;0;;N
+K;QEI;FACH-SCHL;ZI-WERT;WERT;QUALITAET;GESPERRT;WERT-VERFAELSCHT
+D;DG;GESM;31.12.2022;40000000;e;;0.0
+```
+
+The axes (DQA), the time axis (DQZ) and the contents (DQI) describe the
+cells listed in the QEI block. Each cell row holds one key per axis followed
+by the value, quality flag, lock flag and distortion of every content.
+
+The lines are read in a single pass. Cell rows are converted in blocks of a
+bounded number of rows, hence the memory needed besides the resulting arrays
+does not grow with the size of the cube.
+"""
+import itertools
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Union
+from genesisonline.constants import JsonKeys
+from genesisonline import exceptions
+from ._blocks import (
+    BLOCK_SIZE,
+    Categorical,
+    CategoricalBuilder,
+    FloatBuilder,
+    iter_lines,
+    split_block,
+)
+
+# names of the blocks and fields of the cube format
+AXES_BLOCK = "DQA"
+TIME_BLOCK = "DQZ"
+CONTENTS_BLOCK = "DQI"
+CELLS_BLOCK = "QEI"
+NAME_FIELD = "NAME"
+KEY_FIELDS = ("FACH-SCHL", "ZI-WERT")
+VALUE_FIELD = "WERT"
+QUALITY_FIELD = "QUALITAET"
+
+
+class Cube:
+    """Cells of a parsed data cube.
+
+    The cells are stored sparsely, i.e. as coordinates along every axis
+    together with their values. Use `to_dense` for an N-dimensional array.
+
+    Attributes:
+        name: code of the cube, e.g. "12411BJ001".
+        axes: names of the axes, i.e. the variables and the time variable.
+        index: sorted codes along every axis, e.g. `index["GES"]`.
+        coords: position of every cell along every axis, with one row per
+            cell and one column per axis.
+        values: float values of every cell per content. Missing or secret
+            values, e.g. "." or "-", are NaN.
+        quality: quality flags of every cell per content.
+        metadata: fields of all other blocks, e.g. `metadata["DQI"]`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        axes: List[str],
+        index: Dict[str, np.ndarray],
+        coords: np.ndarray,
+        values: Dict[str, np.ndarray],
+        quality: Dict[str, Categorical],
+        metadata: Dict[str, List[dict]],
+    ) -> None:
+        self.name = name
+        self.axes = axes
+        self.index = index
+        self.coords = coords
+        self.values = values
+        self.quality = quality
+        self.metadata = metadata
+
+    def __repr__(self) -> str:
+        return f"<Cube {self.name} {self.shape}, {len(self)} cells>"
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    @property
+    def shape(self) -> tuple:
+        """Length of every axis of the dense cube."""
+        return tuple(len(self.index[axis]) for axis in self.axes)
+
+    def to_dense(self, content: str = None, fill_value: float = np.nan) -> np.ndarray:
+        """Return the values of `content` as an array of shape `shape`.
+
+        Args:
+            content: name of the content, e.g. "BEVSTD". If `None`, the first
+                content of the cube.
+            fill_value: value of cells which are not listed in the cube.
+        """
+        if content is None:
+            content = next(iter(self.values))
+        dense = np.full(self.shape, fill_value, dtype=np.float64)
+        dense[tuple(self.coords.T)] = self.values[content]
+        return dense
+
+
+def parse_cube(
+    content: Union[dict, str, Iterable[str]],
+    sep: str = ";",
+    block_size: int = BLOCK_SIZE,
+) -> Cube:
+    """Parse a GENESIS-Online data cube into NumPy arrays.
+
+    Args:
+        content: the cube, either as a response of the data service, one
+            string or an iterable of lines, e.g. from `stream=True`.
+        sep: separator of the fields.
+        block_size: number of cell rows converted at once.
+
+    Examples:
+        >>> cube = parse_cube(go.data.cube(name="12411BJ001", stream=True))
+        >>> cube.axes, cube.shape
+        >>> population = cube.to_dense("BEVSTD")
+    """
+    if isinstance(content, dict):
+        content = content[JsonKeys.CONTENT]
+    lines = iter_lines(content)
+    metadata = dict()
+    cells = None
+    for line in lines:
+        fields = line.split(sep)
+        if fields[0] == "K":
+            block, names = fields[1], fields[2:]
+            if block == CELLS_BLOCK:
+                cells = _CellsBuilder(metadata, names)
+                # the cells are the last block and make up most of the cube
+                cells.read(lines, sep, block_size)
+                break
+            metadata[block] = list()
+        elif fields[0] == "D" and metadata:
+            metadata[block].append(dict(zip(names, fields[1:])))
+
+    if cells is None:
+        raise exceptions.ValueError(f"Cube contains no '{CELLS_BLOCK}' block")
+    # the first field of the cube information is the code of the cube
+    info = next(iter(metadata.get("DQ", [])), {})
+    return cells.build(next(iter(info.values()), ""), metadata)
+
+
+class _CellsBuilder:
+    """Converts the rows of the cells block block by block."""
+
+    def __init__(self, metadata: Dict[str, List[dict]], names: List[str]) -> None:
+        self.axes = [
+            row[NAME_FIELD]
+            for block in (AXES_BLOCK, TIME_BLOCK)
+            for row in metadata.get(block, [])
+        ]
+        self.contents = [row[NAME_FIELD] for row in metadata.get(CONTENTS_BLOCK, [])]
+        if not self.contents:
+            raise exceptions.ValueError(f"Cube contains no '{CONTENTS_BLOCK}' block")
+        self._fields = [name for name in names if name not in KEY_FIELDS]
+        self._keys = [CategoricalBuilder() for _ in self.axes]
+        self._values = [FloatBuilder() for _ in self.contents]
+        self._quality = [CategoricalBuilder() for _ in self.contents]
+
+    def read(self, lines: Iterator[str], sep: str, block_size: int) -> None:
+        """Convert all remaining `lines`, i.e. the rows of the cells."""
+        ncols = None
+        while True:
+            block = list(itertools.islice(lines, block_size))
+            if not block:
+                return
+            if ncols is None:
+                ncols = block[0].count(sep) + 1
+                value, quality, width = self._layout(ncols)
+            columns = split_block(block, sep, ncols)[1:]  # without "D"
+            for keys, column in zip(self._keys, columns):
+                keys.add(column)
+            offset = len(self.axes)
+            for i in range(len(self.contents)):
+                start = offset + i * width
+                self._values[i].add(columns[start + value])
+                if quality is not None:
+                    self._quality[i].add(columns[start + quality])
+
+    def build(self, name: str, metadata: Dict[str, List[dict]]) -> Cube:
+        keys = [builder.build() for builder in self._keys]
+        if keys:
+            coords = np.column_stack([key.codes for key in keys])
+        else:
+            coords = np.empty((0, 0), np.int32)
+        return Cube(
+            name,
+            axes=self.axes,
+            index={axis: key.categories for axis, key in zip(self.axes, keys)},
+            coords=coords,
+            values={c: b.build() for c, b in zip(self.contents, self._values)},
+            quality={c: b.build() for c, b in zip(self.contents, self._quality)},
+            metadata=metadata,
+        )
+
+    def _layout(self, ncols: int) -> tuple:
+        """Position of the value and quality within the fields of a content."""
+        width, remainder = divmod(ncols - 1 - len(self.axes), len(self.contents))
+        if remainder or width < 1:
+            raise exceptions.ValueError(
+                f"Cannot split {ncols} fields into {len(self.axes)} axes "
+                f"and {len(self.contents)} content(s)"
+            )
+        fields = self._fields[:width]
+        value = fields.index(VALUE_FIELD) if VALUE_FIELD in fields else 0
+        if QUALITY_FIELD in fields:
+            quality = fields.index(QUALITY_FIELD)
+        else:
+            quality = 1 if width > 1 else None
+        return value, quality, width
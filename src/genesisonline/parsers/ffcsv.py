@@ -0,0 +1,148 @@
+"""Vectorized parser for the GENESIS-Online flat file CSV (ffcsv) format.
+
+The ffcsv format (`format="ffcsv"` of the data service) lists one value per
+row, preceded by the codes and labels of all its dimensions, e.g.:
+
+```
+statistics_code;time_code;time;1_variable_code;1_variable_attribute_code;value;value_q
+12411;JAHR;2021;DINSG;DG;83237124;e
+```
+
+Instead of converting row by row, each block of rows is split into fields
+at once and every column is converted with NumPy. Dimension columns become
+integer-coded categoricals, value columns float arrays and quality columns
+(suffix "_q") categoricals of their flags.
+"""
+import csv
+import itertools
+import numpy as np
+from typing import Dict, Iterable, List, Union
+from genesisonline.constants import JsonKeys
+from ._blocks import (
+    BLOCK_SIZE,
+    Categorical,
+    CategoricalBuilder,
+    FloatBuilder,
+    iter_lines,
+    split_block,
+)
+
+# suffix of the columns holding the quality flags of a value column
+QUALITY_SUFFIX = "_q"
+
+# name of the value column in the ffcsv header
+VALUE_COLUMN = "value"
+
+
+class FlatTable:
+    """Columns of a parsed ffcsv table.
+
+    Attributes:
+        columns: names of all columns in the order of the header.
+        dimensions: categorical columns describing the values, e.g. the
+            statistic, time and variable codes and labels.
+        values: float columns holding the values. Missing or secret values,
+            e.g. "." or "-", are NaN.
+        quality: categorical columns holding the quality flags of the values.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        dimensions: Dict[str, Categorical],
+        values: Dict[str, np.ndarray],
+        quality: Dict[str, Categorical],
+    ) -> None:
+        self.columns = columns
+        self.dimensions = dimensions
+        self.values = values
+        self.quality = quality
+
+    def __repr__(self) -> str:
+        return f"<FlatTable {len(self)} rows, {len(self.columns)} columns>"
+
+    def __len__(self) -> int:
+        for column in self.values.values():
+            return len(column)
+        for column in self.dimensions.values():
+            return len(column)
+        return 0
+
+    def __getitem__(self, name: str) -> Union[np.ndarray, Categorical]:
+        for columns in (self.dimensions, self.values, self.quality):
+            if name in columns:
+                return columns[name]
+        raise KeyError(name)
+
+
+def parse_ffcsv(
+    content: Union[dict, str, Iterable[str]],
+    sep: str = ";",
+    block_size: int = BLOCK_SIZE,
+) -> FlatTable:
+    """Parse a GENESIS-Online ffcsv export into NumPy columns.
+
+    Args:
+        content: the ffcsv export, either as a response of the data service,
+            one string or an iterable of lines, e.g. from `stream=True`.
+        sep: separator of the fields.
+        block_size: number of rows converted at once.
+
+    Examples:
+        >>> response = go.data.table(name="12411-0001", format="ffcsv")
+        >>> table = parse_ffcsv(response)
+        >>> table.values["value"], table.dimensions["time"].decode()
+    """
+    if isinstance(content, dict):
+        content = content[JsonKeys.CONTENT]
+    lines = iter_lines(content)
+    header = next(lines, None)
+    if header is None:
+        return FlatTable([], {}, {}, {})
+    header = header.lstrip("\ufeff")  # byte order mark
+    columns = next(csv.reader([header], delimiter=sep))
+    kinds = _column_kinds(columns)
+
+    builders = {
+        name: FloatBuilder() if kind == "value" else CategoricalBuilder()
+        for name, kind in kinds.items()
+    }
+    while True:
+        block = list(itertools.islice(lines, block_size))
+        if not block:
+            break
+        for name, fields in zip(columns, split_block(block, sep, len(columns))):
+            builders[name].add(fields)
+
+    parsed = {name: builder.build() for name, builder in builders.items()}
+    return FlatTable(
+        columns,
+        dimensions={n: parsed[n] for n in columns if kinds[n] == "dimension"},
+        values={n: parsed[n] for n in columns if kinds[n] == "value"},
+        quality={n: parsed[n] for n in columns if kinds[n] == "quality"},
+    )
+
+
+def _column_kinds(columns: List[str]) -> Dict[str, str]:
+    """Classify each column as "dimension", "value" or "quality".
+
+    A quality column ends with "_q" and belongs to the value column with the
+    same name without the suffix, e.g. "value_q" to "value", or to the column
+    starting with its code, e.g. "BEV001__q" to "BEV001__Population__number".
+    """
+    kinds = dict.fromkeys(columns, "dimension")
+    if VALUE_COLUMN in kinds:
+        kinds[VALUE_COLUMN] = "value"
+    for name in columns:
+        if not name.endswith(QUALITY_SUFFIX):
+            continue
+        base = name[: -len(QUALITY_SUFFIX)]
+        candidates = [base] + [
+            c for c in columns if c != name and c.startswith(base.rstrip("_") + "__")
+        ]
+        for candidate in candidates:
+            if candidate in kinds and candidate != name:
+                kinds[name] = "quality"
+                kinds[candidate] = "value"
+                break
+    return kinds
@@ -0,0 +1,150 @@
+"""Client-side rate limiting of requests to the GENESIS-Online API.
+
+GENESIS-Online throttles requests per account. A `RateLimiter` is shared by
+all services of a `GenesisOnline` client, i.e. by all services sending
+requests with the same session, and spaces out their requests according to a
+token bucket. When the server signals overload (429 Too Many Requests or
+503 Service Unavailable), the limiter halves its rate, honours `Retry-After`
+and slowly recovers to the configured rate with every successful request.
+"""
+import math
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from genesisonline import exceptions
+
+logger = logging.getLogger(__name__)
+
+# status codes the server uses to signal overload
+OVERLOAD_STATUS_CODES = (429, 503)
+
+
+class RateLimiter:
+    """Thread-safe token bucket with multiplicative decrease on overload.
+
+    Attributes:
+        rate: configured number of requests per second.
+        burst: maximum number of requests sent back-to-back.
+        min_rate: lower bound the rate is decreased to on overload.
+        current_rate: number of requests per second currently allowed.
+        waits: number of requests which had to wait for a token.
+        throttles: number of overload signals received from the server.
+    """
+
+    def __init__(
+        self, rate: float = 5.0, burst: int = None, min_rate: float = None
+    ) -> None:
+        """
+        Args:
+            rate: number of requests per second.
+            burst: maximum number of requests sent back-to-back. If `None`,
+                the burst size is the rate rounded up to whole requests.
+            min_rate: lower bound the rate is decreased to on overload. If
+                `None`, a tenth of `rate`.
+        """
+        if rate <= 0:
+            raise exceptions.ValueError(f"rate must be positive but is {rate}")
+        if burst is None:
+            burst = max(1, math.ceil(rate))
+        if burst < 1:
+            raise exceptions.ValueError(f"burst must be positive but is {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.current_rate = rate
+        self.waits = 0
+        self.throttles = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent.
+
+        Returns:
+            The number of seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(self._blocked_until - now, 0.0)
+                if not delay and self._tokens >= 1:
+                    self._tokens -= 1
+                    if waited:
+                        self.waits += 1
+                    return waited
+                if not delay:
+                    delay = (1 - self._tokens) / self.current_rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttle(self, retry_after: float = None) -> None:
+        """Slow down after the server signalled overload.
+
+        The rate is halved (down to `min_rate`) and the bucket is emptied. If
+        the server sent a `Retry-After`, no request is sent until it passed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttles += 1
+            self.current_rate = max(self.current_rate / 2, self.min_rate)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+        logger.warning(
+            f"Server signalled overload, slowing down to "
+            f"{self.current_rate:.2f} request(s) per second"
+        )
+
+    def recover(self) -> None:
+        """Increase the rate towards `rate` after a successful request."""
+        if self.current_rate >= self.rate:
+            return
+        with self._lock:
+            # additive increase: back at full rate after ~`burst` successes
+            step = (self.rate - self.min_rate) / (self.burst * 2)
+            self.current_rate = min(self.current_rate + step, self.rate)
+
+    @property
+    def stats(self) -> dict:
+        """Counters describing how often requests were slowed down."""
+        return {
+            "rate": self.current_rate,
+            "waits": self.waits,
+            "throttles": self.throttles,
+        }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self.current_rate, self.burst
+        )
+        self._updated = now
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Number of seconds to wait according to a `Retry-After` header.
+
+    The header is either a number of seconds or an HTTP date. Returns `None`
+    if the header is missing or invalid.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
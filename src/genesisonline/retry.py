@@ -0,0 +1,108 @@
+"""Retrying of transient failures of requests to the GENESIS-Online API.
+
+All requests to the GENESIS-Online API are idempotent GET requests, hence
+they can safely be repeated. A `RetryPolicy` repeats a request which failed
+due to a transient problem, i.e. a connection error, a timeout or one of its
+`status_codes`, after an exponentially growing, jittered delay. A
+`Retry-After` header sent by the server takes precedence over the backoff,
+up to the maximum delay of the policy.
+"""
+import random
+import threading
+from typing import Iterable, Mapping
+import requests
+from genesisonline import exceptions
+from genesisonline.ratelimit import retry_after
+
+# status codes of failures which are likely to disappear when retried
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient failures.
+
+    Attributes:
+        total: maximum number of retries of a single request.
+        backoff_factor: delay in seconds before the first retry. The delay
+            doubles with every further retry.
+        max_backoff: upper bound of the delay between two attempts, also of
+            a delay requested by the server via `Retry-After`.
+        status_codes: HTTP status codes which are retried.
+        jitter: whether the delay is drawn uniformly between zero and the
+            exponential backoff, which spreads out retries of concurrent
+            requests.
+        retries: number of retries made so far by all requests.
+        exhausted: number of requests which failed despite all retries.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        status_codes: Iterable[int] = TRANSIENT_STATUS_CODES,
+        jitter: bool = True,
+    ) -> None:
+        """
+        Args:
+            total: maximum number of retries of a single request.
+            backoff_factor: delay in seconds before the first retry.
+            max_backoff: upper bound of the delay between two attempts.
+            status_codes: HTTP status codes which are retried.
+            jitter: whether the delay is randomized.
+        """
+        if total < 0:
+            raise exceptions.ValueError(f"total must not be negative but is {total}")
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_codes = frozenset(status_codes)
+        self.jitter = jitter
+        self.retries = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def is_retryable(
+        self,
+        attempt: int,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> bool:
+        """Check whether the failed `attempt` (starting at 0) is retried.
+
+        Args:
+            attempt: number of retries made so far for the request.
+            response: the response of the attempt, if one was received.
+            error: the exception raised by the attempt, if any.
+        """
+        if error is not None:
+            transient = isinstance(
+                error,
+                (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+            )
+        else:
+            transient = response.status_code in self.status_codes
+        if not transient:
+            return False
+        if attempt >= self.total:
+            with self._lock:
+                self.exhausted += 1
+            return False
+        with self._lock:
+            self.retries += 1
+        return True
+
+    def backoff(self, attempt: int, headers: Mapping[str, str] = None) -> float:
+        """Number of seconds to wait before retry number `attempt` + 1."""
+        requested = retry_after(headers) if headers is not None else None
+        if requested is not None:
+            return min(requested, self.max_backoff)
+        delay = min(self.backoff_factor * 2**attempt, self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @property
+    def stats(self) -> dict:
+        """Counters describing how often requests were retried."""
+        return {"retries": self.retries, "exhausted": self.exhausted}
@@ -12,13 +12,26 @@ An abstract base class that defines the core functionalities
 """
 
 import requests
+import time
 import warnings
+import logging
 from abc import ABC, abstractmethod
-from typing import Any
+from threading import Thread
+from typing import Any, Iterator, Tuple, Union
 from urllib.parse import urljoin
-from genesisonline.constants import BASE_URL, JsonKeys
+from genesisonline.cache import DiskCache, ResponseCache
+from genesisonline.constants import BASE_URL, JsonKeys, ResponseStatus
+from genesisonline.ratelimit import OVERLOAD_STATUS_CODES, RateLimiter, retry_after
+from genesisonline.retry import RetryPolicy
 from genesisonline.exceptions import *
 
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+logger = logging.getLogger(__name__)
+
 
 class BaseService(ABC):
     """Parent class for all GENESIS-Online service classes.
@@ -30,6 +43,12 @@ class BaseService(ABC):
 
     _BASE_URL = BASE_URL
 
+    # endpoints whose responses change between calls and are never cached
+    _uncached_endpoints = ()
+
+    # number of bytes read from the network at once when streaming
+    _chunk_size = 64 * 1024
+
     @property
     @abstractmethod
     def _service(self) -> str:
@@ -42,7 +61,14 @@ class BaseService(ABC):
         """List of implemented endpoints for the GENESIS-Online service."""
         pass
 
-    def __init__(self, session: requests.Session) -> None:
+    def __init__(
+        self,
+        session: requests.Session,
+        response_cache: ResponseCache = None,
+        disk_cache: DiskCache = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+    ) -> None:
         """Initialize the service with a session.
 
         Args:
@@ -50,8 +76,20 @@ class BaseService(ABC):
                 containing the keys:<br>
                 - username (str): The username for authentication.<br>
                 - password (str): The password for authentication.<br>
+            response_cache: optional in-memory cache for responses. If `None`,
+                every call is sent to the GENESIS-Online API.
+            disk_cache: optional persistent cache for responses, consulted
+                after the `response_cache`.
+            rate_limiter: optional rate limiter, shared by all services using
+                the same `session`, which spaces out the requests sent.
+            retry_policy: optional policy for retrying requests which failed
+                due to transient errors. If `None`, requests are not retried.
         """
         self._session = session
+        self.response_cache = response_cache
+        self.disk_cache = disk_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
 
     def _check_param_names(self, expected_params: list, received_params: list) -> None:
         """Check if parameter names are as expected by the GENESIS-Online API.
@@ -79,17 +117,33 @@ class BaseService(ABC):
                 UnexpectedParameterWarning,
             )
 
-    def request(self, endpoint: str, **api_params) -> Any:
+    def request(
+        self,
+        endpoint: str,
+        stream: Union[bool, Literal["lines", "bytes"]] = False,
+        **api_params,
+    ) -> Any:
         """Send a request to the specified GENESIS-Online endpoint.
 
+        If the service has a `response_cache` or a `disk_cache`, a previous
+        response to the same endpoint and parameters is returned instead of
+        sending a new request. Expired disk cache entries are revalidated
+        with the server.
+
         Args:
             endpoint: the endpoint URL segment to which the request will be sent.
+            stream: if `True` or "lines", a text/csv body is not read at once
+                but returned as a lazy iterator over its decoded lines. If
+                "bytes", text/csv and image/png bodies are returned as a lazy
+                iterator over raw byte chunks. Streamed responses are never
+                cached, and JSON bodies are always read completely.
             **api_params: additional keyword arguments to be sent as query
                 parameters in the request.
 
         Returns:
             Any: depending on the content type, the returned content may be a
-                JSON object, binary data, or text.
+                JSON object, binary data, text or an iterator of lines or
+                byte chunks.
 
         Raises:
             HTTPError: when the HTTP request returns an unsuccessful status code.
@@ -100,33 +154,207 @@ class BaseService(ABC):
                 one of the expected content types. Expected types are
                 application/json, image/png and text/csv.
         """
+        if stream:
+            return self._send(endpoint, api_params, stream=stream)[0]
+
+        cache_key = self._cache_key(endpoint, api_params)
+        if self.response_cache is not None:
+            content = self.response_cache.get(cache_key)
+            if content is not None:
+                return content
+
+        if self.disk_cache is not None:
+            content = self._request_disk_cache(endpoint, cache_key, api_params)
+        else:
+            content, _ = self._send(endpoint, api_params)
+
+        if self.response_cache is not None and self._is_cacheable(endpoint, content):
+            self.response_cache.set(cache_key, content)
+        return content
+
+    def _send(
+        self,
+        endpoint: str,
+        api_params: dict,
+        headers: dict = None,
+        stream: Union[bool, str] = False,
+    ) -> Tuple[Any, requests.Response]:
+        """Send a request to the GENESIS-Online API, bypassing any cache.
+
+        Returns:
+            The parsed content together with the raw response. The content is
+            `None` if a conditional request was answered with 304 Not Modified.
+        """
         url = urljoin(self._BASE_URL, endpoint)
         try:
-            response = self._session.get(url, params=api_params)
+            response = self._get(url, api_params, headers, stream=bool(stream))
             response.raise_for_status()
+            if response.status_code == 304:
+                return None, response
 
-            content_type = response.headers.get("content-type")
-            if "application/json" in content_type:
-                content = response.json()
-                self._check_param_names(
-                    expected_params=list(content.get(JsonKeys.PARAMETER, {}).keys()),
-                    received_params=list(api_params.keys()),
-                )
-            elif "image/png" in content_type:
-                content = response.content
-            elif "text/csv" in content_type:
-                content = response.text
+            if stream:
+                content = self._stream_response(response, api_params, stream)
             else:
-                raise UnexpectedContentError(f"Unexpected content type: {content_type}")
-            return content
-        except requests.exceptions.HTTPError as e:
-            raise HTTPError(f"HTTP error occurred: {e}") from e
-        except requests.exceptions.ConnectionError as e:
-            raise ConnectionError(f"Connection error occurred: {e}") from e
-        except requests.exceptions.Timeout as e:
-            raise TimeoutError(f"Timeout error occurred: {e}") from e
+                content = self._parse_response(response, api_params)
+            return content, response
         except requests.exceptions.RequestException as e:
-            raise RequestError(f"Request error occurred: {e}") from e
+            raise _request_error(e) from e
+
+    def _get(
+        self, url: str, api_params: dict, headers: dict, stream: bool = False
+    ) -> requests.Response:
+        """Send a GET request, retrying transient failures per `retry_policy`."""
+        attempt = 0
+        while True:
+            try:
+                response = self._get_once(url, api_params, headers, stream)
+            except requests.exceptions.RequestException as e:
+                if self.retry_policy is None or not self.retry_policy.is_retryable(
+                    attempt, error=e
+                ):
+                    raise
+                reason, delay = e, self.retry_policy.backoff(attempt)
+            else:
+                if self.retry_policy is None or not self.retry_policy.is_retryable(
+                    attempt, response=response
+                ):
+                    return response
+                reason = f"status {response.status_code}"
+                delay = self.retry_policy.backoff(attempt, response.headers)
+                # release the connection of the failed attempt to the pool
+                response.close()
+            attempt += 1
+            logger.warning(
+                f"Request to '{url}' failed ({reason}), "
+                f"retry {attempt}/{self.retry_policy.total} in {delay:.2f} second(s)"
+            )
+            time.sleep(delay)
+
+    def _get_once(
+        self, url: str, api_params: dict, headers: dict, stream: bool = False
+    ) -> requests.Response:
+        """Send a single GET request, respecting the `rate_limiter`."""
+        if self.rate_limiter is None:
+            return self._session.get(
+                url, params=api_params, headers=headers, stream=stream
+            )
+
+        self.rate_limiter.acquire()
+        response = self._session.get(
+            url, params=api_params, headers=headers, stream=stream
+        )
+        if response.status_code in OVERLOAD_STATUS_CODES:
+            self.rate_limiter.throttle(retry_after(response.headers))
+        else:
+            self.rate_limiter.recover()
+        return response
+
+    def _parse_response(self, response: requests.Response, api_params: dict) -> Any:
+        """Extract the content of `response` depending on its content type."""
+        content_type = response.headers.get("content-type")
+        if "application/json" in content_type:
+            content = response.json()
+            self._check_param_names(
+                expected_params=list(content.get(JsonKeys.PARAMETER, {}).keys()),
+                received_params=list(api_params.keys()),
+            )
+        elif "image/png" in content_type:
+            content = response.content
+        elif "text/csv" in content_type:
+            content = response.text
+        else:
+            raise UnexpectedContentError(f"Unexpected content type: {content_type}")
+        return content
+
+    def _stream_response(
+        self, response: requests.Response, api_params: dict, stream: Union[bool, str]
+    ) -> Any:
+        """Extract the content of `response` lazily where possible."""
+        content_type = response.headers.get("content-type") or ""
+        if stream == "bytes" and (
+            "text/csv" in content_type or "image/png" in content_type
+        ):
+            return _iter_chunks(response, self._chunk_size)
+        if stream != "bytes" and "text/csv" in content_type:
+            return _iter_lines(response, self._chunk_size)
+        try:
+            return self._parse_response(response, api_params)
+        finally:
+            response.close()
+
+    def _request_disk_cache(
+        self, endpoint: str, cache_key: tuple, api_params: dict
+    ) -> Any:
+        """Answer a request from the disk cache, revalidating if necessary."""
+        if endpoint in self._uncached_endpoints:
+            return self._send(endpoint, api_params)[0]
+
+        entry, state = self.disk_cache.lookup(cache_key)
+        if state == "fresh":
+            return entry["content"]
+        if state == "stale":
+            if self.disk_cache.begin_refresh(cache_key):
+                Thread(
+                    target=self._refresh_disk_cache,
+                    args=(endpoint, cache_key, entry, api_params),
+                    daemon=True,
+                ).start()
+            return entry["content"]
+        return self._revalidate(endpoint, cache_key, entry, api_params)
+
+    def _refresh_disk_cache(
+        self, endpoint: str, cache_key: tuple, entry: dict, api_params: dict
+    ) -> None:
+        """Revalidate a stale disk cache entry in the background."""
+        try:
+            self._revalidate(endpoint, cache_key, entry, api_params)
+        except GenesisOnlineError as e:
+            logger.warning(f"Background refresh of '{endpoint}' failed: {e}")
+        finally:
+            self.disk_cache.end_refresh(cache_key)
+
+    def _revalidate(
+        self, endpoint: str, cache_key: tuple, entry: dict, api_params: dict
+    ) -> Any:
+        """Fetch a response, conditionally if `entry` carries validators."""
+        content, response = self._send(
+            endpoint, api_params, headers=self.disk_cache.validators(entry)
+        )
+        if content is None and entry is not None:
+            self.disk_cache.refresh(cache_key, entry, response.headers)
+            return entry["content"]
+        if self._is_cacheable(endpoint, content):
+            self.disk_cache.set(cache_key, content, response.headers)
+        return content
+
+    def _cache_key(self, endpoint: str, api_params: dict) -> tuple:
+        """Key identifying a request, i.e. endpoint and sorted parameters.
+
+        The credentials of the session are not part of the key. Parameters
+        set to `None` are left out, just as they are not sent by `requests`.
+        """
+        params = {
+            k: v
+            for k, v in self._session.params.items()
+            if k not in ("username", "password")
+        }
+        params.update(api_params)
+        return (
+            endpoint,
+            tuple(sorted((k, str(v)) for k, v in params.items() if v is not None)),
+        )
+
+    def _is_cacheable(self, endpoint: str, content: Any) -> bool:
+        """Check whether a response may be served again from the cache."""
+        if endpoint in self._uncached_endpoints:
+            return False
+        if isinstance(content, dict):
+            status = content.get(JsonKeys.STATUS) or {}
+            return status.get(JsonKeys.CODE) not in (
+                ResponseStatus.BACKGROUND_REQ,
+                ResponseStatus.BACKGROUND_RUN,
+            )
+        return True
 
     @abstractmethod
     def _request(self) -> dict:
@@ -149,3 +377,47 @@ class BaseService(ABC):
                 the specified format.
         """
         pass
+
+
+def _request_error(error: requests.exceptions.RequestException) -> GenesisOnlineError:
+    """Map an exception of `requests` to the corresponding wrapper exception."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        return HTTPError(f"HTTP error occurred: {error}")
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return ConnectionError(f"Connection error occurred: {error}")
+    if isinstance(error, requests.exceptions.Timeout):
+        return TimeoutError(f"Timeout error occurred: {error}")
+    return RequestError(f"Request error occurred: {error}")
+
+
+def _iter_chunks(response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+    """Lazily yield the body of a streamed `response` in byte chunks."""
+    try:
+        yield from response.iter_content(chunk_size)
+    except requests.exceptions.RequestException as e:
+        raise _request_error(e) from e
+    finally:
+        response.close()
+
+
+def _iter_lines(response: requests.Response, chunk_size: int) -> Iterator[str]:
+    """Lazily yield the decoded lines of a streamed `response`.
+
+    Line breaks are removed. Unlike `requests.Response.iter_lines`, a "\r\n"
+    split between two chunks does not yield an additional empty line.
+    """
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    pending = ""
+    try:
+        for chunk in response.iter_content(chunk_size, decode_unicode=True):
+            lines = (pending + chunk).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line.rstrip("\r")
+        if pending:
+            yield pending.rstrip("\r")
+    except requests.exceptions.RequestException as e:
+        raise _request_error(e) from e
+    finally:
+        response.close()
@@ -1,13 +1,32 @@
 """Functionality for interacting with the GENESIS-Online Catalogue service.
 """
 import requests
+from typing import Callable, Iterator
 from genesisonline.services.base import BaseService
 from genesisonline.constants import Endpoints, JsonKeys
 from genesisonline.exceptions import StandardizationError
+from genesisonline.pagination import (
+    MAX_PAGELENGTH,
+    iter_objects,
+    iter_objects_concurrently,
+)
 
 
 class CatalogueService(BaseService):
-    """Service containing methods for listing objects."""
+    """Service containing methods for listing objects.
+
+    Every listing method returns a single page of at most `pagelength`
+    objects. The `iter_*` variants, e.g. `iter_tables`, iterate lazily over
+    the complete listing instead, requesting one page after another (see
+    `genesisonline.pagination`). They accept the keyword arguments
+    `pagelength`, `prefetch` and `max_workers` in addition to the parameters
+    of the request.
+
+    Examples:
+        >>> for table in go.catalogue.iter_tables(selection="124*"):
+        ...     print(table["Code"])
+        >>> variables = list(go.catalogue.iter_variables(max_workers=16))
+    """
 
     _service = "catalogue"
     endpoints = [
@@ -32,9 +51,14 @@ class CatalogueService(BaseService):
         "variables",
         "variables2statistic",
     ]
+    _uncached_endpoints = (
+        Endpoints.CATALOGUE_JOBS,
+        Endpoints.CATALOGUE_MODIFIEDDATA,
+        Endpoints.CATALOGUE_RESULTS,
+    )
 
-    def __init__(self, session: requests.Session) -> None:
-        super().__init__(session)
+    def __init__(self, session: requests.Session, **kwargs) -> None:
+        super().__init__(session, **kwargs)
 
     def __str__(self) -> str:
         return "Service containing methods for listing objects."
@@ -211,6 +235,148 @@ class CatalogueService(BaseService):
             **api_params,
         )
 
+    def iter_cubes(
+        self, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all cubes from `area` according to the `selection`."""
+        return self._iter(self.cubes, selection, area=area, **api_params)
+
+    def iter_statistics(self, selection: str = None, **api_params) -> Iterator[dict]:
+        """Iterates over all statistics according to the `selection`."""
+        return self._iter(self.statistics, selection, **api_params)
+
+    def iter_tables(
+        self, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all tables from `area` according to the `selection`."""
+        return self._iter(self.tables, selection, area=area, **api_params)
+
+    def iter_timeseries(
+        self, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all timeseries from `area` according to the `selection`."""
+        return self._iter(self.timeseries, selection, area=area, **api_params)
+
+    def iter_values(
+        self, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all values from `area` according to the `selection`."""
+        return self._iter(self.values, selection, area=area, **api_params)
+
+    def iter_variables(
+        self, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all variables from `area` according to the `selection`."""
+        return self._iter(self.variables, selection, area=area, **api_params)
+
+    def iter_cubes2statistic(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all cubes related to statistic `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.cubes2statistic, selection, name=name, area=area, **api_params
+        )
+
+    def iter_cubes2variable(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all cubes related to variable `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.cubes2variable, selection, name=name, area=area, **api_params
+        )
+
+    def iter_statistics2variable(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all statistics related to variable `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.statistics2variable, selection, name=name, area=area, **api_params
+        )
+
+    def iter_tables2statistics(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all tables related to statistic `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.tables2statistics, selection, name=name, area=area, **api_params
+        )
+
+    def iter_tables2variable(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all tables related to variable `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.tables2variable, selection, name=name, area=area, **api_params
+        )
+
+    def iter_timeseries2statistic(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all timeseries related to statistic `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.timeseries2statistic, selection, name=name, area=area, **api_params
+        )
+
+    def iter_timeseries2variable(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all timeseries related to variable `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.timeseries2variable, selection, name=name, area=area, **api_params
+        )
+
+    def iter_values2variable(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all values related to variable `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.values2variable, selection, name=name, area=area, **api_params
+        )
+
+    def iter_variables2statistic(
+        self, name: str = None, selection: str = None, area: str = None, **api_params
+    ) -> Iterator[dict]:
+        """Iterates over all variables related to statistic `name` from `area` according to the `selection`."""
+        return self._iter(
+            self.variables2statistic, selection, name=name, area=area, **api_params
+        )
+
+    def _iter(
+        self,
+        method: Callable[..., dict],
+        selection: str = None,
+        pagelength: int = MAX_PAGELENGTH,
+        prefetch: bool = True,
+        max_workers: int = 1,
+        **api_params,
+    ) -> Iterator[dict]:
+        """Iterate over the complete listing of `method` page by page.
+
+        Args:
+            method: the listing method, e.g. `tables`.
+            selection: selection of the complete listing, e.g. "124*".
+            pagelength: number of objects requested per page.
+            prefetch: whether the next page is requested in the background
+                while the current one is consumed.
+            max_workers: if greater than 1, the shards of the listing are
+                requested concurrently by as many threads, see
+                `iter_objects_concurrently`. The objects are then yielded in
+                no particular order.
+            **api_params: further parameters of every request.
+        """
+
+        def fetch(page_selection: str) -> list:
+            response = method(
+                selection=page_selection, pagelength=pagelength, **api_params
+            )
+            return response[JsonKeys.CONTENT] or []
+
+        if max_workers > 1:
+            return iter_objects_concurrently(
+                fetch, selection, int(pagelength), max_workers=max_workers
+            )
+        return iter_objects(fetch, selection, int(pagelength), prefetch=prefetch)
+
     def _request(self, endpoint: str, **api_params) -> dict:
         response = super().request(endpoint, **api_params)
 
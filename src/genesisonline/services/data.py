@@ -1,16 +1,23 @@
 """Functionality for interacting with the GENESIS-Online Data service.
 """
-import requests
-import time
+import copy
+import os
 import re
+import requests
 import logging
-from threading import Thread
-from typing import Union
+from concurrent.futures import Future
+from typing import Dict, List, Union
 from pathlib import Path
 from genesisonline.services.base import BaseService
-from genesisonline.constants import Endpoints, ResponseStatus, JsonKeys
+from genesisonline.constants import (
+    Endpoints,
+    JsonKeys,
+    JsonStrings,
+    ResponseStatus,
+)
 from genesisonline.exceptions import StandardizationError
 from genesisonline.filemanager import FileManager
+from genesisonline.jobs import Job, JobPoller, PollingPolicy
 
 try:
     from typing import Literal
@@ -32,6 +39,9 @@ class DataService(BaseService):
     - resultfile (call `result` instead)<br>
     - tablefile (call `table` instead)<br>
     - timeseriesfile (call `timeseries` instead)
+
+    All methods accept `stream=True` to receive a text/csv content as a lazy
+    iterator over its lines instead of one string, see `BaseService.request`.
     """
 
     _service = "data"
@@ -47,29 +57,114 @@ class DataService(BaseService):
         "table",
         "timeseries",
     ]
+    _uncached_endpoints = (Endpoints.DATA_RESULT,)
+
+    # maximum length of a selection and number of jobs listed at once
+    _selection_length = 15
+    _jobs_pagelength = 2500
 
     def __init__(
-        self, session: requests.Session, cache: Union[Path, str] = None
+        self,
+        session: requests.Session,
+        cache: Union[Path, str] = None,
+        polling_policy: PollingPolicy = None,
+        job_budget: float = None,
+        compression: Literal["gz", "bz2", "xz", "zst"] = None,
+        max_bytes: int = None,
+        eviction: Literal["lru", "lfu"] = "lru",
+        **kwargs,
     ) -> None:
         """
         Args:
             cache: path to where the results of large table operations are saved.
                 If `None`, results are stored in the user's home directory.
+            polling_policy: determines the delay between two checks of a
+                batch job. If `None`, a `PollingPolicy` with default settings.
+            job_budget: maximum number of requests per second sent to check
+                batch jobs, see `JobPoller`. If `None`, the checks are only
+                limited by the `polling_policy`.
+            compression: compression of the saved results, e.g. "gz" to save
+                them as "<result_id>.json.gz". If `None`, results are saved
+                uncompressed.
+            max_bytes: maximum total size of the saved results. If exceeded,
+                the least recently used results are evicted. If `None`,
+                results are never evicted. The results of pending batch jobs
+                are never evicted.
+            eviction: order in which results are evicted, "lru" evicts the
+                least recently used ones first, "lfu" the least frequently
+                used ones.
+            **kwargs: additional keyword arguments passed to `BaseService`,
+                e.g. `response_cache`.
         """
-        super().__init__(session)
-        self._timeout = 30
-        self.filemanager = FileManager(cache)
+        super().__init__(session, **kwargs)
+        self.filemanager = FileManager(cache, max_bytes=max_bytes, eviction=eviction)
+        self.compression = compression
+        self.poller = JobPoller(self, policy=polling_policy, budget=job_budget)
+        # json envelopes of non-json responses, see `_get_json_container`
+        self._containers = dict()
 
     def __str__(self) -> str:
         return "Service containing methods for downloading data."
 
     def load(self, result_id):
-        file_name = f"{result_id}.json"
-        return self.filemanager.load(file_name)
+        return self.filemanager.load(self._file_name(result_id))
 
     def save(self, object, result_id):
-        file_name = f"{result_id}.json"
-        self.filemanager.save(object, file_name)
+        # the responses of pending jobs are merged with their results later
+        pending = [self._file_name(job) for job in self.poller.pending()]
+        self.filemanager.save(
+            object, self._file_name(result_id), self._origin(object), keep=pending
+        )
+
+    def _origin(self, response: dict) -> dict:
+        """Endpoint and parameters a saved response was requested with."""
+        ident = response.get(JsonKeys.IDENT) or dict()
+        params = {
+            key: value
+            for key, value in (response.get(JsonKeys.PARAMETER) or dict()).items()
+            if key not in ("username", "password")
+        }
+        return {
+            "endpoint": f"{ident.get(JsonKeys.SERVICE)}/{ident.get(JsonKeys.METHOD)}",
+            "params": params,
+        }
+
+    def _file_name(self, result_id: str) -> str:
+        if self.compression:
+            return f"{result_id}.json.{self.compression}"
+        return f"{result_id}.json"
+
+    def invalidate(self, code: str) -> int:
+        """Remove saved batch job results of the object `code`.
+
+        Results of pending jobs are kept, see `clear`.
+
+        Returns:
+            The number of removed files.
+        """
+        names = self._saved_results(code)
+        for name in names:
+            self.filemanager.delete(name)
+        return len(names)
+
+    def clear(self) -> None:
+        """Remove all saved batch job results.
+
+        Only files recorded in the index of the `filemanager` are removed,
+        except the ones of pending jobs, which are merged with their results
+        later.
+        """
+        for name in self._saved_results():
+            self.filemanager.delete(name)
+
+    def _saved_results(self, prefix: str = "") -> List[str]:
+        """Names of the saved results starting with `prefix`, except pending ones."""
+        pending = {self._file_name(job) for job in self.poller.pending()}
+        return [
+            name
+            for name in self.filemanager.index.names(prefix)
+            if ".json" in Path(name).suffixes and name not in pending
+        ]
 
     def chart2result(self, name: str = None, area: str = None, **api_params) -> dict:
         """Returns a chart related to results table `name` from `area`."""
@@ -122,18 +217,35 @@ class DataService(BaseService):
         wait_for_result: bool = True,
         name: str = None,
         area: str = None,
+        priority: int = 0,
         **api_params,
-    ) -> dict:
+    ) -> Union[dict, Job]:
         """Returns table `name` from `area`according to the parameters set.
 
-        Async if `wait_for_result` = False.
+        If `wait_for_result` = False, a `concurrent.futures.Future` of the
+        response is returned instead, whose result is set as soon as a batch
+        job (i.e. a very large table) has finished. Jobs with a higher
+        `priority` are checked first.
+
+        Examples:
+            >>> from concurrent.futures import as_completed
+            >>> futures = [
+            ...     go.data.table(wait_for_result=False, name=name)
+            ...     for name in ("51000-0013", "51000-0014")
+            ... ]
+            >>> for future in as_completed(futures):
+            ...     response = future.result()
         """
         response = self._request(
             Endpoints.DATA_TABLE, name=name, area=area, job="true", **api_params
         )
 
         if response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.BACKGROUND_RUN:
-            return self._get_batch_job_result(response, wait_for_result)
+            return self._get_batch_job_result(response, wait_for_result, priority)
+        if not wait_for_result:
+            future = Future()
+            future.set_result(response)
+            return future
         return response
 
     def timeseries(self, name: str = None, area: str = None, **api_params) -> dict:
@@ -142,9 +254,12 @@ class DataService(BaseService):
             Endpoints.DATA_TIMESERIES, name=name, area=area, **api_params
         )
 
-    def _request(self, endpoint: str, **api_params) -> dict:
-        response = super().request(endpoint, **api_params)
+    def _request(self, endpoint: str, stream: bool = False, **api_params) -> dict:
+        response = super().request(endpoint, stream=stream, **api_params)
+        return self._process_response(endpoint, response, api_params)
 
+    def _process_response(self, endpoint: str, response, api_params: dict) -> dict:
+        """Wrap and standardize a raw response of the data service."""
         # check if non-empty json object
         if isinstance(response, dict) and response[JsonKeys.OBJECT]:
             # get rid of nested structure (standardization)
@@ -169,15 +284,33 @@ class DataService(BaseService):
         return response
 
     def _get_json_container(self, endpoint: str, api_params: dict) -> dict:
-        """Get an empty GO json container"""
+        """Get a GO json container for a non-json response.
 
-        # make API call with invalid parameters to get an empty "json containter"
-        api_params["name"], name = "", api_params["name"]
-        container = self._request(endpoint, **api_params)
+        Binary (image/png) and text (text/csv) responses come without the
+        usual json envelope. The envelope is requested once with an empty
+        name and cached per endpoint and language, so that all further
+        downloads cost a single request each. The parameter names are
+        checked against the cached envelope on every call.
+        """
+        key = self._container_key(endpoint, api_params)
+        container = self._containers.get(key)
+        if container is None:
+            response = self.request(endpoint, name="", language=key[1])
+            container = self._envelope(response)
+            self._containers[key] = container
+        return self._fill_container(container, api_params)
+
+    def _container_key(self, endpoint: str, api_params: dict) -> tuple:
+        """Endpoint and language the envelope of a request is cached by."""
+        language = api_params.get("language")
+        return endpoint, language or self._session.params.get("language", "en")
+
+    def _envelope(self, container) -> dict:
+        """Turn the response to an empty name into a container of status 0 or 22."""
         if not isinstance(container, dict):
             raise TypeError(f"Expected json response but received: {container}")
 
-        # update response status to 0 or 22
+        # the API lists adjusted parameters in parentheses, i.e. status 22
         status_22 = re.findall(
             r"\((.*?)\)", container[JsonKeys.STATUS][JsonKeys.CONTENT]
         )
@@ -186,18 +319,44 @@ class DataService(BaseService):
                 JsonKeys.CODE
             ] = ResponseStatus.PARTLY_MATCH.value
             container[JsonKeys.STATUS][JsonKeys.CONTENT] = status_22[0]
-        else:  # i.e. status 0
-            container[JsonKeys.STATUS][JsonKeys.CODE] = ResponseStatus.MATCH.value
-            container[JsonKeys.STATUS][JsonKeys.CONTENT] = (
-                "successfull"
-                if container[JsonKeys.PARAMETER]["language"] == "en"
-                else "erfolgreich"
-            )
-        container[JsonKeys.PARAMETER]["name"] = name
+        else:
+            language = container[JsonKeys.PARAMETER].get("language")
+            container[JsonKeys.STATUS] = self._success_status(language)
+        container[JsonKeys.OBJECT] = None
+        return container
 
+    def _fill_container(self, container: dict, api_params: dict) -> dict:
+        """Copy of the cached `container` for a request with `api_params`."""
+        self._check_param_names(
+            expected_params=list(container[JsonKeys.PARAMETER].keys()),
+            received_params=list(api_params.keys()),
+        )
+        container = copy.deepcopy(container)
+        parameter = container[JsonKeys.PARAMETER]
+        parameter.update(
+            (key, value)
+            for key, value in api_params.items()
+            if key in parameter and value is not None
+        )
+        parameter["name"] = api_params.get("name")
         return container
 
-    def _get_batch_job_result(self, response: dict, wait_for_result: bool) -> dict:
+    def _success_status(self, language: str) -> dict:
+        """Status section of a successfully processed request.
+
+        Unknown languages fall back to the english strings.
+        """
+        if language not in JsonStrings.SUCCESS:
+            language = "en"
+        return {
+            JsonKeys.CODE: ResponseStatus.MATCH.value,
+            JsonKeys.CONTENT: JsonStrings.SUCCESS[language],
+            JsonKeys.TYPE: JsonStrings.INFORMATION[language],
+        }
+
+    def _get_batch_job_result(
+        self, response: dict, wait_for_result: bool, priority: int = 0
+    ) -> Union[dict, Job]:
         """Synchronously or asynchronously retrieve the result of a batch job.
 
         Note that the intermediate and final results are always saved to disk
@@ -208,48 +367,62 @@ class DataService(BaseService):
                 the initial request. This response object is already formatted
                 to wrapper guidelines.
             wait_for_result: if True, the method waits for the result before
-                returning. If False, a thread is started to probe for the
-                result asynchronously.
+                returning. If False, the job is left to the `poller` and its
+                future is returned.
+            priority: jobs with a higher priority are checked first.
         """
         result_id = response[JsonKeys.STATUS][JsonKeys.CONTENT].split(" ")[-1]
         language = response[JsonKeys.PARAMETER]["language"]
 
-        self.save(response, result_id)
-        if wait_for_result:
-            self._probe_for_result(result_id, language)
-        else:
-            thread = Thread(target=self._probe_for_result, args=(result_id, language))
-            thread.start()
+        if not wait_for_result:
             response[JsonKeys.CONTENT] = result_id
-            self.save(response, result_id)
+        self.save(response, result_id)
+        job = self.poller.submit(result_id, language, priority=priority)
+        return job.result() if wait_for_result else job
+
+    def _check_result(self, result_id: str, language: Literal["de", "en"]) -> dict:
+        """Check once whether the result of a batch job is available.
 
-        # load results as batch jobs are always saved as file
+        Returns:
+            The saved response including the result, or `None` if the job has
+            not finished yet.
+        """
+        result = self.result(name=result_id, language=language)
+        if result[JsonKeys.STATUS][JsonKeys.CODE] != ResponseStatus.MATCH:
+            return None
+        self._save_result(result_id, result, language)
         return self.load(result_id)
 
-    def _probe_for_result(self, result_id: str, language: Literal["de", "en"]) -> None:
-        """Probe for the result of a batch job in set time intervals.
+    def _job_states(self, result_ids: List[str]) -> Dict[str, str]:
+        """List the states of the batch jobs `result_ids` with a single request.
 
-        The response will be stored as a json file.
+        The listing is restricted to the common prefix of all `result_ids`,
+        e.g. "51000-0013_*" for jobs of the same table. Jobs which are not
+        listed, e.g. as they have just been submitted, are missing in the
+        returned mapping.
 
-        Args:
-            result_id: the unique identifier for the result.
-            language: language the user wants the response to be in.
+        Returns:
+            The state of every listed job, e.g. "finished", by its result id.
         """
-        while True:
-            logger.info(
-                f"Checking for result '{result_id}' every {self._timeout} second(s)."
-            )
-            result = self.result(name=result_id, language=language)
-            if result[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.MATCH:
-                primary_result = self.load(result_id)
-                primary_result[JsonKeys.CONTENT] = result[JsonKeys.CONTENT]
-                primary_result[JsonKeys.STATUS] = {
-                    JsonKeys.CODE: ResponseStatus.MATCH.value,
-                    JsonKeys.CONTENT: "successfull"
-                    if language == "en"
-                    else "erfolgreich",
-                    JsonKeys.TYPE: "information" if language == "en" else "Information",
-                }
-                self.save(primary_result, result_id)
-                return
-            time.sleep(self._timeout)  # TODO: parametrize?
+        prefix = os.path.commonprefix(result_ids)[: self._selection_length - 1]
+        api_params = {
+            "selection": f"{prefix}*" if prefix else None,
+            "pagelength": self._jobs_pagelength,
+            "language": "en",
+        }
+        listing, _ = self._send(Endpoints.CATALOGUE_JOBS, api_params)
+        wanted = set(result_ids)
+        return {
+            job[JsonKeys.CODE]: job[JsonKeys.STATE]
+            for job in listing.get(JsonKeys.LIST) or []
+            if job.get(JsonKeys.CODE) in wanted
+        }
+
+    def _save_result(
+        self, result_id: str, result: dict, language: Literal["de", "en"]
+    ) -> None:
+        """Merge the finished `result` of a batch job into its saved response."""
+        primary_result = self.load(result_id)
+        primary_result[JsonKeys.CONTENT] = result[JsonKeys.CONTENT]
+        primary_result[JsonKeys.STATUS] = self._success_status(language)
+        self.save(primary_result, result_id)
@@ -4,6 +4,7 @@
 import requests
 from genesisonline.services.base import BaseService
 from genesisonline.constants import Endpoints, JsonKeys
+from genesisonline import exceptions
 from genesisonline.exceptions import StandardizationError
 
 
@@ -11,22 +12,51 @@ class FindService(BaseService):
     """Service containing methods for finding information on objects.
 
     Objects can be cubes, statistics, tables, timeseries or variables.
+
+    Attributes:
+        mirror: optional `CatalogueMirror` answering `find` requests with
+            `offline=True`.
     """
 
     _service = "find"
     endpoints = ["find"]
 
-    def __init__(self, session: requests.Session) -> None:
-        super().__init__(session)
+    def __init__(self, session: requests.Session, mirror=None, **kwargs) -> None:
+        super().__init__(session, **kwargs)
+        self.mirror = mirror
 
     def __str__(self) -> str:
         return "Service containing methods for finding information on objects."
 
-    def find(self, term: str, category: str = None, **api_params) -> dict:
+    def find(
+        self, term: str, category: str = None, offline: bool = False, **api_params
+    ) -> dict:
         """Returns lists of objects for a search `term`.
 
         Objects can be cubes, statistics, tables, timeseries or variables.
+
+        Args:
+            term: the words searched for.
+            category: category of the objects searched for.
+            offline: if True, the objects are searched in the local `mirror`
+                instead of requesting the API. Supports the parameters
+                `language` and `pagelength`.
         """
+        if offline:
+            if self.mirror is None:
+                raise exceptions.ValueError(
+                    "Searching offline requires a catalogue mirror, "
+                    "see `GenesisOnline.catalogue_mirror`"
+                )
+            language = api_params.get("language") or self._session.params.get(
+                "language", "en"
+            )
+            return self.mirror.find(
+                term,
+                category=category,
+                language=language,
+                pagelength=int(api_params.get("pagelength", 100)),
+            )
         return self._request(
             Endpoints.FIND_FIND, term=term, category=category, **api_params
         )
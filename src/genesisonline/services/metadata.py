@@ -12,8 +12,8 @@ class MetadataService(BaseService):
     _service = "metadata"
     endpoints = ["cube", "statistic", "table", "timeseries", "value", "variable"]
 
-    def __init__(self, session: requests.Session) -> None:
-        super().__init__(session)
+    def __init__(self, session: requests.Session, **kwargs) -> None:
+        super().__init__(session, **kwargs)
 
     def __str__(self) -> str:
         return "Service containing methods for downloading metadata."
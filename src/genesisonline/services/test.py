@@ -16,9 +16,10 @@ class TestService(BaseService):
 
     _service = "helloworld"
     endpoints = ["whoami", "logincheck"]
+    _uncached_endpoints = (Endpoints.TEST_WHOAMI, Endpoints.TEST_LOGINCHECK)
 
-    def __init__(self, session: requests.Session) -> None:
-        super().__init__(session)
+    def __init__(self, session: requests.Session, **kwargs) -> None:
+        super().__init__(session, **kwargs)
 
     def __str__(self) -> str:
         return "Service containing methods for testing the API."
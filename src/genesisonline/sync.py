@@ -0,0 +1,185 @@
+"""Incremental synchronization of downloaded tables.
+
+A `TableSync` keeps a directory of tables up to date. It remembers the date
+each table was last downloaded and asks `catalogue/modifieddata` which
+tables changed since then. Only new and changed tables are downloaded again
+with a `Downloader`, all others are left untouched:
+
+```python
+sync = TableSync(go, "tables")
+sync.run(["12411-0001", "61111-0001", ...])  # nightly
+```
+
+The dates are kept in "sync.json" in the directory, which is replaced
+atomically after every run, like the table files themselves. A table which
+fails to download keeps its previous date and file, hence it is tried again
+in the next run. Cached responses of changed tables are evicted before they
+are downloaded, so a client with `cache_ttl` or a `disk_cache` does not
+return the outdated copies.
+"""
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+from genesisonline.constants import JsonKeys
+from genesisonline.download import Downloader
+
+logger = logging.getLogger(__name__)
+
+# name of the file holding the date of the last download of every table
+STATE = "sync.json"
+
+# formats of the dates listed by `catalogue/modifieddata`
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value or "", fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class TableSync:
+    """Downloads only the tables changed since their last download.
+
+    Attributes:
+        downloader: the `Downloader` writing the tables to its directory.
+        pagelength: maximum number of modified objects requested per run. If
+            reached, the listing may be incomplete and all tables are
+            downloaded again.
+    """
+
+    def __init__(
+        self,
+        client,
+        directory: Union[Path, str],
+        max_workers: int = 8,
+        pagelength: int = 2500,
+        **api_params,
+    ) -> None:
+        """
+        Args:
+            client: the `GenesisOnline` client the tables are requested with.
+            directory: directory of the tables, created if necessary.
+            max_workers: maximum number of tables requested concurrently.
+            pagelength: maximum number of modified objects requested per run.
+            **api_params: further parameters of every table request.
+        """
+        self.downloader = Downloader(
+            client, directory, max_workers=max_workers, **api_params
+        )
+        self.pagelength = pagelength
+
+    @property
+    def state(self) -> Path:
+        return self.downloader.directory / STATE
+
+    def synced(self) -> Dict[str, date]:
+        """Date of the last download of every table, by code."""
+        if not self.state.exists():
+            return dict()
+        with open(self.state, "r", encoding="utf-8") as f:
+            return {code: date.fromisoformat(day) for code, day in json.load(f).items()}
+
+    def changed(self, codes: Iterable[str]) -> List[str]:
+        """Codes of the tables which are new or changed since their download.
+
+        A table has changed if `catalogue/modifieddata` lists it, or its
+        statistic, as modified on or after the date it was downloaded. A table
+        whose file is missing is treated as new.
+        """
+        codes = list(dict.fromkeys(codes))
+        synced = self.synced()
+        entries = self.downloader.entries()
+        known = {
+            code: synced[code]
+            for code in codes
+            if code in synced
+            and code in entries
+            and (self.downloader.directory / entries[code]["file"]).exists()
+        }
+        changed = [code for code in codes if code not in known]
+        if not known:
+            return changed
+
+        modified = self._modified(min(known.values()))
+        if modified is None:
+            return codes
+        for code, day in known.items():
+            if any(
+                code.startswith(object_code) and (since is None or since >= day)
+                for object_code, since in modified
+            ):
+                changed.append(code)
+        changed = set(changed)
+        return [code for code in codes if code in changed]
+
+    def run(self, codes: Iterable[str]) -> Dict[str, dict]:
+        """Download the new and changed tables among `codes`.
+
+        Returns:
+            The manifest entry of every table downloaded in this run, by code.
+        """
+        started = date.today()
+        codes = list(dict.fromkeys(codes))
+        changed = self.changed(codes)
+        logger.info(f"{len(changed)} of {len(codes)} table(s) are new or changed")
+
+        self._invalidate(changed)
+        results = self.downloader.run(changed, resume=False) if changed else dict()
+        synced = {code: day.isoformat() for code, day in self.synced().items()}
+        for code, entry in results.items():
+            # tables not returned by the API, e.g. not found, are failed
+            if entry["status"] == "done":
+                synced[code] = started.isoformat()
+        self._save(synced)
+        return results
+
+    def _invalidate(self, codes: List[str]) -> None:
+        """Evict the cached responses of the tables `codes`."""
+        client = self.downloader.client
+        caches = [client.data.response_cache, client.disk_cache]
+        caches = [cache for cache in caches if cache is not None]
+        if not caches:
+            return
+        removed = sum(cache.invalidate(code) for code in codes for cache in caches)
+        logger.debug(f"Invalidated {removed} cached responses of changed tables")
+
+    def _modified(self, since: date) -> Optional[Set[tuple]]:
+        """Codes and dates of the objects modified since `since`.
+
+        Returns:
+            `(code, date)` of every modified object, the date being `None` if
+            it is not listed. `None` if the listing may be incomplete.
+        """
+        response = self.downloader.client.catalogue.modifieddata(
+            type="all",
+            date=since.strftime("%d.%m.%Y"),
+            pagelength=str(self.pagelength),
+        )
+        items = response[JsonKeys.CONTENT] or []
+        if len(items) >= self.pagelength:
+            logger.warning(
+                f"Received {len(items)} modified objects, the listing may be "
+                "incomplete. Downloading all tables."
+            )
+            return None
+        return {(item[JsonKeys.CODE], _parse_date(item.get("Date"))) for item in items}
+
+    def _save(self, synced: Dict[str, str]) -> None:
+        """Replace the state file atomically."""
+        directory = self.downloader.directory
+        fd, temp = tempfile.mkstemp(dir=directory, prefix=f".{STATE}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(synced, f, indent=1, sort_keys=True)
+            os.replace(temp, self.state)
+        except BaseException:
+            os.remove(temp)
+            raise
@@ -0,0 +1,274 @@
+import asyncio
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from genesisonline import exceptions
+from genesisonline.aio import (
+    AsyncGenesisOnline,
+    AsyncCatalogueService,
+    AsyncDataService,
+    AsyncFindService,
+    AsyncSession,
+)
+from genesisonline.constants import JsonKeys, ResponseStatus
+from genesisonline.jobs import PollingPolicy
+from ..conftest import (
+    TEST_DIR,
+    assert_match_found,
+    assert_valid_json_structure,
+    delete_dir,
+)
+
+
+def envelope(method, status=0, content="successfull", **extra):
+    return {
+        "Ident": {"Service": method.split("/")[0], "Method": method.split("/")[1]},
+        "Status": {"Code": status, "Content": content, "Type": "information"},
+        "Parameter": {
+            "name": "",
+            "selection": "",
+            "area": "",
+            "job": "",
+            "language": "en",
+        },
+        "Copyright": "© Federal Statistical Office, Wiesbaden 2023",
+        **extra,
+    }
+
+
+def run_with_server(routes, scenario):
+    """Run `scenario(base_url, calls)` against a local stand-in server."""
+    calls = list()
+
+    def handler(response):
+        async def handle(request):
+            calls.append(request)
+            if callable(response):  # respond depending on the request
+                return response(request)
+            if isinstance(response, list):  # respond in sequence
+                return response.pop(0) if len(response) > 1 else response[0]
+            return response
+
+        return handle
+
+    async def main():
+        app = web.Application()
+        for path, response in routes.items():
+            app.router.add_get(f"/{path}", handler(response))
+        async with TestServer(app) as server:
+            return await scenario(str(server.make_url("/")), calls)
+
+    return asyncio.run(main())
+
+
+def test_catalogue(session):
+    routes = {
+        "catalogue/tables": web.json_response(
+            envelope("catalogue/tables", List=[{"Code": "12411-0001"}])
+        )
+    }
+
+    async def scenario(base_url, calls):
+        service = AsyncCatalogueService(AsyncSession(session.params))
+        service._BASE_URL = base_url
+        response = await service.tables(selection="124*")
+        await service._session.close()
+        return response, calls
+
+    response, calls = run_with_server(routes, scenario)
+
+    assert_valid_json_structure(response)
+    assert_match_found(response)
+    assert response[JsonKeys.CONTENT] == [{"Code": "12411-0001"}]
+    assert calls[0].query["selection"] == "124*"
+    assert "area" not in calls[0].query
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_catalogue_iter(session, max_workers):
+    codes = ["12411-0001", "12411-0002", "12411-0003", "12421-0001"]
+
+    def listing(request):
+        prefix = request.query["selection"].rstrip("*")
+        pagelength = int(request.query["pagelength"])
+        listed = [{"Code": code} for code in codes if code.startswith(prefix)]
+        parameter = {"selection": "", "area": "", "pagelength": "", "language": "en"}
+        return web.json_response(
+            envelope("catalogue/tables", List=listed[:pagelength], Parameter=parameter)
+        )
+
+    async def scenario(base_url, calls):
+        service = AsyncCatalogueService(AsyncSession(session.params))
+        service._BASE_URL = base_url
+        objects = [
+            obj
+            async for obj in service.iter_tables(
+                selection="124*", pagelength=3, max_workers=max_workers
+            )
+        ]
+        await service._session.close()
+        return objects, calls
+
+    objects, calls = run_with_server({"catalogue/tables": listing}, scenario)
+
+    assert sorted(obj["Code"] for obj in objects) == codes
+    assert len(calls) > 1  # the full page was split
+
+
+def test_find_offline(session):
+    class Mirror:
+        def find(self, term, category=None, language="en", pagelength=100):
+            return {"Content": {"Tables": [{"Code": "12411-0001"}]}}
+
+    async def scenario():
+        service = AsyncFindService(AsyncSession(session.params), mirror=Mirror())
+        response = await service.find("population", offline=True)
+        await service._session.close()
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert response["Content"]["Tables"] == [{"Code": "12411-0001"}]
+
+
+def test_data_csv(session):
+    def table(request):
+        if request.query.get("name"):
+            return web.Response(text="a;b\n1;2\n", content_type="text/csv")
+        return web.json_response(envelope("data/table", Object=None))
+
+    routes = {"data/table": table}
+
+    async def scenario(base_url, calls):
+        service = AsyncDataService(AsyncSession(session.params))
+        service._BASE_URL = base_url
+        await service.table(name="12411-0001")
+        response = await service.table(name="12411-0002")
+        await service._session.close()
+        return response, calls
+
+    response, calls = run_with_server(routes, scenario)
+
+    # the envelope is requested once, then each table costs a single request
+    assert len(calls) == 3
+    assert response[JsonKeys.PARAMETER]["name"] == "12411-0002"
+    assert_valid_json_structure(response)
+    assert response[JsonKeys.CONTENT] == "a;b\n1;2\n"
+
+
+def test_data_batch_job(session):
+    routes = {
+        "data/table": web.json_response(
+            envelope(
+                "data/table",
+                status=99,
+                content="The table will be generated: 51000-0013_1",
+                Object=None,
+            )
+        ),
+        "data/result": [
+            web.json_response(envelope("data/result", status=104, Object=None)),
+            web.json_response(envelope("data/result", Object={"Content": "a;b"})),
+        ],
+    }
+
+    async def scenario(base_url, calls):
+        service = AsyncDataService(
+            AsyncSession(session.params),
+            polling_policy=PollingPolicy(initial=0.01, maximum=0.01),
+        )
+        service._BASE_URL = base_url
+        response = await service.table(name="51000-0013")
+        await service._session.close()
+        return response, calls
+
+    response, calls = run_with_server(routes, scenario)
+
+    assert len(calls) == 3
+    assert response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.MATCH
+    assert response[JsonKeys.CONTENT] == "a;b"
+
+
+def test_data_batch_job_future(session):
+    routes = {
+        "data/table": web.json_response(
+            envelope(
+                "data/table",
+                status=99,
+                content="The table will be generated: 51000-0014_1",
+                Object=None,
+            )
+        ),
+        "data/result": [
+            web.json_response(envelope("data/result", status=104, Object=None)),
+            web.json_response(envelope("data/result", Object={"Content": "a;b"})),
+        ],
+    }
+
+    async def scenario(base_url, calls):
+        service = AsyncDataService(
+            AsyncSession(session.params),
+            polling_policy=PollingPolicy(initial=0.01, maximum=0.01),
+        )
+        service._BASE_URL = base_url
+        future = await service.table(wait_for_result=False, name="51000-0014")
+        done_before = future.done()
+        response = await future
+        await service._session.close()
+        return done_before, response
+
+    done_before, response = run_with_server(routes, scenario)
+
+    assert not done_before
+    assert response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.MATCH
+    assert response[JsonKeys.CONTENT] == "a;b"
+
+
+def test_http_error(session):
+    routes = {"catalogue/tables": web.Response(status=500)}
+
+    async def scenario(base_url, calls):
+        service = AsyncCatalogueService(AsyncSession(session.params))
+        service._BASE_URL = base_url
+        try:
+            await service.tables()
+        finally:
+            await service._session.close()
+
+    with pytest.raises(exceptions.HTTPError):
+        run_with_server(routes, scenario)
+
+
+def test_bounded_concurrency(session):
+    active = {"now": 0, "max": 0}
+
+    async def handle(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return web.json_response(envelope("metadata/variable", Object={"Code": 1}))
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/metadata/variable", handle)
+        async with TestServer(app) as server:
+            async with AsyncGenesisOnline("user", "password", max_connections=3) as go:
+                go.metadata._BASE_URL = str(server.make_url("/"))
+                return await asyncio.gather(
+                    *(go.metadata.variable(name=str(i)) for i in range(20))
+                )
+
+    responses = asyncio.run(main())
+
+    assert len(responses) == 20
+    assert active["max"] <= 3
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cleanup_after_tests():
+    yield
+    delete_dir(TEST_DIR)
@@ -1,8 +1,11 @@
 import os
+import threading
+import time
 import pytest
 import configparser
 import vcr
 import requests
+from concurrent.futures import Future
 from pathlib import Path
 from genesisonline.constants import JsonKeys, ResponseStatus, PACKAGE_NAME
 
@@ -99,3 +102,70 @@ def delete_dir(directory: Path) -> None:
     for file in directory.iterdir():
         file.unlink()
     directory.rmdir()
+
+
+def table_response(code, content=None):
+    return {"Status": {"Code": 0}, "Content": content or f"table;{code}\n"}
+
+
+class FakeData:
+    """Stand-in for `DataService` serving tables as finished futures."""
+
+    def __init__(self):
+        self.requested = []
+        self.params = []
+        self.jobs = {}
+        self.failing = set()
+        self.missing = set()
+        self.delay = 0
+        self.response_cache = None
+        self._lock = threading.Lock()
+
+    def table(self, wait_for_result=True, name=None, **api_params):
+        with self._lock:
+            self.requested.append(name)
+            self.params.append(api_params)
+        time.sleep(self.delay)
+        if name in self.failing:
+            raise RuntimeError(f"{name} failed")
+        future = Future()
+        if name in self.jobs:
+            # a batch job, finished later by the test
+            self.jobs[name] = future
+        elif name in self.missing:
+            status = {"Code": 104, "Content": "There are no objects"}
+            future.set_result({"Status": status, "Content": None})
+        else:
+            future.set_result(table_response(name))
+        return future
+
+
+class FakeCatalogue:
+    """Stand-in for `CatalogueService` listing a few tables."""
+
+    def iter_tables(self, selection=None, area=None):
+        self.selection = selection
+        codes = ["12411-0001", "12411-0015", "12411-9999", "61111-0001"]
+        prefix = selection.rstrip("*")
+        return iter([{"Code": c} for c in codes if c.startswith(prefix)])
+
+
+class FakeClient:
+    """Stand-in for `GenesisOnline` used by `Downloader` and `TableSync`."""
+
+    def __init__(self):
+        self.data = FakeData()
+        self.catalogue = FakeCatalogue()
+        self.disk_cache = None
+
+
+class ModifiedCatalogue(FakeCatalogue):
+    """`FakeCatalogue` listing the `(code, date)` pairs in `modified`."""
+
+    def __init__(self):
+        self.modified = []
+        self.requests = []
+
+    def modifieddata(self, **params):
+        self.requests.append(params)
+        return {"Content": [{"Code": code, "Date": day} for code, day in self.modified]}
@@ -0,0 +1,62 @@
+import shutil
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from genesisonline import exceptions
+from genesisonline.filemanager import FileManager
+from genesisonline.parsers import FlatTable, parse_cube, parse_ffcsv
+from .test_cube import CUBE
+from .test_ffcsv import FFCSV
+from ..conftest import TEST_DIR
+
+
+@pytest.fixture
+def file_manager():
+    return FileManager(TEST_DIR / "columnar")
+
+
+def test_save_and_load_table(file_manager):
+    table = parse_ffcsv(FFCSV)
+    file_manager.save(table, "12411-0001.columns")
+    loaded = file_manager.load("12411-0001.columns")
+
+    assert isinstance(loaded, FlatTable)
+    assert loaded.columns == table.columns
+    assert isinstance(loaded["value"], np.memmap)
+    np.testing.assert_array_equal(loaded["value"], table["value"])
+    assert list(loaded["time"].decode()) == list(table["time"].decode())
+    assert list(loaded["value_q"].decode()) == ["e", "", "", "p"]
+
+
+def test_save_and_load_cube(file_manager):
+    cube = parse_cube(CUBE)
+    file_manager.save(cube, "12411BJ002.columns")
+    loaded = file_manager.load("12411BJ002.columns")
+
+    assert loaded.name == cube.name
+    assert loaded.axes == cube.axes
+    assert loaded.metadata == cube.metadata
+    np.testing.assert_array_equal(loaded.coords, cube.coords)
+    np.testing.assert_array_equal(loaded.to_dense(), cube.to_dense())
+
+
+def test_overwrite(file_manager):
+    file_manager.save(parse_ffcsv(FFCSV), "table.columns")
+    file_manager.save(parse_ffcsv(FFCSV.splitlines()[:2]), "table.columns")
+
+    assert len(file_manager.load("table.columns")) == 1
+    assert not list(file_manager.directory.glob("*.tmp"))
+
+
+def test_save_value_error(file_manager):
+    with pytest.raises(exceptions.ValueError):
+        file_manager.save({"test": "test"}, "file.columns")
+
+    assert not list(file_manager.directory.glob("*.tmp"))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cleanup_after_tests():
+    yield
+    shutil.rmtree(TEST_DIR / "columnar")
@@ -0,0 +1,75 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from genesisonline import exceptions
+from genesisonline.constants import JsonKeys
+from genesisonline.parsers import parse_cube
+
+CUBE = """K;DQ;FACH-SCHL;GHH-ART;GHM-WERTE-JN;GENESIS-VBD;REGIOSTAT;NAME-ERSETZT
+D;12411BJ002;;N;N;N;N
+K;DQ-ERH;FACH-SCHL
+D;12411
+K;DQA;NAME;RHF-BSR;RHF-ACHSE
+D;DLAND;1;1
+D;GES;2;2
+K;DQZ;NAME;ZI-RHF-BSR;ZI-RHF-ACHSE
+D;STAG;3;3
+K;DQI;NAME;ME-NAME;DST;TYP;NKM-STELLEN;GHH-ART;GHM-WERTE-JN
+D;BEVSTD;ANZAHL;FEST;PROZENT;0;;N
+K;QEI;FACH-SCHL;ZI-WERT;WERT;QUALITAET;GESPERRT;WERT-VERFAELSCHT
+D;01;GESM;31.12.2021;1442064;e;;0.0
+D;01;GESW;31.12.2021;1480849;e;;0.0
+D;02;GESM;31.12.2021;900000;e;;0.0
+D;01;GESM;31.12.2022;1450000,5;p;;0.0
+D;02;GESW;31.12.2022;.;;;0.0
+"""
+
+
+def test_parse_cube():
+    cube = parse_cube(CUBE)
+
+    assert cube.name == "12411BJ002"
+    assert cube.axes == ["DLAND", "GES", "STAG"]
+    assert cube.shape == (2, 2, 2)
+    assert len(cube) == 5
+    assert list(cube.index["STAG"]) == ["31.12.2021", "31.12.2022"]
+    assert cube.metadata["DQI"][0]["ME-NAME"] == "ANZAHL"
+    np.testing.assert_array_equal(
+        cube.values["BEVSTD"], [1442064, 1480849, 900000, 1450000.5, np.nan]
+    )
+    assert list(cube.quality["BEVSTD"].decode()) == ["e", "e", "e", "p", ""]
+
+
+def test_parse_cube_dense():
+    dense = parse_cube(CUBE).to_dense()
+
+    assert dense.shape == (2, 2, 2)
+    assert dense[0, 1, 0] == 1480849
+    assert dense[1, 0, 0] == 900000
+    assert np.isnan(dense[1, 0, 1])  # not listed
+    assert np.isnan(dense[1, 1, 1])  # secret
+
+
+def test_parse_cube_blocks_and_lines():
+    cube = parse_cube(iter(CUBE.splitlines()), block_size=2)
+    expected = parse_cube(CUBE)
+
+    np.testing.assert_array_equal(cube.coords, expected.coords)
+    np.testing.assert_array_equal(cube.values["BEVSTD"], expected.values["BEVSTD"])
+
+
+def test_parse_cube_multiple_contents():
+    content = CUBE.replace(
+        "D;BEVSTD;ANZAHL;FEST;PROZENT;0;;N\n",
+        "D;BEVSTD;ANZAHL;FEST;PROZENT;0;;N\nD;BEV002;ANZAHL;FEST;PROZENT;0;;N\n",
+    ).replace(";0.0\n", ";0.0;7;;;0.0\n")
+    cube = parse_cube({JsonKeys.CONTENT: content})
+
+    assert list(cube.values) == ["BEVSTD", "BEV002"]
+    np.testing.assert_array_equal(cube.values["BEV002"], [7] * 5)
+
+
+def test_parse_cube_without_cells():
+    with pytest.raises(exceptions.ValueError):
+        parse_cube(CUBE.split("K;QEI")[0])
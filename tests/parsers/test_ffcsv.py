@@ -0,0 +1,80 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from genesisonline import exceptions
+from genesisonline.constants import JsonKeys
+from genesisonline.parsers import parse_ffcsv
+
+FFCSV = (
+    "﻿statistics_code;time_code;time;1_variable_code;"
+    "1_variable_attribute_code;1_variable_attribute_label;value;value_q\n"
+    "12411;JAHR;2020;GES;GESM;male;40,5;e\n"
+    "12411;JAHR;2020;GES;GESW;female;42;\n"
+    "12411;JAHR;2021;GES;GESM;male;.;\n"
+    "12411;JAHR;2021;GES;GESW;female;-;p\n"
+)
+
+
+def test_parse_ffcsv():
+    table = parse_ffcsv(FFCSV)
+
+    assert len(table) == 4
+    assert table.columns[0] == "statistics_code"
+    assert list(table.values) == ["value"]
+    assert list(table.quality) == ["value_q"]
+    np.testing.assert_array_equal(table["value"], [40.5, 42, np.nan, np.nan])
+    assert list(table["value_q"].decode()) == ["e", "", "", "p"]
+
+
+def test_parse_ffcsv_categoricals():
+    table = parse_ffcsv(FFCSV)
+    time = table.dimensions["time"]
+
+    assert list(time.categories) == ["2020", "2021"]
+    assert list(time.codes) == [0, 0, 1, 1]
+    assert time.codes.dtype == np.int32
+
+
+def test_parse_ffcsv_blocks_and_lines():
+    lines = iter(FFCSV.splitlines())
+    table = parse_ffcsv(lines, block_size=1)
+    expected = parse_ffcsv(FFCSV)
+
+    for name in table.columns:
+        column, other = table[name], expected[name]
+        if isinstance(column, np.ndarray):
+            np.testing.assert_array_equal(column, other)
+        else:
+            assert list(column.decode()) == list(other.decode())
+
+
+def test_parse_ffcsv_response():
+    response = {JsonKeys.CONTENT: FFCSV}
+
+    assert len(parse_ffcsv(response)) == 4
+
+
+def test_parse_ffcsv_quoted_fields():
+    content = 'code;label;value\n1;"a;b";1.5\n2;c;2\n'
+    table = parse_ffcsv(content)
+
+    assert list(table["label"].decode()) == ["a;b", "c"]
+    np.testing.assert_array_equal(table["value"], [1.5, 2])
+
+
+def test_parse_ffcsv_named_value_columns():
+    content = "time;BEV001__Population__number;BEV001__q\n2020;83;e\n"
+    table = parse_ffcsv(content)
+
+    assert list(table.values) == ["BEV001__Population__number"]
+    assert list(table.quality) == ["BEV001__q"]
+
+
+def test_parse_ffcsv_malformed():
+    with pytest.raises(exceptions.ValueError):
+        parse_ffcsv("a;b\n1;2;3\n")
+
+
+def test_parse_ffcsv_empty():
+    assert len(parse_ffcsv("")) == 0
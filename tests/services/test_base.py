@@ -1,8 +1,12 @@
 import re
+import time
 import pytest
 import requests
 import responses
 from genesisonline.services import BaseService
+from genesisonline.cache import DiskCache, ResponseCache
+from genesisonline.ratelimit import RateLimiter
+from genesisonline.retry import RetryPolicy
 from genesisonline import exceptions
 from genesisonline.constants import Endpoints, BASE_URL
 from urllib.parse import urljoin
@@ -28,6 +32,21 @@ def service(session):
     return ConcreteBaseService(session)
 
 
+@pytest.fixture
+def cached_service(session):
+    class ConcreteBaseService(BaseService):
+        """Dummy implementation of abstract class `BaseService` for unit testing"""
+
+        _service = ""
+        endpoints = list()
+        _uncached_endpoints = ("uncached_endpoint",)
+
+        def _request(self) -> dict:
+            return super()._request()
+
+    return ConcreteBaseService(session, ResponseCache(maxsize=8, ttl=60))
+
+
 @pytest.fixture
 def dummy_endpoint(session):
     """Dummy endpoint without parameters.
@@ -91,3 +110,227 @@ def test_request_unexpected_content_error(service, dummy_endpoint):
 
     with pytest.raises(exceptions.UnexpectedContentError):
         response = service.request("dummy_endpoint")
+
+
+@responses.activate
+def test_request_cached(cached_service, dummy_endpoint):
+    responses.add(
+        responses.GET,
+        dummy_endpoint,
+        json={"Status": {"Code": 0}, "Parameter": {"name": "", "area": ""}},
+    )
+    first = cached_service.request("dummy_endpoint", name="a", area="all")
+    second = cached_service.request("dummy_endpoint", area="all", name="a")
+
+    assert first == second
+    assert len(responses.calls) == 1
+    assert cached_service.response_cache.stats["hits"] == 1
+
+
+@responses.activate
+def test_request_cache_key_without_credentials(cached_service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    cached_service.request("dummy_endpoint")
+    cached_service._session.params["password"] = "new_password"
+    cached_service.request("dummy_endpoint")
+
+    assert len(responses.calls) == 1
+    for key in cached_service.response_cache._entries:
+        assert "new_password" not in str(key)
+
+
+@responses.activate
+def test_request_uncached_endpoint(cached_service):
+    url = re.compile(rf"{urljoin(BASE_URL, 'uncached_endpoint')}*")
+    responses.add(responses.GET, url, json={"Status": {"Code": 0}})
+    cached_service.request("uncached_endpoint")
+    cached_service.request("uncached_endpoint")
+
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_request_background_job_not_cached(cached_service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 99}})
+    cached_service.request("dummy_endpoint")
+    cached_service.request("dummy_endpoint")
+
+    assert len(responses.calls) == 2
+
+
+@pytest.fixture
+def disk_cached_service(session, tmp_path):
+    class ConcreteBaseService(BaseService):
+        """Dummy implementation of abstract class `BaseService` for unit testing"""
+
+        _service = ""
+        endpoints = list()
+
+        def _request(self) -> dict:
+            return super()._request()
+
+    return ConcreteBaseService(session, disk_cache=DiskCache(tmp_path, ttl=60))
+
+
+@responses.activate
+def test_request_disk_cached(disk_cached_service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    first = disk_cached_service.request("dummy_endpoint")
+    second = disk_cached_service.request("dummy_endpoint")
+
+    assert first == second
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_request_disk_cache_revalidation(disk_cached_service, dummy_endpoint):
+    disk_cached_service.disk_cache.ttl = 0
+    responses.add(
+        responses.GET,
+        dummy_endpoint,
+        json={"Status": {"Code": 0}},
+        headers={"ETag": '"v1"'},
+    )
+    responses.add(responses.GET, dummy_endpoint, status=304)
+    first = disk_cached_service.request("dummy_endpoint")
+    second = disk_cached_service.request("dummy_endpoint")
+
+    assert first == second
+    assert len(responses.calls) == 2
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert disk_cached_service.disk_cache.stats["revalidations"] == 1
+
+
+@responses.activate
+def test_request_disk_cache_stale_while_revalidate(disk_cached_service, dummy_endpoint):
+    disk_cached_service.disk_cache.ttl = 0
+    disk_cached_service.disk_cache.stale_while_revalidate = 60
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 22}})
+    disk_cached_service.request("dummy_endpoint")
+    stale = disk_cached_service.request("dummy_endpoint")
+
+    assert stale == {"Status": {"Code": 0}}
+    for _ in range(100):  # wait for background refresh
+        if not disk_cached_service.disk_cache._refreshing:
+            break
+        time.sleep(0.01)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_request_rate_limiter_throttled(session, dummy_endpoint):
+    class ConcreteBaseService(BaseService):
+        """Dummy implementation of abstract class `BaseService` for unit testing"""
+
+        _service = ""
+        endpoints = list()
+
+        def _request(self) -> dict:
+            return super()._request()
+
+    limiter = RateLimiter(rate=100, burst=10)
+    service = ConcreteBaseService(session, rate_limiter=limiter)
+    responses.add(responses.GET, dummy_endpoint, status=429)
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    with pytest.raises(exceptions.HTTPError):
+        service.request("dummy_endpoint")
+    assert limiter.current_rate == 50
+
+    service.request("dummy_endpoint")
+    assert limiter.current_rate > 50
+
+
+@pytest.fixture
+def retrying_service(session):
+    class ConcreteBaseService(BaseService):
+        """Dummy implementation of abstract class `BaseService` for unit testing"""
+
+        _service = ""
+        endpoints = list()
+
+        def _request(self) -> dict:
+            return super()._request()
+
+    policy = RetryPolicy(total=2, backoff_factor=0.001)
+    return ConcreteBaseService(session, retry_policy=policy)
+
+
+@responses.activate
+def test_request_retried(retrying_service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, status=503)
+    responses.add(
+        responses.GET, dummy_endpoint, body=requests.exceptions.ConnectionError()
+    )
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    response = retrying_service.request("dummy_endpoint")
+
+    assert response == {"Status": {"Code": 0}}
+    assert len(responses.calls) == 3
+    assert retrying_service.retry_policy.stats["retries"] == 2
+
+
+@responses.activate
+def test_failed_attempt_closed(retrying_service, dummy_endpoint, monkeypatch):
+    closed = []
+    close = requests.Response.close
+    monkeypatch.setattr(
+        requests.Response,
+        "close",
+        lambda response: closed.append(response.status_code) or close(response),
+    )
+    responses.add(responses.GET, dummy_endpoint, status=503)
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    retrying_service.request("dummy_endpoint")
+
+    assert closed[0] == 503
+
+
+@responses.activate
+def test_request_retries_exhausted(retrying_service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, status=500)
+    with pytest.raises(exceptions.HTTPError):
+        retrying_service.request("dummy_endpoint")
+
+    assert len(responses.calls) == 3
+    assert retrying_service.retry_policy.stats["exhausted"] == 1
+
+
+@responses.activate
+def test_request_client_error_not_retried(retrying_service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, status=404)
+    with pytest.raises(exceptions.HTTPError):
+        retrying_service.request("dummy_endpoint")
+
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_request_stream_lines(cached_service, dummy_endpoint):
+    body = "a;b\r\n1;2\r\n3;4\n"
+    responses.add(responses.GET, dummy_endpoint, body=body, content_type="text/csv")
+    cached_service._chunk_size = 4  # split "\r\n" between chunks
+    lines = cached_service.request("dummy_endpoint", stream=True)
+
+    assert not isinstance(lines, str)
+    assert list(lines) == ["a;b", "1;2", "3;4"]
+    assert len(cached_service.response_cache) == 0
+
+
+@responses.activate
+def test_request_stream_bytes(service, dummy_endpoint):
+    responses.add(
+        responses.GET, dummy_endpoint, body=b"\x89PNG1234", content_type="image/png"
+    )
+    service._chunk_size = 3
+    chunks = list(service.request("dummy_endpoint", stream="bytes"))
+
+    assert chunks == [b"\x89PN", b"G12", b"34"]
+
+
+@responses.activate
+def test_request_stream_json(service, dummy_endpoint):
+    responses.add(responses.GET, dummy_endpoint, json={"Status": {"Code": 0}})
+    response = service.request("dummy_endpoint", stream=True)
+
+    assert response == {"Status": {"Code": 0}}
@@ -1,5 +1,10 @@
+import json
 import pytest
+import re
+import responses
 import warnings
+from urllib.parse import urljoin
+from genesisonline.constants import BASE_URL, Endpoints
 from genesisonline.services import CatalogueService
 from genesisonline.exceptions import UnexpectedParameterWarning
 from ..conftest import (
@@ -22,6 +27,33 @@ def test_endpoints(service):
     assert len(service.endpoints) == 20
 
 
+@responses.activate
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_tables(service, max_workers):
+    def listing(request):
+        selection = request.params["selection"]
+        codes = {"12*": ["12411-0001", "12411-0002"], "120*": [], "121*": []}
+        objects = [{"Code": code} for code in codes.get(selection, [])]
+        if selection == "124*":
+            objects = [{"Code": "12411-0002"}, {"Code": "12411-0003"}]
+        body = {"Parameter": dict(request.params), "List": objects, "Copyright": ""}
+        return 200, {}, json.dumps(body)
+
+    url = re.compile(rf"{urljoin(BASE_URL, Endpoints.CATALOGUE_TABLES)}.*")
+    responses.add_callback(
+        responses.GET, url, callback=listing, content_type="application/json"
+    )
+
+    tables = service.iter_tables(
+        selection="12*", area="all", pagelength=2, max_workers=max_workers
+    )
+    codes = [table["Code"] for table in tables]
+
+    assert sorted(codes) == ["12411-0001", "12411-0002", "12411-0003"]
+    assert responses.calls[0].request.params["area"] == "all"
+    assert responses.calls[0].request.params["pagelength"] == "2"
+
+
 @api_vcr.use_cassette(cassette_library_dir=cassette_subdir)
 def test_cubes(service):
     api_params = {"selection": "124*", "area": "all", "pagelength": "1"}
@@ -1,9 +1,19 @@
+import re
+import json
 import pytest
 import warnings
-import time
+import responses
+from urllib.parse import urljoin
 from genesisonline.services import DataService
+from genesisonline.jobs import PollingPolicy
 from genesisonline.services.base import UnexpectedParameterWarning
-from genesisonline.constants import JsonKeys, ResponseStatus
+from genesisonline.constants import (
+    BASE_URL,
+    Endpoints,
+    JsonKeys,
+    JsonStrings,
+    ResponseStatus,
+)
 from ..conftest import (
     TEST_DIR,
     api_vcr,
@@ -49,6 +59,176 @@ def test_chart2table(service):
     assert_match_found(response)
 
 
+def envelope(endpoint, status="Table successfully created", **parameter):
+    """Json response of `endpoint` to an empty name, without an object."""
+    return {
+        JsonKeys.IDENT: {"Service": "data", JsonKeys.METHOD: endpoint.split("/")[-1]},
+        JsonKeys.STATUS: {JsonKeys.CODE: 0, JsonKeys.CONTENT: status, "Type": ""},
+        JsonKeys.PARAMETER: {"name": "", "area": "all", "language": "en", **parameter},
+        JsonKeys.OBJECT: None,
+        JsonKeys.COPYRIGHT: "",
+    }
+
+
+def add_download(endpoint, body, content_type, **envelope_kwargs):
+    """Serve the envelope for an empty name and `body` otherwise."""
+
+    def callback(request):
+        if request.params.get("name"):
+            return 200, {"Content-Type": content_type}, body
+        headers = {"Content-Type": "application/json"}
+        return 200, headers, json.dumps(envelope(endpoint, **envelope_kwargs))
+
+    url = re.compile(rf"{urljoin(BASE_URL, endpoint)}.*")
+    responses.add_callback(responses.GET, url, callback=callback)
+
+
+@responses.activate
+@pytest.mark.parametrize(
+    "endpoint, body, content_type",
+    [
+        (Endpoints.DATA_CHART2TABLE, b"\x89PNG\r\n", "image/png"),
+        (Endpoints.DATA_MAP2TABLE, b"\x89PNG\r\n", "image/png"),
+        (Endpoints.DATA_TABLE, "a;b\n1;2\n", "text/csv"),
+    ],
+)
+def test_non_json_response_cached_envelope(service, endpoint, body, content_type):
+    add_download(endpoint, body, content_type)
+
+    response = service._request(endpoint, name="12411-0001")
+    assert len(responses.calls) == 2
+    response = service._request(endpoint, name="12411-0002")
+    assert len(responses.calls) == 3
+
+    assert_valid_json_structure(response)
+    assert_match_found(response)
+    assert response[JsonKeys.CONTENT] == body
+    assert response[JsonKeys.PARAMETER]["name"] == "12411-0002"
+    assert response[JsonKeys.IDENT][JsonKeys.METHOD] == endpoint.split("/")[-1]
+
+
+@responses.activate
+def test_non_json_envelope_cached_per_language(service):
+    add_download(Endpoints.DATA_TABLE, "a;b\n", "text/csv")
+
+    service._request(Endpoints.DATA_TABLE, name="12411-0001", area="all")
+    response = service._request(Endpoints.DATA_TABLE, name="12411-0001", area="public")
+    assert len(responses.calls) == 3
+    assert response[JsonKeys.PARAMETER]["area"] == "public"
+
+    service._request(Endpoints.DATA_TABLE, name="12411-0001", language="de")
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_non_json_response_keeps_partly_match(service):
+    status = "Table successfully created (startyear adjusted to 1995)"
+    add_download(Endpoints.DATA_TABLE, "a;b\n", "text/csv", status=status)
+
+    response = service._request(Endpoints.DATA_TABLE, name="12411-0001")
+
+    assert response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.PARTLY_MATCH
+    assert response[JsonKeys.STATUS][JsonKeys.CONTENT] == "startyear adjusted to 1995"
+
+
+@responses.activate
+def test_non_json_response_params_misspelled(service):
+    add_download(Endpoints.DATA_TABLE, "a;b\n", "text/csv")
+    service._request(Endpoints.DATA_TABLE, name="12411-0001", area="all")
+
+    with pytest.warns(UnexpectedParameterWarning):
+        service._request(Endpoints.DATA_TABLE, name="12411-0001", areaXYZ="all")
+
+
+@responses.activate
+def test_non_json_response_unknown_language(service):
+    add_download(Endpoints.DATA_TABLE, "a;b\n", "text/csv", language="fr")
+
+    response = service._request(Endpoints.DATA_TABLE, name="12411-0001", language="fr")
+
+    assert response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.MATCH
+    assert response[JsonKeys.STATUS][JsonKeys.CONTENT] == JsonStrings.SUCCESS["en"]
+
+
+@responses.activate
+def test_cube_streamed(service):
+    add_download(Endpoints.DATA_CUBE, "K;a\nD;b\n", "text/csv")
+
+    response = service.cube(name="12411BJ001", stream=True)
+
+    assert_valid_json_structure(response)
+    assert "stream" not in response[JsonKeys.PARAMETER]
+    assert list(response[JsonKeys.CONTENT]) == ["K;a", "D;b"]
+
+
+def test_save_compressed(session):
+    service = DataService(session, compression="gz")
+    response = {
+        "Ident": {"Service": "data", "Method": "table"},
+        "Parameter": {"name": "51000-0013", "password": "********************"},
+        "Content": "a;b",
+    }
+    service.save(response, "51000-0013_1")
+
+    assert (service.filemanager.directory / "51000-0013_1.json.gz").exists()
+    assert service.load("51000-0013_1") == response
+    entry = service.filemanager.index.get("51000-0013_1.json.gz")
+    assert entry["endpoint"] == "data/table"
+    assert entry["params"] == {"name": "51000-0013"}
+    assert service.invalidate("51000-0013") == 1
+    assert service.filemanager.index.get("51000-0013_1.json.gz") is None
+
+
+def test_pending_jobs_not_evicted(session, tmp_path, monkeypatch):
+    service = DataService(session, cache=tmp_path, max_bytes=2500)
+    response = {"Ident": {"Service": "data", "Method": "table"}, "Content": "x" * 1000}
+    service.save(response, "51000-0013_1")
+    service.save(response, "51000-0013_2")
+    monkeypatch.setattr(service.poller, "pending", lambda: ["51000-0013_1"])
+
+    service.save(response, "51000-0013_3")
+
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == [
+        "51000-0013_1.json",
+        "51000-0013_3.json",
+    ]
+
+
+def test_clear_keeps_pending_and_foreign_files(session, tmp_path, monkeypatch):
+    service = DataService(session, cache=tmp_path)
+    response = {"Ident": {"Service": "data", "Method": "table"}, "Content": "a;b"}
+    for result_id in ("51000-0013_1", "51000-0013_2", "61111-0001_1"):
+        service.save(response, result_id)
+    (tmp_path / "other.json").write_text("{}")
+    monkeypatch.setattr(service.poller, "pending", lambda: ["51000-0013_1"])
+
+    assert service.invalidate("51000-0013") == 1
+    service.clear()
+
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == [
+        "51000-0013_1.json",
+        "other.json",
+    ]
+
+
+@responses.activate
+def test_job_states_single_listing(service):
+    url = re.compile(rf"{urljoin(BASE_URL, Endpoints.CATALOGUE_JOBS)}.*")
+    listing = [
+        {"Code": "51000-0013_1", "State": "finished"},
+        {"Code": "51000-0013_2", "State": "running"},
+        {"Code": "51000-0013_9", "State": "finished"},
+    ]
+    parameter = {"selection": "", "pagelength": "", "language": "en"}
+    responses.add(responses.GET, url, json={"Parameter": parameter, "List": listing})
+
+    states = service._job_states(["51000-0013_1", "51000-0013_2", "51000-0013_3"])
+
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.params["selection"] == "51000-0013_*"
+    assert states == {"51000-0013_1": "finished", "51000-0013_2": "running"}
+
+
 @api_vcr.use_cassette(cassette_library_dir=cassette_subdir)
 def test_chart2timeseries(service):
     api_params = {"name": "11111LJ001"}
@@ -140,8 +320,8 @@ def test_table_small_not_found(service):
 
 @api_vcr.use_cassette(cassette_library_dir=cassette_subdir)
 def test_table_large_foreground(service):
-    # reduce timeout to avoid RemoteDisconnectd error during testing
-    service._timeout = 10
+    # cap the delay to avoid RemoteDisconnectd error during testing
+    service.poller.policy = PollingPolicy(maximum=10)
     api_params = {"name": "51000-0013"}
     with warnings.catch_warnings(record=True) as warning_list:
         response = service.table(wait_for_result=True, **api_params)
@@ -155,19 +335,24 @@ def test_table_large_foreground(service):
 def test_table_large_background(service):
     api_params = {"name": "51000-0013"}
     with warnings.catch_warnings(record=True) as warning_list:
-        intermediate_response = service.table(wait_for_result=False, **api_params)
+        future = service.table(wait_for_result=False, **api_params)
+        intermediate_response = service.load(future.result_id)
 
     assert len(warning_list) == 0, f"Unexpected warning raised."
     assert_valid_json_structure(intermediate_response)
     assert_background_task_found(intermediate_response)
 
-    while True:
-        response = service.load(intermediate_response[JsonKeys.CONTENT])
-        if response[JsonKeys.STATUS][JsonKeys.CODE] == ResponseStatus.MATCH:
-            assert_valid_json_structure(response)
-            assert_match_found(response)
-            break
-        time.sleep(30)
+    response = future.result()
+    assert_valid_json_structure(response)
+    assert_match_found(response)
+
+
+@api_vcr.use_cassette("test_table_small", cassette_library_dir=cassette_subdir)
+def test_table_small_future(service):
+    future = service.table(wait_for_result=False, name="51000-0012")
+
+    assert future.done()
+    assert_match_found(future.result())
 
 
 @api_vcr.use_cassette(cassette_library_dir=cassette_subdir)
@@ -0,0 +1,82 @@
+import re
+import json
+import pytest
+import responses
+from urllib.parse import urljoin
+from genesisonline import GenesisOnline, exceptions
+from genesisonline.batch import Batch
+from genesisonline.constants import BASE_URL, JsonKeys
+from .conftest import TEST_DIR, delete_dir
+
+
+@pytest.fixture
+def api_client(credentials):
+    username, password = credentials
+    return GenesisOnline(username, password, language="en")
+
+
+def metadata_response(name):
+    return {
+        "Ident": {"Service": "metadata", "Method": "table"},
+        "Status": {"Code": 0, "Content": "successfull", "Type": "information"},
+        "Parameter": {"name": name, "area": "all", "language": "en"},
+        "Object": {"Code": name},
+        "Copyright": "",
+    }
+
+
+def metadata_callback(request):
+    name = re.search(r"[?&]name=([^&]+)", request.url).group(1)
+    if name == "invalid":
+        return (500, {}, "")
+    body = json.dumps(metadata_response(name))
+    return (200, {"Content-Type": "application/json"}, body)
+
+
+@responses.activate
+def test_batch_results_in_order(api_client):
+    url = re.compile(rf"{urljoin(BASE_URL, 'metadata/table')}.*")
+    responses.add_callback(responses.GET, url, callback=metadata_callback)
+    names = [f"12411-{i:04d}" for i in range(20)]
+    with api_client.batch(max_workers=4) as b:
+        for name in names:
+            b.metadata.table(name=name)
+
+    assert len(b) == 20
+    assert all(r.ok for r in b.results)
+    assert [r.result()[JsonKeys.CONTENT]["Code"] for r in b.results] == names
+
+
+@responses.activate
+def test_batch_errors_per_call(api_client):
+    url = re.compile(rf"{urljoin(BASE_URL, 'metadata/table')}.*")
+    responses.add_callback(responses.GET, url, callback=metadata_callback)
+    with api_client.batch() as b:
+        failed = b.metadata.table(name="invalid")
+        succeeded = b.metadata.table(name="12411-0001")
+
+    assert not failed.ok
+    assert isinstance(failed.error, exceptions.HTTPError)
+    with pytest.raises(exceptions.HTTPError):
+        failed.result()
+    assert succeeded.ok
+
+
+def test_batch_not_executed_on_error(api_client):
+    with pytest.raises(KeyError):
+        with api_client.batch() as b:
+            result = b.metadata.table(name="12411-0001")
+            raise KeyError()
+
+    assert not result.done
+
+
+def test_batch_private_methods_not_queued(api_client):
+    with pytest.raises(AttributeError):
+        Batch(api_client).data._request
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cleanup_after_tests():
+    yield
+    delete_dir(TEST_DIR)
@@ -0,0 +1,107 @@
+import time
+import pytest
+from genesisonline.cache import DiskCache, ResponseCache
+from genesisonline import exceptions
+
+
+def test_get_and_set():
+    cache = ResponseCache(maxsize=2)
+    cache.set("key", {"Content": [1, 2]})
+
+    assert cache.get("key") == {"Content": [1, 2]}
+    assert cache.get("missing") is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_get_returns_copy():
+    cache = ResponseCache()
+    cache.set("key", {"Content": [1, 2]})
+    cache.get("key").pop("Content")
+
+    assert cache.get("key") == {"Content": [1, 2]}
+
+
+def test_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = ResponseCache(ttl=0.01)
+    cache.set("key", 1)
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert cache.stats["evictions"] == 1
+
+
+def test_invalid_maxsize():
+    with pytest.raises(exceptions.ValueError):
+        ResponseCache(maxsize=0)
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return DiskCache(tmp_path, ttl=60, stale_while_revalidate=60)
+
+
+KEY = ("metadata/table", (("language", "en"), ("name", "12411-0001")))
+
+
+def test_disk_cache_persistent(tmp_path, disk_cache):
+    disk_cache.set(KEY, {"Content": 1}, {"ETag": '"abc"'})
+    entry = DiskCache(tmp_path).get(KEY)
+
+    assert entry["content"] == {"Content": 1}
+    assert entry["etag"] == '"abc"'
+    assert DiskCache(tmp_path).validators(entry) == {"If-None-Match": '"abc"'}
+
+
+def test_disk_cache_lookup_states(disk_cache):
+    assert disk_cache.lookup(KEY) == (None, "missing")
+
+    disk_cache.set(KEY, "content")
+    assert disk_cache.lookup(KEY)[1] == "fresh"
+
+    disk_cache.set(KEY, "content", {"Cache-Control": "max-age=0"})
+    time.sleep(0.01)
+    assert disk_cache.lookup(KEY)[1] == "stale"
+
+    disk_cache.stale_while_revalidate = 0
+    assert disk_cache.lookup(KEY)[1] == "expired"
+    assert disk_cache.stats["misses"] == 2
+
+
+def test_disk_cache_no_store(disk_cache):
+    disk_cache.set(KEY, "content", {"Cache-Control": "no-store"})
+
+    assert disk_cache.get(KEY) is None
+
+
+def test_disk_cache_corrupt_entry(disk_cache):
+    disk_cache.set(KEY, "content")
+    disk_cache._path(KEY).write_bytes(b"corrupt")
+
+    assert disk_cache.get(KEY) is None
+
+
+def test_disk_cache_invalidate(disk_cache):
+    listing = ("catalogue/tables", (("selection", "124*"),))
+    other = ("metadata/table", (("name", "61521-0001"),))
+    for key in [KEY, listing, other]:
+        disk_cache.set(key, "content")
+
+    assert disk_cache.invalidate("12411") == 2
+    assert disk_cache.get(KEY) is None
+    assert disk_cache.get(listing) is None
+    assert disk_cache.get(other) is not None
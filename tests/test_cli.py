@@ -0,0 +1,110 @@
+import json
+import pytest
+from genesisonline import cli
+from genesisonline.download import MANIFEST
+from .conftest import FakeClient, ModifiedCatalogue
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    created = []
+
+    def create(username, password, **kwargs):
+        client = FakeClient()
+        client.args = (username, password, kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(cli, "GenesisOnline", create)
+    monkeypatch.setenv("GENESIS_ONLINE_USERNAME", "user")
+    monkeypatch.setenv("GENESIS_ONLINE_PASSWORD", "secret")
+    return created
+
+
+def test_download(clients, tmp_path, capsys):
+    codes = tmp_path / "codes.txt"
+    codes.write_text("# tables\n61111-0001\n\n")
+
+    status = cli.main(
+        [
+            "download",
+            "12411-*",
+            "--from-file",
+            str(codes),
+            "--output",
+            str(tmp_path / "out"),
+            "--workers",
+            "3",
+            "--format",
+            "ffcsv",
+            "-p",
+            "startyear=2020",
+        ]
+    )
+
+    assert status == 0
+    client = clients[0]
+    assert client.args == (
+        "user",
+        "secret",
+        {"language": "en", "rate_limit": None, "pool_size": 3, "pool_block": True},
+    )
+    assert sorted(client.data.requested) == [
+        "12411-0001",
+        "12411-0015",
+        "12411-9999",
+        "61111-0001",
+    ]
+    assert client.data.params[0] == {"format": "ffcsv", "startyear": "2020"}
+    with open(tmp_path / "out" / MANIFEST) as f:
+        assert len([json.loads(line) for line in f]) == 4
+    assert "4 of 4 table(s)" in capsys.readouterr().out
+
+
+def test_download_reports_failures(clients, tmp_path, monkeypatch, capsys):
+    original = cli.GenesisOnline
+
+    def create(*args, **kwargs):
+        client = original(*args, **kwargs)
+        client.data.failing.add("61111-0001")
+        return client
+
+    monkeypatch.setattr(cli, "GenesisOnline", create)
+    status = cli.main(["download", "61111-0001", "-o", str(tmp_path)])
+
+    assert status == 1
+    assert "failed: 61111-0001" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["download"], ["download", "12411-0001", "-p", "startyear"], []],
+)
+def test_usage_errors(clients, argv):
+    with pytest.raises(SystemExit) as e:
+        cli.main(argv)
+    assert e.value.code == 2
+
+
+def test_credentials_required(clients, monkeypatch):
+    monkeypatch.delenv("GENESIS_ONLINE_USERNAME")
+    with pytest.raises(SystemExit):
+        cli.main(["download", "12411-0001"])
+
+
+def test_sync(clients, tmp_path, monkeypatch, capsys):
+    original = cli.GenesisOnline
+
+    def create(*args, **kwargs):
+        client = original(*args, **kwargs)
+        client.catalogue = ModifiedCatalogue()
+        return client
+
+    monkeypatch.setattr(cli, "GenesisOnline", create)
+    argv = ["sync", "12411-0001", "61111-0001", "-o", str(tmp_path)]
+
+    assert cli.main(argv) == 0
+    assert "2 of 2 table(s) were new or changed" in capsys.readouterr().out
+    assert cli.main(argv) == 0
+    assert "0 of 2 table(s) were new or changed" in capsys.readouterr().out
+    assert clients[-1].data.requested == []
@@ -53,6 +53,38 @@ def test_param_changing_consistent(api_client):
     assert api_client.data._session.params["language"] == "de"
 
 
+def test_cache_disabled_by_default(api_client):
+    assert api_client.cache_info() == {}
+    assert api_client.metadata.response_cache is None
+
+
+def test_cache_ttl_per_service(credentials):
+    username, password = credentials
+    client = GenesisOnline(
+        username, password, cache_ttl={"catalogue": 60, "metadata": None}
+    )
+
+    assert set(client.cache_info()) == {"catalogue", "metadata"}
+    assert client.catalogue.response_cache.ttl == 60
+    assert client.metadata.response_cache.ttl is None
+    assert client.data.response_cache is None
+
+
+def test_job_budget(credentials):
+    username, password = credentials
+    client = GenesisOnline(username, password, job_budget=2.5)
+
+    assert client.data.poller.budget == 2.5
+
+
+def test_result_eviction(credentials):
+    username, password = credentials
+    client = GenesisOnline(username, password, max_bytes=1000, eviction="lfu")
+
+    assert client.data.filemanager.max_bytes == 1000
+    assert client.data.filemanager.eviction == "lfu"
+
+
 @api_vcr.use_cassette(cassette_library_dir=cassette_subdir)
 def test_check_login_invalid_credentials(api_client):
     api_client.username = "invalid_user"
@@ -0,0 +1,58 @@
+import re
+import pytest
+import responses
+from urllib.parse import urljoin
+from genesisonline import GenesisOnline, exceptions
+from genesisonline.connection import create_session, prewarm
+from genesisonline.constants import BASE_URL, Endpoints
+
+
+def test_create_session_pool():
+    session = create_session(pool_size=32, pool_block=True)
+    adapter = session.get_adapter(BASE_URL)
+
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+    assert session.headers["Connection"] == "keep-alive"
+
+
+def test_create_session_without_keep_alive():
+    session = create_session(keep_alive=False)
+
+    assert session.headers["Connection"] == "close"
+
+
+def test_create_session_value_error():
+    with pytest.raises(exceptions.ValueError):
+        create_session(pool_size=0)
+
+
+@responses.activate
+def test_prewarm_without_credentials():
+    url = re.compile(rf"{urljoin(BASE_URL, Endpoints.TEST_WHOAMI)}.*")
+    responses.add(responses.GET, url, json={})
+    session = create_session(pool_size=4)
+    session.params = {"username": "user", "password": "secret"}
+
+    assert prewarm(session, 4) == 4
+    assert len(responses.calls) == 4
+    assert all("secret" not in call.request.url for call in responses.calls)
+
+
+def test_client_pool_options():
+    go = GenesisOnline("user", "secret", pool_size=32, pool_block=True)
+    adapter = go.session.get_adapter(BASE_URL)
+
+    assert adapter._pool_maxsize == 32
+    assert go.data._session is go.session
+
+
+def test_params_replaced_not_mutated():
+    go = GenesisOnline("user", "secret")
+    params = go.session.params
+    go.username = "new_user"
+
+    # a request reading the old parameters sends them unchanged
+    assert params["username"] == "user"
+    assert go.session.params["username"] == "new_user"
+    assert go.session.params["password"] == "secret"
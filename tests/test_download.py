@@ -0,0 +1,130 @@
+import json
+import threading
+import pytest
+from genesisonline.download import MANIFEST, Downloader
+from .conftest import FakeClient, table_response
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+@pytest.fixture
+def downloader(client, tmp_path):
+    return Downloader(client, tmp_path / "out", max_workers=4, startyear="2020")
+
+
+def manifest_lines(downloader):
+    with open(downloader.directory / MANIFEST) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_run_writes_tables_and_manifest(downloader, client):
+    results = downloader.run(["12411-0001", "61111-0001", "12411-0001"])
+
+    assert sorted(client.data.requested) == ["12411-0001", "61111-0001"]
+    assert all(params == {"startyear": "2020"} for params in client.data.params)
+    assert (downloader.directory / "12411-0001.csv").read_text() == "table;12411-0001\n"
+    entry = results["61111-0001"]
+    assert entry["status"] == "done"
+    assert entry["file"] == "61111-0001.csv"
+    assert entry["bytes"] == len("table;61111-0001\n")
+    assert entry["seconds"] >= 0
+    assert entry["job"] is False
+    assert len(manifest_lines(downloader)) == 2
+
+
+def test_seconds_exclude_waiting_for_a_worker(client, tmp_path):
+    client.data.delay = 0.05
+    downloader = Downloader(client, tmp_path, max_workers=1)
+
+    results = downloader.run(["12411-0001", "12411-0015", "61111-0001"])
+
+    assert all(entry["seconds"] < 0.1 for entry in results.values())
+
+
+def test_run_records_failures(downloader, client):
+    client.data.failing.add("61111-0001")
+
+    results = downloader.run(["12411-0001", "61111-0001"])
+
+    assert results["12411-0001"]["status"] == "done"
+    assert results["61111-0001"]["status"] == "failed"
+    assert "61111-0001 failed" in results["61111-0001"]["error"]
+    assert not (downloader.directory / "61111-0001.csv").exists()
+
+
+def test_run_records_tables_not_found(downloader, client):
+    client.data.missing.add("12411-9999")
+
+    results = downloader.run(["12411-9999"])
+    downloader.run(["12411-9999"])
+
+    assert results["12411-9999"]["status"] == "failed"
+    assert results["12411-9999"]["error"] == "There are no objects"
+    assert list(downloader.directory.glob("12411-9999*")) == []
+    assert client.data.requested == ["12411-9999", "12411-9999"]
+
+
+def test_run_resumes_from_manifest(downloader, client):
+    client.data.failing.add("61111-0001")
+    downloader.run(["12411-0001", "12411-0015", "61111-0001"])
+    (downloader.directory / "12411-0015.csv").unlink()
+    client.data.failing.clear()
+    client.data.requested.clear()
+
+    results = downloader.run(["12411-0001", "12411-0015", "61111-0001"])
+
+    # done and still on disk: skipped, failed or missing: fetched again
+    assert sorted(client.data.requested) == ["12411-0015", "61111-0001"]
+    assert all(entry["status"] == "done" for entry in results.values())
+
+
+def test_run_without_resume_fetches_all(downloader, client):
+    downloader.run(["12411-0001"])
+    downloader.run(["12411-0001"], resume=False)
+    assert client.data.requested == ["12411-0001", "12411-0001"]
+
+
+def test_entries_skip_truncated_line(downloader):
+    downloader.run(["12411-0001"])
+    with open(downloader.manifest, "a") as f:
+        f.write('{"code": "6111')
+    assert list(downloader.entries()) == ["12411-0001"]
+
+
+def test_batch_jobs_do_not_block_workers(client, tmp_path):
+    downloader = Downloader(client, tmp_path, max_workers=1)
+    client.data.jobs["12411-0001"] = None
+
+    def finish_job():
+        # the other table is downloaded while the job is still running
+        while "61111-0001" not in client.data.requested:
+            pass
+        client.data.jobs["12411-0001"].set_result(
+            table_response("12411-0001", content={"large": True})
+        )
+
+    thread = threading.Thread(target=finish_job)
+    thread.start()
+    results = downloader.run(["12411-0001", "61111-0001"])
+    thread.join()
+
+    assert results["12411-0001"]["job"] is True
+    assert results["12411-0001"]["file"] == "12411-0001.json"
+    assert results["61111-0001"]["job"] is False
+
+
+@pytest.mark.parametrize(
+    "patterns, expected, selection",
+    [
+        (["12411-0001"], ["12411-0001"], None),
+        (["12411-*"], ["12411-0001", "12411-0015", "12411-9999"], "12411-*"),
+        (["12411-00?[0-4]"], ["12411-0001"], "12411-00*"),
+        (["12411-0001", "1241*"], ["12411-0001", "12411-0015", "12411-9999"], "1241*"),
+    ],
+)
+def test_expand(downloader, client, patterns, expected, selection):
+    assert downloader.expand(patterns) == expected
+    assert getattr(client.catalogue, "selection", None) == selection
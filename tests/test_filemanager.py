@@ -1,3 +1,5 @@
+import gzip
+import pickle
 import pytest
 import os
 from pathlib import Path
@@ -34,6 +36,9 @@ def test_change_directory(file_manager):
     [
         ("file.json", {"name": "Alice", "age": 30}),
         ("file.pkl", {"name": "Bob", "age": 25}),
+        ("file.json.gz", {"name": "Carol", "age": 35}),
+        ("file.json.bz2", {"name": "Dave", "age": 40}),
+        ("file.pkl.xz", {"name": "Eve", "age": 45}),
     ],
 )
 def test_save_and_load(file_manager, file_name, content):
@@ -43,6 +48,32 @@ def test_save_and_load(file_manager, file_name, content):
     assert loaded_data == content
 
 
+def test_save_compressed(file_manager):
+    content = {"values": ["1;2;3"] * 1000}
+    file_manager.save(content, "plain.json")
+    file_manager.save(content, "compressed.json.gz")
+
+    plain = file_manager.directory / "plain.json"
+    compressed = file_manager.directory / "compressed.json.gz"
+    assert compressed.stat().st_size < plain.stat().st_size / 10
+    assert gzip.decompress(compressed.read_bytes()) == plain.read_bytes()
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise pickle.PicklingError("interrupted")
+
+
+def test_save_atomic(file_manager):
+    file_manager.save({"complete": True}, "file.pkl")
+
+    with pytest.raises(pickle.PicklingError):
+        file_manager.save({"complete": True, "rest": Unpicklable()}, "file.pkl")
+
+    assert file_manager.load("file.pkl") == {"complete": True}
+    assert not list(file_manager.directory.glob("*.tmp"))
+
+
 def test_save_value_error(file_manager):
     with pytest.raises(exceptions.ValueError):
         file_manager.save({"test": "test"}, "file.invalid")
@@ -53,6 +84,91 @@ def test_load_value_error(file_manager):
         file_manager.load("file.invalid")
 
 
+def test_compression_only_value_error(file_manager):
+    with pytest.raises(exceptions.ValueError):
+        file_manager.save({"test": "test"}, "file.gz")
+
+
+@pytest.fixture
+def bounded_dir():
+    directory = TEST_DIR / "bounded"
+    yield directory
+    delete_dir(directory)
+
+
+def test_stats(bounded_dir):
+    file_manager = FileManager(bounded_dir)
+    file_manager.save({"a": 1}, "a.json")
+    file_manager.save({"b": 2}, "b.pkl")
+
+    stats = file_manager.stats()
+    assert stats["files"] == 2
+    assert stats["bytes"] == sum(
+        (bounded_dir / name).stat().st_size for name in ("a.json", "b.pkl")
+    )
+    assert stats["evictions"] == 0
+
+
+def test_origin_recorded(bounded_dir):
+    file_manager = FileManager(bounded_dir)
+    origin = {"endpoint": "data/table", "params": {"name": "12411-0001"}}
+    file_manager.save({"a": 1}, "a.json", origin=origin)
+    file_manager.load("a.json")
+
+    entry = file_manager.index.get("a.json")
+    assert entry["endpoint"] == "data/table"
+    assert entry["params"] == {"name": "12411-0001"}
+    assert entry["hits"] == 1
+
+
+@pytest.mark.parametrize("eviction, kept", [("lru", "b"), ("lfu", "a")])
+def test_eviction_on_save(bounded_dir, eviction, kept):
+    content = {"values": "x" * 1000}
+    file_manager = FileManager(bounded_dir, eviction=eviction)
+    for name in ("a", "b", "c"):
+        file_manager.save(content, f"{name}.json")
+    for name in ("a", "a", "a", "b"):
+        file_manager.load(f"{name}.json")
+    file_manager.max_bytes = 2500
+    file_manager.save(content, "d.json")
+
+    assert sorted(p.name for p in bounded_dir.glob("*.json")) == [
+        f"{kept}.json",
+        "d.json",
+    ]
+    assert file_manager.stats()["files"] == 2
+    assert file_manager.stats()["evictions"] == 2
+
+
+def test_prune(bounded_dir):
+    file_manager = FileManager(bounded_dir)
+    for name in ("a", "b", "c"):
+        file_manager.save({"values": "x" * 1000}, f"{name}.json")
+
+    assert file_manager.prune() == 0
+    assert file_manager.prune(max_bytes=0) == 3
+    assert file_manager.stats()["bytes"] == 0
+    assert not list(bounded_dir.glob("*.json"))
+
+
+def test_pinned_files_not_evicted(bounded_dir):
+    file_manager = FileManager(bounded_dir, max_bytes=2500)
+    content = {"values": "x" * 1000}
+    for name in ("a", "b"):
+        file_manager.save(content, f"{name}.json")
+    file_manager.save(content, "c.json", keep=["a.json"])
+
+    assert sorted(p.name for p in bounded_dir.glob("*.json")) == ["a.json", "c.json"]
+    assert file_manager.prune(max_bytes=0, keep={"c.json"}) == 1
+
+
+def test_existing_files_indexed(bounded_dir):
+    bounded_dir.mkdir(parents=True, exist_ok=True)
+    (bounded_dir / "old.json").write_text("{}")
+
+    assert FileManager(bounded_dir).stats()["files"] == 1
+
+
 @pytest.fixture(scope="module", autouse=True)
 def cleanup_after_tests():
     yield
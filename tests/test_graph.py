@@ -0,0 +1,215 @@
+import threading
+from datetime import date
+import numpy as np
+import pytest
+from genesisonline import exceptions
+from genesisonline.graph import MetadataCrawler, MetadataGraph
+
+# variables carried by every table, by statistic
+STATISTICS = {
+    "12411": {
+        "12411-0001": ["DINSG", "GES"],  # national level
+        "12411-0015": ["GES", "KREISE"],  # district level
+    },
+    "12613": {"12613-0001": ["DINSG", "GES"]},
+    "61111": {"61111-0001": ["DINSG"]},
+}
+VALUES = {
+    "DINSG": ["DG"],
+    "GES": ["GESM", "GESW"],
+    "KREISE": ["01001", "01002"],
+    "NAT": ["NATA", "NATD"],
+}
+
+
+def listing(codes):
+    return iter([{"Code": code, "Content": ""} for code in codes])
+
+
+class GraphCatalogue:
+    def __init__(self):
+        self.statistics = {
+            code: {table: list(v) for table, v in tables.items()}
+            for code, tables in STATISTICS.items()
+        }
+        self.values = dict(VALUES)
+        self.modified = []
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def _log(self, method, name):
+        with self._lock:
+            self.requested.append((method, name))
+
+    def iter_statistics(self, selection=None, **params):
+        prefix = (selection or "*").rstrip("*")
+        return listing([code for code in self.statistics if code.startswith(prefix)])
+
+    def iter_tables2statistics(self, name=None, **params):
+        self._log("tables", name)
+        return listing(self.statistics[name])
+
+    def iter_variables2statistic(self, name=None, **params):
+        self._log("variables", name)
+        tables = self.statistics[name].values()
+        return listing(sorted({v for variables in tables for v in variables}))
+
+    def iter_tables2variable(self, name=None, **params):
+        self._log("tables2variable", name)
+        return listing(
+            table
+            for tables in self.statistics.values()
+            for table, variables in tables.items()
+            if name in variables
+        )
+
+    def iter_values2variable(self, name=None, **params):
+        self._log("values", name)
+        return listing(self.values[name])
+
+    def modifieddata(self, **params):
+        return {"Content": [{"Code": code} for code in self.modified]}
+
+
+class FakeMetadata:
+    def variable(self, name=None, **params):
+        return {"Content": {"Code": name, "Type": "sachlich"}}
+
+
+@pytest.fixture
+def catalogue():
+    return GraphCatalogue()
+
+
+@pytest.fixture
+def crawler(catalogue):
+    return MetadataCrawler(catalogue, FakeMetadata(), max_workers=4)
+
+
+@pytest.fixture
+def graph(crawler):
+    return crawler.crawl()
+
+
+def test_crawl_builds_relations(graph):
+    assert graph.tables("12411") == ["12411-0001", "12411-0015"]
+    assert graph.variables("12613") == ["DINSG", "GES"]
+    assert graph.values("GES") == ["GESM", "GESW"]
+    assert graph.statistics("GES") == ["12411", "12613"]
+    assert graph.table_variables("12411-0015") == ["GES", "KREISE"]
+    assert graph.metadata["KREISE"] == {"Code": "KREISE", "Type": "sachlich"}
+    assert graph.crawled == date.today()
+
+
+def test_crawl_requests_every_variable_once(graph, catalogue):
+    for method in ("values", "tables2variable"):
+        names = [name for m, name in catalogue.requested if m == method]
+        assert sorted(names) == ["DINSG", "GES", "KREISE"]
+
+
+def test_tables_with(graph):
+    # only the table at district level, not the national one of 12411
+    assert graph.tables_with("GES", "KREISE") == ["12411-0015"]
+    assert graph.tables_with("DINSG") == ["12411-0001", "12613-0001", "61111-0001"]
+    assert graph.tables_with("UNKNOWN") == []
+    assert graph.tables_with() == []
+
+
+def test_crawl_selection_excludes_other_tables(crawler):
+    graph = crawler.crawl(selection="124*")
+    assert graph.selection == "124*"
+    assert graph.tables_with("GES") == ["12411-0001", "12411-0015"]
+
+
+def test_unknown_nodes_and_relations(graph):
+    assert graph.tables("99999") == []
+    with pytest.raises(exceptions.ValueError):
+        graph.neighbours("cubes", "12411")
+
+
+def test_edges_round_trip(graph):
+    rebuilt = MetadataGraph.from_edges(graph.edges())
+    assert rebuilt.edges() == graph.edges()
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(crawler, tmp_path, mmap):
+    graph = crawler.crawl(selection="12*")
+    graph.save(tmp_path / "graph")
+    loaded = MetadataGraph.load(tmp_path / "graph", mmap=mmap)
+
+    assert isinstance(loaded.adjacency["tables"][0], np.memmap) == mmap
+    assert loaded.edges() == graph.edges()
+    assert loaded.metadata == graph.metadata
+    assert loaded.crawled == graph.crawled
+    assert loaded.selection == "12*"
+    assert loaded.tables_with("GES", "KREISE") == ["12411-0015"]
+
+
+def test_recrawl_touches_only_modified_statistics(crawler, graph, catalogue):
+    catalogue.statistics["12613"]["12613-0002"] = ["GES", "KREISE"]
+    catalogue.statistics["12711"] = {"12711-0001": ["NAT"]}
+    catalogue.modified = ["12613-0002", "12711-0001"]
+    catalogue.requested.clear()
+
+    updated = crawler.recrawl(graph)
+
+    crawled = {name for m, name in catalogue.requested if m in ("tables", "values")}
+    assert crawled == {"12613", "12711", "NAT"}
+    assert updated.tables_with("GES", "KREISE") == ["12411-0015", "12613-0002"]
+    assert updated.values("NAT") == ["NATA", "NATD"]
+    assert updated.metadata["GES"] == graph.metadata["GES"]
+    # the original graph is unchanged
+    assert graph.tables_with("GES", "KREISE") == ["12411-0015"]
+
+
+@pytest.mark.parametrize("code", ["12613BJ001", "12613-01-01-4"])
+def test_recrawl_finds_statistic_of_cubes_and_timeseries(
+    crawler, graph, catalogue, code
+):
+    catalogue.modified = [code]
+    catalogue.requested.clear()
+
+    crawler.recrawl(graph)
+
+    assert [name for m, name in catalogue.requested if m == "tables"] == ["12613"]
+
+
+def test_recrawl_removes_statistics(crawler, graph, catalogue):
+    del catalogue.statistics["61111"]
+
+    updated = crawler.recrawl(graph)
+
+    assert updated.tables("61111") == []
+    assert "61111-0001" not in updated.codes["table"]
+    assert updated.tables_with("DINSG") == ["12411-0001", "12613-0001"]
+
+
+def test_recrawl_removes_variables(crawler, graph, catalogue):
+    catalogue.statistics["12411"] = {"12411-0001": ["DINSG", "GES"]}
+    catalogue.modified = ["12411"]
+
+    updated = crawler.recrawl(graph)
+
+    assert "KREISE" not in updated.codes["variable"]
+    assert "KREISE" not in updated.metadata
+    assert updated.tables_with("GES") == ["12411-0001", "12613-0001"]
+
+
+def test_recrawl_falls_back_to_full_crawl(crawler, catalogue):
+    graph = crawler.crawl(selection="12*")
+    crawler.pagelength = 1
+    catalogue.modified = ["12411-0001"]
+    catalogue.requested.clear()
+
+    updated = crawler.recrawl(graph)
+
+    statistics = [name for method, name in catalogue.requested if method == "tables"]
+    assert sorted(statistics) == ["12411", "12613"]
+    assert updated.selection == "12*"
+
+
+def test_recrawl_requires_date(crawler, graph):
+    graph.crawled = None
+    with pytest.raises(exceptions.ValueError):
+        crawler.recrawl(graph)
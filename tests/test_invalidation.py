@@ -0,0 +1,88 @@
+import re
+import pytest
+import responses
+from urllib.parse import urljoin
+from genesisonline.cache import ResponseCache, affects
+from genesisonline.constants import BASE_URL, Endpoints
+from genesisonline.invalidation import CacheInvalidator
+from genesisonline.services import CatalogueService
+
+
+def modifieddata_response(codes):
+    return {
+        "Ident": {"Service": "catalogue", "Method": "modifieddata"},
+        "Status": {"Code": 0, "Content": "successfull", "Type": "information"},
+        "Parameter": {"selection": "", "type": "all", "date": "", "pagelength": ""},
+        "List": [
+            {"Code": code, "Content": "", "Type": "Updates", "Date": "2023-08-30"}
+            for code in codes
+        ],
+        "Copyright": "",
+    }
+
+
+@pytest.fixture
+def modifieddata_endpoint():
+    return re.compile(rf"{urljoin(BASE_URL, Endpoints.CATALOGUE_MODIFIEDDATA)}.*")
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache()
+    for name in ["12411-0001", "12411BJ001", "61521-0001"]:
+        cache.set((Endpoints.METADATA_TABLE, (("name", name),)), name)
+    cache.set((Endpoints.CATALOGUE_TABLES, (("selection", "124*"),)), "list")
+    return cache
+
+
+@pytest.mark.parametrize(
+    "code, params, expected",
+    [
+        ("12411", {"name": "12411-0001"}, True),
+        ("12411-0001", {"name": "12411"}, True),
+        ("12411-0001", {"selection": "124*"}, True),
+        ("12411-0001", {"name": "61521-0001", "selection": "615*"}, False),
+        ("12411", {}, False),
+    ],
+)
+def test_affects(code, params, expected):
+    assert affects(code, params) == expected
+
+
+@responses.activate
+def test_poll_evicts_modified_objects(session, cache, modifieddata_endpoint):
+    responses.add(
+        responses.GET, modifieddata_endpoint, json=modifieddata_response(["12411"])
+    )
+    invalidator = CacheInvalidator(CatalogueService(session), [cache])
+    codes = invalidator.poll()
+
+    assert codes == ["12411"]
+    assert len(cache) == 1
+    assert (Endpoints.METADATA_TABLE, (("name", "61521-0001"),)) in cache
+
+
+@responses.activate
+def test_poll_skips_known_modifications(session, cache, modifieddata_endpoint):
+    responses.add(
+        responses.GET, modifieddata_endpoint, json=modifieddata_response(["12411"])
+    )
+    invalidator = CacheInvalidator(CatalogueService(session), [cache])
+    invalidator.poll()
+    cache.set((Endpoints.METADATA_TABLE, (("name", "12411-0001"),)), "new")
+
+    assert invalidator.poll() == []
+    assert len(cache) == 2
+
+
+@responses.activate
+def test_poll_clears_incomplete_listing(session, cache, modifieddata_endpoint):
+    responses.add(
+        responses.GET,
+        modifieddata_endpoint,
+        json=modifieddata_response(["12411", "99999"]),
+    )
+    invalidator = CacheInvalidator(CatalogueService(session), [cache], pagelength=2)
+    invalidator.poll()
+
+    assert len(cache) == 0
@@ -0,0 +1,204 @@
+import threading
+import time
+from concurrent.futures import as_completed, wait
+from genesisonline import exceptions
+from genesisonline.jobs import JobPoller, PollingPolicy
+
+FAST = PollingPolicy(initial=0.01, maximum=0.01, learn=False)
+
+
+class FakeService:
+    """Stand-in for `DataService` whose jobs finish after `checks` checks."""
+
+    def __init__(
+        self, checks: dict, fail: set = (), unlisted: set = (), states: dict = None
+    ) -> None:
+        self.checks = checks
+        self.fail = fail
+        self.unlisted = unlisted
+        self.states = states or dict()
+        self.listings = list()
+        self.calls = list()
+        self.threads = set()
+
+    def _job_states(self, result_ids):
+        self.listings.append(result_ids)
+        if self.unlisted == "all":
+            raise RuntimeError("listing failed")
+        self.threads.add(threading.get_ident())
+        states = dict()
+        for result_id in result_ids:
+            if result_id in self.unlisted:
+                continue
+            if result_id in self.states:
+                states[result_id] = self.states[result_id]
+                continue
+            if result_id in self.checks:
+                self.checks[result_id] -= 1
+            finished = self.checks.get(result_id, 0) <= 0
+            states[result_id] = "finished" if finished else "running"
+        return states
+
+    def _check_result(self, result_id, language):
+        self.calls.append(result_id)
+        self.threads.add(threading.get_ident())
+        if result_id in self.fail:
+            raise RuntimeError("failed")
+        if self.unlisted == "all" or result_id in self.unlisted:
+            self.checks[result_id] -= 1
+        if self.checks[result_id] > 0:
+            return None
+        return {"Content": result_id}
+
+
+def test_single_thread_for_all_jobs():
+    service = FakeService({f"job{i}": 3 for i in range(20)})
+    poller = JobPoller(service, policy=FAST)
+    jobs = [poller.submit(f"job{i}", "en") for i in range(20)]
+
+    done, pending = wait(jobs, timeout=5)
+
+    assert not pending
+    assert len(service.threads) == 1
+    assert len(service.calls) == 20
+    assert len(poller) == 0
+
+
+def test_one_listing_per_tick():
+    service = FakeService({f"job{i}": 3 for i in range(200)})
+    poller = JobPoller(service, policy=FAST)
+    with poller._condition:  # submit all before the first check
+        jobs = [poller.submit(f"job{i}", "en") for i in range(200)]
+    done, pending = wait(jobs, timeout=5)
+
+    assert not pending
+    assert len(service.listings) == 3
+    assert all(len(listing) == 200 for listing in service.listings)
+    assert sorted(service.calls) == sorted(f"job{i}" for i in range(200))
+
+
+def test_unlisted_job_checked_individually():
+    service = FakeService({"listed": 2, "unlisted": 2}, unlisted={"unlisted"})
+    poller = JobPoller(service, policy=FAST)
+    jobs = [poller.submit(name, "en") for name in ("listed", "unlisted")]
+    done, pending = wait(jobs, timeout=5)
+
+    assert not pending
+    assert service.calls.count("listed") == 1
+    assert service.calls.count("unlisted") == 2
+
+
+def test_failed_listing_checks_individually():
+    service = FakeService({"job": 2}, unlisted="all")
+    poller = JobPoller(service, policy=FAST)
+
+    assert poller.submit("job", "en").result(5) == {"Content": "job"}
+    assert service.calls == ["job", "job"]
+
+
+def test_callbacks():
+    service = FakeService({"job": 2})
+    poller = JobPoller(service, policy=FAST)
+    results = list()
+    job = poller.submit("job", "en")
+    job.add_done_callback(lambda future: results.append(future.result()))
+    job.result(5)
+
+    assert results == [{"Content": "job"}]
+    assert job.checks == 2
+    assert service.calls == ["job"]
+
+
+def test_priority_first():
+    service = FakeService({"low": 1, "high": 1})
+    poller = JobPoller(service, policy=FAST)
+    with poller._condition:  # submit both before the first check
+        low = poller.submit("low", "en", priority=0)
+        high = poller.submit("high", "en", priority=1)
+    wait([low, high], timeout=5)
+
+    assert service.calls == ["high", "low"]
+
+
+def test_budget():
+    service = FakeService({f"job{i}": 1 for i in range(5)})
+    poller = JobPoller(service, policy=FAST, budget=50)
+    start = time.monotonic()
+    jobs = [poller.submit(f"job{i}", "en") for i in range(5)]
+    wait(jobs, timeout=5)
+
+    assert time.monotonic() - start >= 4 / 50
+
+
+def test_error_ends_job():
+    service = FakeService({}, fail={"job"})
+    poller = JobPoller(service, policy=FAST, max_errors=3)
+    job = poller.submit("job", "en")
+
+    assert isinstance(job.exception(5), RuntimeError)
+    assert service.calls == ["job"] * 3
+    assert len(poller) == 0
+
+
+def test_aborted_job_fails():
+    service = FakeService({"job": 100, "other": 1}, states={"job": "aborted"})
+    poller = JobPoller(service, policy=FAST)
+    job = poller.submit("job", "en")
+    other = poller.submit("other", "en")
+
+    assert isinstance(job.exception(5), exceptions.RequestError)
+    assert "aborted" in str(job.exception())
+    assert other.result(5) == {"Content": "other"}
+    assert "job" not in service.calls
+    assert len(poller) == 0
+
+
+def test_transient_error_is_retried():
+    service = FakeService({"job": 1}, fail={"job"})
+    poller = JobPoller(service, policy=FAST, max_errors=100)
+    job = poller.submit("job", "en")
+    while len(service.calls) < 2:
+        time.sleep(0.01)
+    service.fail = set()
+
+    assert job.result(5) == {"Content": "job"}
+    assert job.errors == 0
+
+
+def test_as_completed():
+    service = FakeService({"slow": 5, "fast": 1})
+    poller = JobPoller(service, policy=FAST)
+    jobs = [poller.submit(name, "en") for name in ("slow", "fast")]
+    results = [job.result() for job in as_completed(jobs, timeout=5)]
+
+    assert results == [{"Content": "fast"}, {"Content": "slow"}]
+
+
+def test_cancel():
+    service = FakeService({"job": 1000, "other": 3})
+    poller = JobPoller(service, policy=FAST)
+    job = poller.submit("job", "en")
+    other = poller.submit("other", "en")
+
+    assert job.cancel()
+    assert other.result(5) == {"Content": "other"}
+    time.sleep(0.05)
+    assert job.cancelled()
+    assert len(poller) == 0
+
+
+def test_policy_exponential_backoff():
+    policy = PollingPolicy(initial=1, factor=2, maximum=60, learn=False)
+
+    assert [policy.delay(t) for t in (0, 1, 2, 4, 8, 100)] == [1, 1, 2, 4, 8, 60]
+
+
+def test_policy_learns_expected_duration():
+    policy = PollingPolicy(initial=1, factor=2, maximum=60)
+    policy.record(40)
+
+    assert policy.delay(0) == 40
+    assert policy.delay(30) == 10
+    assert policy.delay(44) == 4
+    policy.record(20)
+    assert policy.expected == 34
@@ -0,0 +1,149 @@
+from datetime import date
+import pytest
+from genesisonline import exceptions
+from genesisonline.mirror import CATEGORIES, CatalogueMirror
+from genesisonline.services import FindService
+from .conftest import assert_valid_json_structure
+
+
+class MirroredCatalogue:
+    """Catalogue listing `objects` per category and language."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.listed = []
+        self.modified = []
+        for category, method in CATEGORIES.items():
+            setattr(self, method, self._lister(category))
+
+    def _lister(self, category):
+        def iterate(selection=None, area=None, language="en", max_workers=1):
+            self.listed.append((category, selection, language))
+            prefix = (selection or "*").rstrip("*")
+            return iter(
+                [
+                    obj
+                    for obj in self.objects.get((category, language), [])
+                    if obj["Code"].startswith(prefix)
+                ]
+            )
+
+        return iterate
+
+    def modifieddata(self, **params):
+        return {"Content": [{"Code": code} for code in self.modified]}
+
+
+def tables(*items):
+    return [{"Code": code, "Content": content, "Time": ""} for code, content in items]
+
+
+@pytest.fixture
+def catalogue():
+    return MirroredCatalogue(
+        {
+            ("Tables", "en"): tables(
+                ("12411-0001", "Population: Germany, reference date"),
+                ("12411-0002", "Population: Germany, reference date, sex"),
+                ("61111-0001", "Consumer price index: Germany"),
+            ),
+            ("Tables", "de"): tables(
+                ("12411-0001", "Bevölkerung: Deutschland, Stichtag"),
+            ),
+            ("Statistics", "en"): tables(("12411", "Current population")),
+        }
+    )
+
+
+@pytest.fixture
+def mirror(catalogue, tmp_path):
+    mirror = CatalogueMirror(catalogue, path=tmp_path / "catalogue.sqlite")
+    mirror.sync()
+    return mirror
+
+
+def codes(response, category):
+    return [obj["Code"] for obj in response["Content"][category] or []]
+
+
+def test_sync_copies_all_categories_and_languages(mirror, catalogue):
+    assert len(mirror) == 5
+    assert len(catalogue.listed) == 2 * len(CATEGORIES)
+
+
+def test_find_matches_word_prefixes(mirror):
+    response = mirror.find("popul germ")
+
+    assert_valid_json_structure(response)
+    assert response["Status"]["Code"] == 0
+    assert sorted(codes(response, "Tables")) == ["12411-0001", "12411-0002"]
+    assert response["Content"]["Statistics"] is None
+    assert response["Content"]["Tables"][0]["Time"] == ""
+
+
+def test_find_by_code(mirror):
+    response = mirror.find("61111")
+    assert codes(response, "Tables") == ["61111-0001"]
+
+
+def test_find_category_language_and_pagelength(mirror):
+    response = mirror.find("bevölkerung", category="tables", language="de")
+    assert codes(response, "Tables") == ["12411-0001"]
+    assert response["Content"]["Statistics"] is None
+
+    response = mirror.find("population", category="tables", pagelength=1)
+    assert len(response["Content"]["Tables"]) == 1
+
+
+@pytest.mark.parametrize("term", ["unemployment", "", '"'])
+def test_find_no_match(mirror, term):
+    response = mirror.find(term)
+    assert response["Status"]["Code"] == 104
+    assert all(objects is None for objects in response["Content"].values())
+
+
+def test_incremental_sync_refreshes_modified_objects(mirror, catalogue):
+    catalogue.objects[("Tables", "en")][2]["Content"] = "Consumer prices: Germany"
+    catalogue.modified = ["61111-0001"]
+    catalogue.listed.clear()
+
+    assert mirror.sync() == 1  # the english table, not listed in german
+    assert {selection for _, selection, _ in catalogue.listed} == {"61111-0001*"}
+    assert codes(mirror.find("prices"), "Tables") == ["61111-0001"]
+
+
+def test_incremental_sync_removes_objects_not_listed(mirror, catalogue):
+    catalogue.objects[("Tables", "en")].pop(1)  # 12411-0002
+    catalogue.modified = ["12411"]
+
+    mirror.sync()
+
+    assert codes(mirror.find("population"), "Tables") == ["12411-0001"]
+    assert codes(mirror.find("consumer"), "Tables") == ["61111-0001"]
+    assert len(mirror) == 4
+
+
+def test_incremental_sync_falls_back_to_full_sync(mirror, catalogue):
+    mirror.pagelength = 2
+    catalogue.modified = ["12411-0001", "12411-0002"]
+    catalogue.objects[("Tables", "en")].pop()
+    catalogue.listed.clear()
+
+    mirror.sync()
+
+    assert {selection for _, selection, _ in catalogue.listed} == {None}
+    assert codes(mirror.find("consumer"), "Tables") == []
+
+
+def test_sync_records_date(mirror):
+    assert mirror._last_sync("en") == date.today()
+
+
+def test_find_service_offline(mirror, session):
+    service = FindService(session)
+    with pytest.raises(exceptions.ValueError):
+        service.find("population", offline=True)
+
+    service.mirror = mirror
+    response = service.find("population", category="tables", offline=True)
+    assert sorted(codes(response, "Tables")) == ["12411-0001", "12411-0002"]
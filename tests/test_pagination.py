@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+import threading
+import time
+from fnmatch import fnmatchcase
+from genesisonline.pagination import (
+    aiter_objects,
+    iter_objects,
+    iter_objects_concurrently,
+    split_selection,
+)
+
+CODES = sorted(
+    [f"124{i:02d}" for i in range(40)]
+    + [f"12411-{i:04d}" for i in range(30)]
+    + ["124", "125AB", "99999"]
+)
+
+
+def make_fetch(codes=CODES, pagelength=10):
+    calls = list()
+
+    def fetch(selection):
+        calls.append(selection)
+        pattern = selection or "*"
+        matches = [c for c in codes if fnmatchcase(c, pattern)]
+        return [{"Code": code} for code in matches[:pagelength]]
+
+    return fetch, calls
+
+
+def test_split_selection():
+    selections = split_selection("124*")
+
+    assert selections[0] == "1240*"
+    assert "124Z*" in selections
+    assert split_selection(None)[0] == "0*"
+    assert split_selection("12*4") is None
+    assert split_selection("12345678901234*") is None
+
+
+def test_iter_objects_complete_without_duplicates():
+    fetch, calls = make_fetch()
+    codes = [obj["Code"] for obj in iter_objects(fetch, "124*", pagelength=10)]
+
+    assert sorted(codes) == [c for c in CODES if c.startswith("124")]
+    assert len(codes) == len(set(codes))
+    assert calls[0] == "124*"
+
+
+def test_iter_objects_single_page():
+    fetch, calls = make_fetch()
+    objects = list(iter_objects(fetch, "125*", pagelength=10))
+
+    assert objects == [{"Code": "125AB"}]
+    assert calls == ["125*"]
+
+
+def test_iter_objects_lazy():
+    fetch, calls = make_fetch()
+    objects = iter_objects(fetch, None, pagelength=10, prefetch=False)
+
+    assert calls == []
+    next(objects)
+    assert calls == [None]
+    objects.close()
+
+
+@pytest.mark.parametrize("prefetch, requested", [(True, 2), (False, 1)])
+def test_iter_objects_prefetch(prefetch, requested):
+    fetch, calls = make_fetch()
+    objects = iter_objects(fetch, "124*", pagelength=10, prefetch=prefetch)
+    next(objects)
+    time.sleep(0.1)  # while the first page is consumed
+
+    assert len(calls) == requested
+    objects.close()
+
+
+def test_iter_objects_concurrently_complete_without_duplicates():
+    fetch, calls = make_fetch()
+    objects = iter_objects_concurrently(fetch, None, pagelength=10, max_workers=8)
+    codes = [obj["Code"] for obj in objects]
+
+    assert sorted(codes) == CODES
+    assert len(calls) == len(set(calls))
+
+
+def test_iter_objects_concurrently_in_parallel():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    fetch, calls = make_fetch()
+
+    def slow_fetch(selection):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return fetch(selection)
+
+    list(iter_objects_concurrently(slow_fetch, "124*", pagelength=10, max_workers=4))
+
+    assert peak[0] == 4
+
+
+async def collect(fetch, selection, pagelength):
+    async def afetch(selection):
+        return fetch(selection)
+
+    return [obj async for obj in aiter_objects(afetch, selection, pagelength)]
+
+
+@pytest.mark.parametrize(
+    "iterate",
+    [
+        iter_objects,
+        iter_objects_concurrently,
+        lambda *args: asyncio.run(collect(*args)),
+    ],
+)
+def test_codes_outside_alphabet_not_lost(iterate):
+    codes = sorted(CODES + ["124.1", "124.2"])
+    fetch, calls = make_fetch(codes)
+    objects = list(iterate(fetch, "124*", 10))
+
+    assert sorted(obj["Code"] for obj in objects) == sorted(
+        c for c in codes if c.startswith("124")
+    )
+    assert "124.*" in calls
@@ -0,0 +1,67 @@
+import time
+import pytest
+from email.utils import formatdate
+from genesisonline import exceptions
+from genesisonline.ratelimit import RateLimiter, retry_after
+
+
+def test_burst_without_waiting():
+    limiter = RateLimiter(rate=1, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - start < 0.1
+    assert limiter.stats["waits"] == 0
+
+
+def test_acquire_waits_for_token():
+    limiter = RateLimiter(rate=50, burst=1)
+    limiter.acquire()
+    waited = limiter.acquire()
+
+    assert waited > 0
+    assert limiter.stats["waits"] == 1
+
+
+def test_throttle_and_recover():
+    limiter = RateLimiter(rate=10, burst=2, min_rate=1)
+    limiter.throttle()
+    limiter.throttle()
+
+    assert limiter.current_rate == 2.5
+    assert limiter.stats["throttles"] == 2
+    for _ in range(10):
+        limiter.recover()
+    assert limiter.current_rate == 10
+
+
+def test_throttle_min_rate():
+    limiter = RateLimiter(rate=4, min_rate=1)
+    for _ in range(5):
+        limiter.throttle()
+
+    assert limiter.current_rate == 1
+
+
+def test_throttle_retry_after_blocks():
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.throttle(retry_after=0.05)
+    waited = limiter.acquire()
+
+    assert waited > 0.04
+
+
+def test_invalid_arguments():
+    with pytest.raises(exceptions.ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(exceptions.ValueError):
+        RateLimiter(rate=1, burst=0)
+
+
+def test_retry_after():
+    assert retry_after({"Retry-After": "3"}) == 3
+    assert retry_after({"Retry-After": "invalid"}) is None
+    assert retry_after({}) is None
+    delay = retry_after({"Retry-After": formatdate(time.time() + 60, usegmt=True)})
+    assert 55 < delay <= 60
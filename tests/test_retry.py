@@ -0,0 +1,59 @@
+import pytest
+import requests
+from genesisonline import exceptions
+from genesisonline.retry import RetryPolicy
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+def test_transient_failures_retried():
+    policy = RetryPolicy(total=2)
+
+    assert policy.is_retryable(0, response=make_response(503))
+    assert policy.is_retryable(0, error=requests.exceptions.ConnectionError())
+    assert policy.is_retryable(0, error=requests.exceptions.ReadTimeout())
+    assert policy.stats == {"retries": 3, "exhausted": 0}
+
+
+def test_permanent_failures_not_retried():
+    policy = RetryPolicy(total=2)
+
+    assert not policy.is_retryable(0, response=make_response(404))
+    assert not policy.is_retryable(0, error=requests.exceptions.InvalidURL())
+    assert policy.stats == {"retries": 0, "exhausted": 0}
+
+
+def test_retries_exhausted():
+    policy = RetryPolicy(total=1)
+
+    assert not policy.is_retryable(1, response=make_response(500))
+    assert policy.stats == {"retries": 0, "exhausted": 1}
+
+
+def test_backoff_exponential():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+    assert [policy.backoff(i) for i in range(4)] == [1, 2, 4, 5]
+
+
+def test_backoff_jitter():
+    policy = RetryPolicy(backoff_factor=1, jitter=True)
+
+    assert all(0 <= policy.backoff(3) <= 8 for _ in range(20))
+
+
+def test_backoff_retry_after():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+    assert policy.backoff(0, {"Retry-After": "2"}) == 2
+    assert policy.backoff(0, {"Retry-After": "3600"}) == 5
+
+
+def test_invalid_total():
+    with pytest.raises(exceptions.ValueError):
+        RetryPolicy(total=-1)
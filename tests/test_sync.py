@@ -0,0 +1,159 @@
+import json
+import re
+from datetime import date, timedelta
+from urllib.parse import urljoin
+import pytest
+import responses
+from genesisonline.cache import ResponseCache
+from genesisonline.constants import BASE_URL, Endpoints
+from genesisonline.services import DataService
+from genesisonline.sync import STATE, TableSync
+from .conftest import FakeClient, ModifiedCatalogue
+
+CODES = ["12411-0001", "12411-0015", "61111-0001"]
+
+
+@pytest.fixture
+def client():
+    client = FakeClient()
+    client.catalogue = ModifiedCatalogue()
+    return client
+
+
+@pytest.fixture
+def sync(client, tmp_path):
+    sync = TableSync(client, tmp_path, max_workers=2)
+    sync.run(CODES)
+    client.data.requested.clear()
+    return sync
+
+
+def backdate(sync, days):
+    """Pretend the last run was `days` ago."""
+    day = (date.today() - timedelta(days=days)).isoformat()
+    with open(sync.state, "w") as f:
+        json.dump({code: day for code in CODES}, f)
+
+
+def test_first_run_downloads_all(sync):
+    assert set(sync.synced()) == set(CODES)
+    assert all(day == date.today() for day in sync.synced().values())
+
+
+def test_unchanged_tables_are_skipped(sync, client):
+    backdate(sync, 3)
+
+    assert sync.run(CODES) == {}
+    assert client.data.requested == []
+    since = (date.today() - timedelta(days=3)).strftime("%d.%m.%Y")
+    assert client.catalogue.requests[-1]["date"] == since
+
+
+def test_changed_tables_are_downloaded(sync, client):
+    backdate(sync, 3)
+    yesterday = date.today() - timedelta(days=1)
+    client.catalogue.modified = [
+        ("61111-0001", yesterday.strftime("%d.%m.%Y")),
+        # modified before the last download
+        ("12411-0015", (date.today() - timedelta(days=5)).isoformat()),
+    ]
+
+    results = sync.run(CODES)
+
+    assert list(results) == ["61111-0001"]
+    assert client.data.requested == ["61111-0001"]
+    assert sync.synced()["61111-0001"] == date.today()
+    assert sync.synced()["12411-0001"] == date.today() - timedelta(days=3)
+
+
+def test_modified_statistic_refetches_its_tables(sync, client):
+    backdate(sync, 3)
+    client.catalogue.modified = [("12411", None)]
+
+    sync.run(CODES)
+
+    assert sorted(client.data.requested) == ["12411-0001", "12411-0015"]
+
+
+def test_new_and_missing_tables_are_downloaded(sync, client):
+    (sync.downloader.directory / "12411-0015.csv").unlink()
+
+    sync.run(CODES + ["12411-9999"])
+
+    assert sorted(client.data.requested) == ["12411-0015", "12411-9999"]
+
+
+def test_failed_tables_keep_their_state(sync, client):
+    backdate(sync, 3)
+    client.catalogue.modified = [("12411", None)]
+    client.data.failing.add("12411-0015")
+
+    sync.run(CODES)
+
+    assert sync.synced()["12411-0001"] == date.today()
+    assert sync.synced()["12411-0015"] == date.today() - timedelta(days=3)
+    assert (sync.downloader.directory / "12411-0015.csv").exists()
+
+
+def test_tables_not_found_are_retried(client, tmp_path):
+    client.data.missing.add("12411-9999")
+    sync = TableSync(client, tmp_path)
+
+    results = sync.run(CODES + ["12411-9999"])
+    client.data.requested.clear()
+    sync.run(CODES + ["12411-9999"])
+
+    assert results["12411-9999"]["status"] == "failed"
+    assert "12411-9999" not in sync.synced()
+    assert client.data.requested == ["12411-9999"]
+
+
+def test_incomplete_listing_downloads_all(sync, client):
+    sync.pagelength = 1
+    client.catalogue.modified = [("99999", None)]
+
+    sync.run(CODES)
+
+    assert sorted(client.data.requested) == CODES
+
+
+def test_state_is_replaced_atomically(sync):
+    assert [p.name for p in sync.downloader.directory.glob(f".{STATE}*")] == []
+    with open(sync.state) as f:
+        assert sorted(json.load(f)) == CODES
+
+
+@responses.activate
+def test_changed_tables_bypass_response_cache(client, session, tmp_path):
+    client.data = DataService(
+        session, cache=tmp_path / "results", response_cache=ResponseCache()
+    )
+    versions = {code: 0 for code in CODES}
+
+    def table(request):
+        code = request.params.get("name")
+        if not code:  # the json envelope of csv responses
+            parameter = {"name": "", "area": "", "job": "", "language": "en"}
+            envelope = {
+                "Ident": {"Service": "data", "Method": "table"},
+                "Status": {"Code": 0, "Content": "successfull", "Type": ""},
+                "Parameter": parameter,
+                "Object": None,
+                "Copyright": "",
+            }
+            return 200, {"Content-Type": "application/json"}, json.dumps(envelope)
+        versions[code] += 1
+        return 200, {"Content-Type": "text/csv"}, f"{code};{versions[code]}\n"
+
+    url = re.compile(rf"{urljoin(BASE_URL, Endpoints.DATA_TABLE)}.*")
+    responses.add_callback(responses.GET, url, callback=table)
+    sync = TableSync(client, tmp_path / "tables")
+    sync.run(CODES)
+    backdate(sync, 3)
+    client.catalogue.modified = [("61111-0001", None)]
+
+    sync.run(CODES)
+
+    assert versions == {"12411-0001": 1, "12411-0015": 1, "61111-0001": 2}
+    path = sync.downloader.directory / "61111-0001.csv"
+    assert path.read_text() == "61111-0001;2\n"